@@ -13,17 +13,26 @@ def create_app(config_class=Config):
     
     app.config.from_object(config_class)
     
-    # Initialize Firebase
-    from firebase.firebase_admin_setup import initialize_firebase
-    initialize_firebase()
+    # Initialize Firebase only when it stores the data; the SQLite backend
+    # never imports firebase_admin
+    from firebase.storage_backends import resolve_backend_name
+    if resolve_backend_name() == 'firestore':
+        from firebase.firebase_admin_setup import initialize_firebase
+        initialize_firebase()
     
     # Create necessary directories
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
-    os.makedirs('static/audio', exist_ok=True)
+    os.makedirs(app.config['AUDIO_FOLDER'], exist_ok=True)
+    os.makedirs(os.path.dirname(app.config['STORAGE_INDEX_PATH']), exist_ok=True)
     os.makedirs('weights', exist_ok=True)
     
+    # Evict old uploads and audio in the background
+    from app.models.storage_manager import get_storage_manager
+    get_storage_manager().start()
+    
     # Register blueprints
-    from app.api import main_routes, vision_routes, auth_routes
+    from app.api import main_routes, vision_routes, auth_routes, health_routes
+    app.register_blueprint(health_routes.bp)
     app.register_blueprint(main_routes.bp)
     app.register_blueprint(vision_routes.bp, url_prefix='/api')
     app.register_blueprint(auth_routes.bp)
@@ -0,0 +1,204 @@
+"""
+Async Variants of the Network-Bound Vision API Routes (served by asgi.py)
+
+Translation, speech, narration and saving wait on remote services, so in
+the async serving mode they run on the event loop; every other route is
+served by the Flask app mounted behind them.
+"""
+import asyncio
+import json
+
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from app.models.async_http import run_blocking
+
+async def _json_body(request):
+    try:
+        return await request.json()
+    except ValueError:
+        return None
+
+async def translate(request):
+    '''Translate text to multiple languages, all languages concurrently'''
+    from app.models.translation import translate_description_async
+    
+    try:
+        data = await _json_body(request) or {}
+        text = data.get('text')
+        segments = data.get('segments')
+        target_languages = data.get('languages', ['te', 'hi', 'es'])
+        
+        if not text:
+            return JSONResponse({'error': 'No text provided'}, 400)
+        
+        print(f"Translating to: {target_languages}")
+        
+        async def translate_one(lang):
+            try:
+                # Templated descriptions render locally, only free text hits the translator
+                translated = await translate_description_async(text, lang, segments=segments)
+                print(f"✓ {lang}: {translated[:50]}...")
+                return translated
+            except Exception as e:
+                print(f"Translation error for {lang}: {e}")
+                return text
+        
+        results = await asyncio.gather(*(translate_one(lang) for lang in target_languages))
+        return JSONResponse({
+            'original': text,
+            'translations': dict(zip(target_languages, results))
+        })
+    
+    except Exception as e:
+        print(f"Translation error: {str(e)}")
+        return JSONResponse({'error': str(e)}, 500)
+
+async def translate_segments(request):
+    '''Translate a list of text segments with one backend request per language'''
+    from app.models.translation import translate_batch_async
+    
+    try:
+        data = await _json_body(request) or {}
+        texts = data.get('texts')
+        target_languages = data.get('languages', ['te', 'hi', 'es'])
+        
+        if not texts or not isinstance(texts, list):
+            return JSONResponse({'error': 'No texts provided'}, 400)
+        
+        print(f"Batch translating {len(texts)} segments to: {target_languages}")
+        
+        async def translate_one(lang):
+            try:
+                return await translate_batch_async(texts, target_lang=lang)
+            except Exception as e:
+                print(f"Translation error for {lang}: {e}")
+                return texts
+        
+        results = await asyncio.gather(*(translate_one(lang) for lang in target_languages))
+        return JSONResponse({
+            'original': texts,
+            'translations': dict(zip(target_languages, results))
+        })
+    
+    except Exception as e:
+        print(f"Translation error: {str(e)}")
+        return JSONResponse({'error': str(e)}, 500)
+
+async def speak(request):
+    '''Generate speech from text'''
+    from app.models.speech import generate_speech_async
+    
+    try:
+        data = await _json_body(request) or {}
+        text = data.get('text')
+        language = data.get('language', 'en')
+        
+        if not text:
+            return JSONResponse({'error': 'No text provided'}, 400)
+        
+        print(f"[{language}] Speech request for: {text[:50]}...")
+        
+        audio_file = await generate_speech_async(text, language)
+        if audio_file:
+            return JSONResponse({'success': True, 'audio_file': audio_file})
+        print(f"[{language}] ✗ Audio generation failed")
+        return JSONResponse({'success': False, 'error': 'Failed to generate audio'}, 500)
+    
+    except Exception as e:
+        print(f"Speech error: {str(e)}")
+        return JSONResponse({'success': False, 'error': str(e)}, 500)
+
+async def speak_stream(request):
+    '''Stream speech as MP3, sentence by sentence, as soon as each is synthesized'''
+    from app.models.speech import stream_speech_async
+    
+    data = (await _json_body(request) if request.method == 'POST' else None) or request.query_params
+    text = data.get('text')
+    language = data.get('language', 'en')
+    
+    if not text:
+        return JSONResponse({'error': 'No text provided'}, 400)
+    
+    print(f"[{language}] Streaming speech for: {text[:50]}...")
+    
+    return StreamingResponse(
+        stream_speech_async(text, language),
+        media_type='audio/mpeg',
+        headers={
+            'Cache-Control': 'no-store',
+            'X-Accel-Buffering': 'no'
+        }
+    )
+
+async def narrate_description(request):
+    '''Translate and narrate a description in several languages in one request'''
+    from app.models.narration import iter_narrations_async
+    
+    try:
+        data = await _json_body(request) or {}
+        text = data.get('text')
+        languages = data.get('languages', ['en'])
+        
+        if not text:
+            return JSONResponse({'error': 'No text provided'}, 400)
+        
+        print(f"Narrating in: {languages}")
+        
+        narrations = iter_narrations_async(text, languages, segments=data.get('segments'),
+                                           lines=data.get('lines'))
+        
+        if data.get('stream'):
+            async def ndjson():
+                # One NDJSON line per language, as each finishes
+                async for lang, narration in narrations:
+                    yield json.dumps({'language': lang, **narration}, ensure_ascii=False) + '\n'
+            
+            return StreamingResponse(ndjson(), media_type='application/x-ndjson',
+                                     headers={'X-Accel-Buffering': 'no'})
+        
+        return JSONResponse({
+            'success': True,
+            'original': text,
+            'narrations': {lang: narration async for lang, narration in narrations}
+        })
+    
+    except Exception as e:
+        print(f"Narration error: {str(e)}")
+        return JSONResponse({'success': False, 'error': str(e)}, 500)
+
+async def save_analysis(request):
+    '''Save analysis result; the storage call runs on the I/O executor'''
+    from firebase.firestore_service import save_result
+    
+    try:
+        data = await _json_body(request)
+        result_id = await run_blocking(save_result, data, user_id=_session_user_id(request))
+        return JSONResponse({'success': True, 'id': result_id})
+    except Exception as e:
+        print(f"Save error: {e}")
+        return JSONResponse({'success': False, 'error': str(e)}, 500)
+
+def _session_user_id(request):
+    '''User id from the Flask session cookie, verified with the app's secret key'''
+    flask_app = request.app.state.flask_app
+    cookie = request.cookies.get(flask_app.config['SESSION_COOKIE_NAME'])
+    serializer = flask_app.session_interface.get_signing_serializer(flask_app)
+    if not cookie or serializer is None:
+        return None
+    try:
+        max_age = int(flask_app.permanent_session_lifetime.total_seconds())
+        return serializer.loads(cookie, max_age=max_age).get('user_id')
+    except Exception:
+        return None
+
+# Mounted under /api ahead of the Flask app, so these paths shadow the
+# synchronous views in vision_routes
+routes = [
+    Route('/api/translate', translate, methods=['POST']),
+    Route('/api/translate/batch', translate_segments, methods=['POST']),
+    Route('/api/speak', speak, methods=['POST']),
+    Route('/api/speak/stream', speak_stream, methods=['GET', 'POST']),
+    Route('/api/narrate', narrate_description, methods=['POST']),
+    Route('/api/save', save_analysis, methods=['POST']),
+]
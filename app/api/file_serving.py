@@ -0,0 +1,51 @@
+"""
+Conditional and Byte-Range Responses for Stored Files
+"""
+import os
+
+from flask import jsonify, send_from_directory
+from werkzeug.exceptions import NotFound
+
+from config import Config
+
+def send_stored_file(directory, filename, mimetype=None, immutable=False, etag=True):
+    '''
+    Serve a file from a managed directory with caching support
+    
+    The response supports byte ranges (206), If-None-Match / If-Modified-Since
+    (304) and carries an ETag, so seeking or replaying in the browser does
+    not download the file again. No filesystem checks happen beyond the
+    open itself: a missing file is a plain 404.
+    
+    Args:
+        directory: Directory the file lives in
+        filename: File name (validated against path traversal)
+        mimetype: Response mimetype (default: guessed from the name)
+        immutable: True if the file's content never changes for this name;
+            it is then cached by browsers for IMMUTABLE_MAX_AGE without
+            revalidation
+        etag: True for an ETag from mtime and size, or a string to use as
+            a strong ETag (e.g. the content hash in the file name)
+    
+    Returns:
+        Flask response
+    '''
+    try:
+        response = send_from_directory(
+            os.path.abspath(directory),
+            filename,
+            mimetype=mimetype,
+            conditional=True,
+            etag=etag,
+            max_age=Config.IMMUTABLE_MAX_AGE if immutable else 0
+        )
+    except NotFound:
+        return jsonify({'error': 'File not found'}), 404
+    
+    if immutable:
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+    else:
+        # Cached, but revalidated against the ETag on every use
+        response.cache_control.no_cache = True
+    return response
@@ -0,0 +1,19 @@
+"""
+Health and Readiness Probes
+"""
+from flask import Blueprint, jsonify
+
+from app.models.model_warmup import is_ready, readiness
+
+bp = Blueprint('health', __name__)
+
+@bp.route('/healthz')
+def healthz():
+    '''Liveness: the process is up and serving requests'''
+    return jsonify({'status': 'ok'}), 200
+
+@bp.route('/readyz')
+def readyz():
+    '''Readiness: models are loaded and warmed up (503 until then)'''
+    state = readiness()
+    return jsonify(state), 200 if is_ready() else 503
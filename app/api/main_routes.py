@@ -1,4 +1,4 @@
-from flask import Blueprint, render_template, session, redirect, url_for, flash, request, send_from_directory
+from flask import Blueprint, current_app, render_template, session, redirect, url_for, flash, request
 from functools import wraps
 
 bp = Blueprint('main', __name__)
@@ -35,4 +35,15 @@ def history():
 
 @bp.route('/uploads/<path:filename>')
 def uploaded_file(filename):
-    return send_from_directory('uploads', filename)
+    from app.api.file_serving import send_stored_file
+    from app.models.background_writer import wait_for_pending
+    from app.models.storage_manager import get_storage_manager
+    
+    # Images from /api/analyze/image may still be on their way to disk
+    wait_for_pending(filename)
+    
+    # Uploads and their derivatives are named by content and never rewritten
+    response = send_stored_file(current_app.config['UPLOAD_FOLDER'], filename, immutable=True)
+    if not isinstance(response, tuple):
+        get_storage_manager().touch('uploads', filename)
+    return response
@@ -1,16 +1,17 @@
 """
 Vision API Routes - Complete Version with Fixed Audio
 """
-from flask import Blueprint, request, jsonify, send_from_directory, send_file, make_response
+from flask import Blueprint, request, jsonify, send_from_directory, make_response, Response, session
 from werkzeug.utils import secure_filename
 import os
-import uuid
+import json
 from datetime import datetime
 
-from app.models.object_detection import detect_objects, get_description
-from app.models.face_recognition import recognize_faces
-from app.models.translation import translate_text
-from app.models.speech import generate_speech
+from config import Config
+from app.api.file_serving import send_stored_file
+from app.models.blob_store import get_blob_store, upload_key
+from app.models.model_registry import models
+from app.models.storage_manager import get_storage_manager
 
 bp = Blueprint('vision', __name__)
 
@@ -26,16 +27,18 @@ def upload_image():
         if file.filename == '':
             return jsonify({'error': 'No file selected'}), 400
         
-        if file:
-            filename = secure_filename(file.filename)
-            unique_filename = f"{uuid.uuid4()}_{filename}"
-            filepath = os.path.join('uploads', unique_filename)
-            file.save(filepath)
+        ext = upload_extension(file.filename)
+        if ext:
+            # Stored upright, once per distinct content, with an
+            # inference-sized copy and a thumbnail
+            key, _created = models.ingest.store_upload(file.read(), ext)
+            filepath = get_blob_store().path(key)
             
             return jsonify({
                 'success': True,
-                'filename': unique_filename,
-                'filepath': filepath
+                'filename': key,
+                'filepath': filepath,
+                'thumbnail': models.ingest.thumbnail_for(filepath) or filepath
             }), 200
         
         return jsonify({'error': 'Invalid file type'}), 400
@@ -49,73 +52,114 @@ def analyze_image():
     try:
         data = request.get_json()
         filepath = data.get('filepath')
+        language = data.get('language', 'en')
         
         if not filepath or not os.path.exists(filepath):
             return jsonify({'error': 'Image file not found'}), 404
         
         print(f"Starting analysis for: {filepath}")
         
-        # STEP 1: YOLOv8 Object Detection
-        detected_objects = detect_objects(filepath)
-        print(f"Detected {len(detected_objects)} objects")
-        
-        # STEP 2: Generate annotated image with bounding boxes
-        annotated_image_path = None
-        try:
-            from app.models.image_annotator import draw_bounding_boxes
-            if detected_objects:
-                annotated_image_path = draw_bounding_boxes(filepath, detected_objects)
-                print(f"Annotated image: {annotated_image_path}")
-        except Exception as e:
-            print(f"Annotation warning: {e}")
-        
-        # STEP 3: Face Recognition (always try, but track if YOLO saw a person)
-        recognized_faces = []
-        person_detected = any(obj['class'].lower() == 'person' for obj in detected_objects)
-        
-        try:
-            recognized_faces = recognize_faces(filepath)
-            print(f"Found {len(recognized_faces)} faces")
-        except Exception as e:
-            print(f"Face recognition warning: {e}")
-        
-        # STEP 4: Generate detailed scene description
-        try:
-            from app.models.scene_description import generate_detailed_scene_description
-            detailed_description = generate_detailed_scene_description(
-                detected_objects, 
-                recognized_faces, 
-                filepath
-            )
-        except Exception as e:
-            print(f"Scene description warning: {e}")
-            # Fallback description
-            detailed_description = {
-                'full_description': get_description(detected_objects),
-                'line_count': 1,
-                'description_lines': [get_description(detected_objects)],
-                'has_celebrity': False
-            }
-        
-        # STEP 5: Generate shopping links
-        shopping_data = {}
-        try:
-            from app.models.shopping import get_shopping_links_with_description
-            shopping_data = get_shopping_links_with_description(detected_objects)
-        except Exception as e:
-            print(f"Shopping links warning: {e}")
-        
-        # Combine results
-        results = {
-            'objects': detected_objects,
-            'faces': recognized_faces,
-            'person_detected': person_detected,
-            'detailed_description': detailed_description,
-            'shopping_links': shopping_data,
-            'original_image': filepath,
-            'annotated_image': annotated_image_path,
-            'timestamp': datetime.now().isoformat()
-        }
+        # Decode once, from the smallest stored version the detector can use;
+        # every stage works on the same array
+        source = models.ingest.select_version(filepath, models.detection.DETECTION_INPUT_SIZE)
+        image, scale = models.image_io.read_image_reduced(source, Config.INFERENCE_MAX_SIDE)
+        if image is None:
+            return jsonify({'error': 'Cannot read image'}), 400
+        
+        if source != filepath:
+            scale = max(models.ingest.original_size(filepath)) / max(image.shape[:2])
+        if scale != 1.0:
+            print(f"Using {source} at {image.shape[1]}x{image.shape[0]} (scale {scale:.2f})")
+        
+        results = run_analysis(image, language, scale=scale)
+        
+        # Annotated images are rendered on request by /api/annotated
+        annotated_image_url = None
+        if results['objects']:
+            annotated_image_url = models.annotation.annotation_url(filepath, models.annotation.store_detections(filepath, results['objects']))
+        
+        results['original_image'] = filepath
+        results['annotated_image'] = None
+        results['annotated_image_url'] = annotated_image_url
+        results['thumbnail_image'] = models.ingest.thumbnail_for(filepath)
+        
+        return jsonify(results), 200
+    
+    except Exception as e:
+        print(f"Analysis error: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
+
+@bp.route('/analyze/image', methods=['POST'])
+def analyze_image_bytes():
+    '''
+    Analyze an image sent in the request itself, in one round trip
+    
+    Accepts a multipart 'file' field or a raw image body. The image is
+    decoded from memory and nothing touches the disk on the request path;
+    with save=true (form field or query string) the original and the
+    annotated image are written in the background so the result can be
+    kept in history.
+    '''
+    try:
+        file = request.files.get('file')
+        if file is not None:
+            data = file.read()
+            name = file.filename
+        else:
+            data = request.get_data()
+            name = None
+        
+        if not data:
+            return jsonify({'error': 'No image provided'}), 400
+        
+        # Large JPEGs are reduced while decoding; nothing needs more than
+        # the inference size
+        image, decode_scale = models.image_io.decode_image_reduced(data, Config.INFERENCE_MAX_SIDE)
+        if image is None:
+            return jsonify({'error': 'Cannot decode image'}), 400
+        
+        language = request.values.get('language', 'en')
+        save = request.values.get('save', '').lower() in ('1', 'true', 'yes')
+        
+        print(f"Starting in-memory analysis ({len(data)} bytes, save={save})")
+        
+        # Every stage runs on an inference-sized copy
+        inference_image, scale = models.ingest.fit_within(image, Config.INFERENCE_MAX_SIDE)
+        scale *= decode_scale
+        
+        results = run_analysis(inference_image, language, scale=scale)
+        results['original_image'] = None
+        results['annotated_image'] = None
+        results['annotated_image_url'] = None
+        results['thumbnail_image'] = None
+        
+        if save:
+            from app.models.background_writer import persist_async, run_async
+            
+            # Same ingest as /api/upload, keyed on the upright bytes; only
+            # storing and the derivatives happen in the background
+            ext = upload_extension(name) or '.jpg'
+            data, size = models.ingest.normalize_upload(data)
+            store = get_blob_store()
+            key = store.key_for_bytes(data, ext)
+            filepath = store.path(key)
+            results['original_image'] = filepath
+            
+            if store.exists(key):
+                results['thumbnail_image'] = models.ingest.thumbnail_for(filepath)
+                derivatives = {}
+            else:
+                derivatives = models.ingest.planned_derivatives(filepath, size) if size else {}
+                results['thumbnail_image'] = derivatives.get('thumb')
+            run_async(key, models.ingest.store_upload, data, ext,
+                      also=[upload_key(path) for path in derivatives.values()])
+            
+            if results['objects']:
+                digest, detections = models.annotation.detections_data(results['objects'])
+                persist_async(upload_key(models.annotation.detections_path(filepath, digest)), detections, parent=key)
+                results['annotated_image_url'] = models.annotation.annotation_url(filepath, digest)
         
         return jsonify(results), 200
     
@@ -125,12 +169,132 @@ def analyze_image():
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
 
+@bp.route('/annotated/<path:filename>')
+def annotated_image(filename):
+    '''
+    Annotated version of an upload, rendered on first request and cached
+    
+    Query parameters: d (detections digest, from annotated_image_url),
+    size (longest side in px), quality (JPEG quality) and classes
+    (comma-separated class names to draw; default all).
+    '''
+    from app.models.background_writer import wait_for_pending
+    
+    digest = request.args.get('d', '')
+    if len(digest) != 64:
+        return jsonify({'error': 'Missing detections digest'}), 400
+    
+    filepath = os.path.join(Config.UPLOAD_FOLDER, *filename.split('/'))
+    classes = request.args.get('classes')
+    
+    try:
+        size, quality, classes = models.annotation.normalize_params(
+            request.args.get('size'),
+            request.args.get('quality'),
+            classes.split(',') if classes else None
+        )
+    except ValueError:
+        return jsonify({'error': 'Invalid size or quality'}), 400
+    
+    # Uploads from /api/analyze/image may still be on their way to disk
+    wait_for_pending(filename)
+    wait_for_pending(upload_key(models.annotation.detections_path(filepath, digest)))
+    
+    try:
+        render_path = models.annotation.render_annotation(filepath, digest, size, quality, classes)
+    except Exception as e:
+        print(f"Annotation error: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+    if render_path is None:
+        return jsonify({'error': 'Image or detections not found'}), 404
+    
+    render_key = upload_key(render_path)
+    response = send_stored_file(
+        Config.UPLOAD_FOLDER,
+        render_key,
+        mimetype='image/jpeg',
+        immutable=True,
+        etag=os.path.splitext(os.path.basename(render_key))[0]
+    )
+    if not isinstance(response, tuple):
+        get_storage_manager().touch('uploads', render_key)
+    return response
+
+def upload_extension(filename):
+    '''Lower-case extension (with dot) of an allowed upload file name, else None'''
+    ext = os.path.splitext(secure_filename(filename or ''))[1].lower()
+    return ext if ext[1:] in Config.ALLOWED_EXTENSIONS else None
+
+def run_analysis(image, language='en', scale=1.0):
+    '''
+    Run detection, face recognition, description and shopping on a decoded image
+    
+    Args:
+        image: BGR image array
+        language: Language code for the scene description
+        scale: Ratio of the original image's size to image's, when image is
+            a reduced copy; bounding boxes are returned in original coordinates
+    
+    Returns:
+        Results dictionary without the image paths
+    '''
+    # STEP 1: YOLOv8 Object Detection
+    detected_objects = models.detection.scale_detections(models.detection.detect_objects(image), scale)
+    print(f"Detected {len(detected_objects)} objects")
+    
+    # STEP 2: Face Recognition (always try, but track if YOLO saw a person)
+    recognized_faces = []
+    person_detected = any(obj['class'].lower() == 'person' for obj in detected_objects)
+    
+    try:
+        recognized_faces = models.faces.recognize_faces(image)
+        print(f"Found {len(recognized_faces)} faces")
+    except Exception as e:
+        print(f"Face recognition warning: {e}")
+    
+    # STEP 3: Generate detailed scene description
+    try:
+        from app.models.scene_description import generate_detailed_scene_description
+        detailed_description = generate_detailed_scene_description(
+            detected_objects, 
+            recognized_faces, 
+            None,
+            language=language
+        )
+    except Exception as e:
+        print(f"Scene description warning: {e}")
+        # Fallback description
+        detailed_description = {
+            'full_description': models.detection.get_description(detected_objects),
+            'line_count': 1,
+            'description_lines': [models.detection.get_description(detected_objects)],
+            'has_celebrity': False
+        }
+    
+    # STEP 4: Generate shopping links
+    shopping_data = {}
+    try:
+        from app.models.shopping import get_shopping_links_with_description
+        shopping_data = get_shopping_links_with_description(detected_objects)
+    except Exception as e:
+        print(f"Shopping links warning: {e}")
+    
+    return {
+        'objects': detected_objects,
+        'faces': recognized_faces,
+        'person_detected': person_detected,
+        'detailed_description': detailed_description,
+        'shopping_links': shopping_data,
+        'timestamp': datetime.now().isoformat()
+    }
+
 @bp.route('/translate', methods=['POST'])
 def translate():
     '''Translate text to multiple languages'''
     try:
         data = request.get_json()
         text = data.get('text')
+        segments = data.get('segments')
         target_languages = data.get('languages', ['te', 'hi', 'es'])
         
         if not text:
@@ -141,7 +305,8 @@ def translate():
         translations = {}
         for lang in target_languages:
             try:
-                translated = translate_text(text, target_lang=lang)
+                # Templated descriptions render locally, only free text hits the translator
+                translated = models.translation.translate_description(text, lang, segments=segments)
                 translations[lang] = translated
                 print(f"✓ {lang}: {translated[:50]}...")
             except Exception as e:
@@ -157,6 +322,36 @@ def translate():
         print(f"Translation error: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@bp.route('/translate/batch', methods=['POST'])
+def translate_segments():
+    '''Translate a list of text segments with one backend request per language'''
+    try:
+        data = request.get_json()
+        texts = data.get('texts')
+        target_languages = data.get('languages', ['te', 'hi', 'es'])
+        
+        if not texts or not isinstance(texts, list):
+            return jsonify({'error': 'No texts provided'}), 400
+        
+        print(f"Batch translating {len(texts)} segments to: {target_languages}")
+        
+        translations = {}
+        for lang in target_languages:
+            try:
+                translations[lang] = models.translation.translate_batch(texts, target_lang=lang)
+            except Exception as e:
+                print(f"Translation error for {lang}: {e}")
+                translations[lang] = texts
+        
+        return jsonify({
+            'original': texts,
+            'translations': translations
+        }), 200
+    
+    except Exception as e:
+        print(f"Translation error: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
 @bp.route('/speak', methods=['POST'])
 def speak():
     '''Generate speech from text'''
@@ -170,7 +365,7 @@ def speak():
         
         print(f"[{language}] Speech request for: {text[:50]}...")
         
-        audio_file = generate_speech(text, language)
+        audio_file = models.speech.generate_speech(text, language)
         
         if audio_file:
             print(f"[{language}] ✓ Audio generated: {audio_file}")
@@ -191,44 +386,80 @@ def speak():
         traceback.print_exc()
         return jsonify({'success': False, 'error': str(e)}), 500
 
-@bp.route('/audio/<filename>')
-def serve_audio(filename):
-    '''Serve audio file with proper headers - FIXED VERSION'''
+@bp.route('/speak/stream', methods=['GET', 'POST'])
+def speak_stream():
+    '''Stream speech as MP3, sentence by sentence, as soon as each is synthesized'''
+    data = request.get_json(silent=True) or request.args
+    text = data.get('text')
+    language = data.get('language', 'en')
+    
+    if not text:
+        return jsonify({'error': 'No text provided'}), 400
+    
+    print(f"[{language}] Streaming speech for: {text[:50]}...")
+    
+    return Response(
+        models.speech.stream_speech(text, language),
+        mimetype='audio/mpeg',
+        headers={
+            'Cache-Control': 'no-store',
+            'X-Accel-Buffering': 'no'
+        }
+    )
+
+@bp.route('/narrate', methods=['POST'])
+def narrate_description():
+    '''Translate and narrate a description in several languages in one request'''
     try:
-        # Construct full path
-        audio_path = os.path.join('static', 'audio', filename)
-        
-        print(f"Audio request: {filename}")
-        print(f"Absolute path: {os.path.abspath(audio_path)}")
-        print(f"File exists: {os.path.exists(audio_path)}")
-        
-        # Check if file exists
-        if not os.path.exists(audio_path):
-            print(f"✗ File not found: {audio_path}")
-            # List available files for debugging
-            audio_dir = os.path.join('static', 'audio')
-            if os.path.exists(audio_dir):
-                available = os.listdir(audio_dir)
-                print(f"Available files: {available[:5]}")
-            return jsonify({'error': 'Audio file not found'}), 404
-        
-        # Get file size
-        file_size = os.path.getsize(audio_path)
-        print(f"✓ Serving: {audio_path} ({file_size} bytes)")
-        
-        # Send file directly with proper headers
-        return send_file(
-            audio_path,
-            mimetype='audio/mpeg',
-            as_attachment=False,
-            download_name=filename
-        )
+        from app.models.narration import iter_narrations
+        
+        data = request.get_json()
+        text = data.get('text')
+        languages = data.get('languages', ['en'])
+        segments = data.get('segments')
+        lines = data.get('lines')
+        
+        if not text:
+            return jsonify({'error': 'No text provided'}), 400
+        
+        print(f"Narrating in: {languages}")
         
+        narrations = iter_narrations(text, languages, segments=segments, lines=lines)
+        
+        if data.get('stream'):
+            # One NDJSON line per language, as each finishes
+            return Response(
+                (json.dumps({'language': lang, **narration}, ensure_ascii=False) + '\n'
+                 for lang, narration in narrations),
+                mimetype='application/x-ndjson',
+                headers={'X-Accel-Buffering': 'no'}
+            )
+        
+        return jsonify({
+            'success': True,
+            'original': text,
+            'narrations': dict(narrations)
+        }), 200
+    
     except Exception as e:
-        print(f"✗ Audio serve error: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        return jsonify({'error': str(e)}), 500
+        print(f"Narration error: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@bp.route('/audio/<filename>')
+def serve_audio(filename):
+    '''Serve generated audio with range, ETag and immutable cache support'''
+    # Audio file names are derived from a hash of text, language and speed,
+    # so the name identifies the content and doubles as a strong ETag
+    response = send_stored_file(
+        Config.AUDIO_FOLDER,
+        filename,
+        mimetype='audio/mpeg',
+        immutable=True,
+        etag=os.path.splitext(filename)[0]
+    )
+    if not isinstance(response, tuple):
+        get_storage_manager().touch('audio', filename)
+    return response
 
 @bp.route('/shopping', methods=['POST'])
 def get_shopping():
@@ -253,9 +484,91 @@ def save_analysis():
         from firebase.firestore_service import save_result
         
         data = request.get_json()
-        result_id = save_result(data)
+        result_id = save_result(data, user_id=session.get('user_id'))
         
         return jsonify({'success': True, 'id': result_id}), 200
     except Exception as e:
         print(f"Save error: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
+
+@bp.route('/history', methods=['GET'])
+def list_history():
+    '''
+    One page of the current user's saved results, newest first
+    
+    Query parameters: limit (page size), cursor (next_cursor of the
+    previous page). Only summary fields are returned; load a full result
+    from /api/history/<id>.
+    '''
+    from firebase.firestore_service import get_history
+    
+    user_id = session.get('user_id')
+    if not user_id:
+        return jsonify({'error': 'Not logged in'}), 401
+    
+    try:
+        items, next_cursor = get_history(
+            user_id,
+            limit=request.args.get('limit', 20, type=int),
+            cursor=request.args.get('cursor')
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify({'items': items, 'next_cursor': next_cursor}), 200
+
+@bp.route('/history/<result_id>', methods=['GET'])
+def get_history_item(result_id):
+    '''Full saved result of the current user'''
+    from firebase.firestore_service import get_result
+    
+    user_id = session.get('user_id')
+    if not user_id:
+        return jsonify({'error': 'Not logged in'}), 401
+    
+    result = get_result(result_id, user_id=user_id)
+    if result is None:
+        return jsonify({'error': 'Result not found'}), 404
+    return jsonify(result), 200
+
+@bp.route('/stats', methods=['GET'])
+def get_user_stats():
+    '''
+    Aggregate counters of the current user's saved results
+    
+    Per-class and per-identity counts and per-day totals, maintained when
+    results are saved, so this is a single read.
+    '''
+    from firebase.firestore_service import get_stats
+    
+    user_id = session.get('user_id')
+    if not user_id:
+        return jsonify({'error': 'Not logged in'}), 401
+    
+    return jsonify(get_stats(user_id)), 200
+
+@bp.route('/history/export', methods=['GET'])
+def export_user_history():
+    '''
+    Download the current user's full history as NDJSON
+    
+    Results are read page by page and streamed as they are encoded;
+    gzip=1 compresses the stream (history.ndjson.gz).
+    '''
+    from firebase.history_export import export_history
+    
+    user_id = session.get('user_id')
+    if not user_id:
+        return jsonify({'error': 'Not logged in'}), 401
+    
+    compress = request.args.get('gzip', '').lower() in ('1', 'true', 'yes')
+    filename = 'history.ndjson.gz' if compress else 'history.ndjson'
+    return Response(
+        export_history(user_id, compress=compress),
+        mimetype='application/gzip' if compress else 'application/x-ndjson',
+        headers={
+            'Content-Disposition': f'attachment; filename={filename}',
+            'Cache-Control': 'no-store',
+            'X-Accel-Buffering': 'no'
+        }
+    )
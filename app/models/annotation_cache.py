@@ -0,0 +1,131 @@
+"""
+On-Demand Annotated Image Rendering with a Disk Cache
+"""
+import hashlib
+import json
+import os
+import threading
+
+from config import Config
+from app.models.blob_store import upload_key
+from app.models.image_annotator import render_bounding_boxes
+from app.models.image_ingest import fit_within, original_size, select_version
+from app.models.image_io import encode_jpeg, read_image_reduced
+from app.models.storage_manager import get_storage_manager
+
+MIN_SIZE, MAX_SIZE = 64, 4096
+MIN_QUALITY, MAX_QUALITY = 30, 95
+
+def detections_digest(detected_objects):
+    '''SHA-256 of the canonical JSON of a detection list'''
+    canonical = json.dumps(
+        [[obj['class'], round(obj['confidence'], 4), list(obj['bbox'])] for obj in detected_objects],
+        separators=(',', ':')
+    )
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+def detections_data(detected_objects):
+    '''
+    Serialize detections for store_detections
+    
+    Returns:
+        Tuple of (digest, JSON bytes)
+    '''
+    digest = detections_digest(detected_objects)
+    data = json.dumps(
+        [{'class': obj['class'], 'confidence': obj['confidence'], 'bbox': list(obj['bbox'])}
+         for obj in detected_objects]
+    ).encode('utf-8')
+    return digest, data
+
+def detections_path(filepath, digest):
+    '''Path of the stored detection list of an upload'''
+    stem = os.path.splitext(filepath)[0]
+    return f"{stem}_det_{digest[:16]}.json"
+
+def store_detections(filepath, detected_objects):
+    '''
+    Keep an upload's detections next to it so annotations can be rendered later
+    
+    Returns:
+        Detections digest, to pass to annotation_url
+    '''
+    digest, data = detections_data(detected_objects)
+    path = detections_path(filepath, digest)
+    if not os.path.exists(path):
+        _save_atomic(path, data)
+        get_storage_manager().register('uploads', upload_key(path), parent=upload_key(filepath))
+    return digest
+
+def annotation_url(filepath, digest):
+    '''URL of the annotated image of an upload for a stored detection list'''
+    return f"/api/annotated/{upload_key(filepath)}?d={digest}"
+
+def normalize_params(size=None, quality=None, classes=None):
+    '''
+    Clamp render parameters and put them in canonical form
+    
+    Returns:
+        Tuple of (size, quality, classes) where classes is a sorted tuple
+        (empty for all classes)
+    '''
+    size = min(MAX_SIZE, max(MIN_SIZE, int(size or Config.INFERENCE_MAX_SIDE)))
+    quality = min(MAX_QUALITY, max(MIN_QUALITY, int(quality or 85)))
+    classes = tuple(sorted({c.strip().lower() for c in (classes or []) if c.strip()}))
+    return size, quality, classes
+
+def render_annotation(filepath, digest, size=None, quality=None, classes=None):
+    '''
+    Get the annotated image of an upload, rendering it on first request
+    
+    The render is drawn on the smallest stored version of the image that
+    covers the requested size, encoded at that size and quality, and
+    cached next to the upload under a name derived from the detections
+    digest and the parameters.
+    
+    Args:
+        filepath: Path of the original upload
+        digest: Digest of the detections stored with store_detections
+        size: Longest side of the rendered image in pixels
+        quality: JPEG quality
+        classes: Iterable of class names to draw (default: all)
+    
+    Returns:
+        Path of the rendered JPEG, or None if the image or detections are missing
+    '''
+    size, quality, classes = normalize_params(size, quality, classes)
+    params = f"{digest}|{size}|{quality}|{','.join(classes)}"
+    render_path = f"{os.path.splitext(filepath)[0]}_ann_{hashlib.sha256(params.encode('utf-8')).hexdigest()[:16]}.jpg"
+    if os.path.exists(render_path):
+        return render_path
+    
+    try:
+        with open(detections_path(filepath, digest), 'rb') as f:
+            detected_objects = json.load(f)
+    except FileNotFoundError:
+        return None
+    if classes:
+        detected_objects = [obj for obj in detected_objects if obj['class'].lower() in classes]
+    
+    source = select_version(filepath, size)
+    img, _scale = read_image_reduced(source, size)
+    if img is None:
+        return None
+    img, _scale = fit_within(img, size)
+    scale = max(original_size(filepath)) / max(img.shape[:2])
+    
+    data = encode_jpeg(render_bounding_boxes(img, detected_objects, scale=scale), quality=quality)
+    _save_atomic(render_path, data)
+    get_storage_manager().register('uploads', upload_key(render_path), parent=upload_key(filepath))
+    print(f"✓ Rendered annotation {render_path} ({size}px, q{quality})")
+    return render_path
+
+def _save_atomic(path, data):
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
@@ -0,0 +1,76 @@
+"""
+Shared Async HTTP Session and Executors for the Async Serving Mode (asgi.py)
+"""
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import functools
+import threading
+
+from config import Config
+
+# One session per event loop; aiohttp sessions cannot be shared across loops
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+_io_executor = None
+_io_executor_lock = threading.Lock()
+
+def get_session():
+    '''
+    Get the aiohttp session of the running event loop
+    
+    All translation requests share its connection pool
+    (ASYNC_HTTP_CONNECTIONS connections, kept alive between requests), so
+    hundreds of concurrent calls reuse a handful of TLS connections.
+    
+    Returns:
+        aiohttp.ClientSession
+    '''
+    import aiohttp
+    
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        with _sessions_lock:
+            session = _sessions.get(loop)
+            if session is None or session.closed:
+                connector = aiohttp.TCPConnector(
+                    limit=Config.ASYNC_HTTP_CONNECTIONS,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=30
+                )
+                session = aiohttp.ClientSession(
+                    connector=connector,
+                    timeout=aiohttp.ClientTimeout(total=Config.TRANSLATION_TIMEOUT * 4,
+                                                  sock_connect=Config.TRANSLATION_TIMEOUT)
+                )
+                _sessions[loop] = session
+    return session
+
+async def close_session():
+    '''Close the session of the running event loop (application shutdown)'''
+    session = _sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None:
+        await session.close()
+
+def get_io_executor():
+    '''Thread pool for blocking storage and file calls made from async code'''
+    global _io_executor
+    if _io_executor is None:
+        with _io_executor_lock:
+            if _io_executor is None:
+                _io_executor = ThreadPoolExecutor(
+                    max_workers=Config.ASYNC_IO_THREADS,
+                    thread_name_prefix='async-io'
+                )
+    return _io_executor
+
+async def run_blocking(func, *args, **kwargs):
+    '''
+    Run a blocking call on the I/O executor without blocking the event loop
+    
+    Returns:
+        The call's result
+    '''
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_io_executor(), functools.partial(func, *args, **kwargs))
@@ -1,10 +1,37 @@
 """
 Authentication Service for user management
 """
-from firebase.firebase_admin_setup import get_firestore_client
+from firebase.storage_backends import get_storage, email_key
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
-import uuid
+from collections import OrderedDict
+import threading
+import time
+
+from config import Config
+
+# Short-lived cache of get_user_by_id results (id, email and name only)
+_user_cache = OrderedDict()
+_user_cache_lock = threading.Lock()
+
+def _user_cache_get(user_id):
+    with _user_cache_lock:
+        entry = _user_cache.get(user_id)
+        if entry is None:
+            return None
+        expires_at, user = entry
+        if expires_at < time.monotonic():
+            del _user_cache[user_id]
+            return None
+        _user_cache.move_to_end(user_id)
+        return user
+
+def _user_cache_put(user_id, user):
+    with _user_cache_lock:
+        _user_cache[user_id] = (time.monotonic() + Config.USER_CACHE_TTL, user)
+        _user_cache.move_to_end(user_id)
+        while len(_user_cache) > Config.USER_CACHE_SIZE:
+            _user_cache.popitem(last=False)
 
 def create_user(email, password, name=None):
     '''
@@ -18,20 +45,18 @@ def create_user(email, password, name=None):
     Returns:
         Dictionary with user data or None if creation fails
     '''
+    typed_email = email.strip()
+    email = typed_email.lower()
     try:
-        db = get_firestore_client()
-        if db is None:
-            return None
-        
-        # Check if user already exists
-        users_ref = db.collection('users')
-        existing_user = users_ref.where('email', '==', email).limit(1).stream()
+        storage = get_storage()
         
-        if list(existing_user):
+        # Older accounts may be stored under the email as it was typed
+        if storage.get_user_by_email(typed_email) is not None:
             return None  # User already exists
         
-        # Create new user
-        user_id = str(uuid.uuid4())
+        # Create new user; the id is derived from the email, and the backend
+        # refuses an existing email atomically
+        user_id = email_key(email)
         user_data = {
             'id': user_id,
             'email': email,
@@ -41,7 +66,8 @@ def create_user(email, password, name=None):
             'last_login': None
         }
         
-        users_ref.document(user_id).set(user_data)
+        if not storage.create_user(user_data):
+            return None  # User already exists
         return {
             'id': user_id,
             'email': user_data['email'],
@@ -64,28 +90,18 @@ def authenticate_user(email, password):
         Dictionary with user data if authentication succeeds, None otherwise
     '''
     try:
-        db = get_firestore_client()
-        if db is None:
-            return None
+        storage = get_storage()
         
-        # Find user by email
-        users_ref = db.collection('users')
-        users = users_ref.where('email', '==', email).limit(1).stream()
+        # Find user by email (as typed: older accounts kept its case)
+        user_data = storage.get_user_by_email(email)
         
-        user_doc = None
-        for doc in users:
-            user_doc = doc
-            break
-        
-        if not user_doc:
+        if not user_data:
             return None
         
-        user_data = user_doc.to_dict()
-        
         # Verify password
         if check_password_hash(user_data.get('password_hash', ''), password):
-            # Update last login
-            user_doc.reference.update({'last_login': datetime.now()})
+            # Update last login (batched off the request path on Firestore)
+            storage.update_user(user_data['id'], {'last_login': datetime.now()})
             
             return {
                 'id': user_data.get('id'),
@@ -109,20 +125,21 @@ def get_user_by_id(user_id):
     Returns:
         Dictionary with user data or None if not found
     '''
+    cached = _user_cache_get(user_id)
+    if cached is not None:
+        return dict(cached)
+    
     try:
-        db = get_firestore_client()
-        if db is None:
-            return None
+        user_data = get_storage().get_user(user_id)
         
-        user_doc = db.collection('users').document(user_id).get()
-        
-        if user_doc.exists:
-            user_data = user_doc.to_dict()
-            return {
+        if user_data:
+            user = {
                 'id': user_data.get('id'),
                 'email': user_data.get('email'),
                 'name': user_data.get('name')
             }
+            _user_cache_put(user_id, user)
+            return dict(user)
         
         return None
     
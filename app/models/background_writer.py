@@ -0,0 +1,97 @@
+"""
+Background Persistence of Uploaded and Derived Images
+"""
+from concurrent.futures import ThreadPoolExecutor
+import os
+import threading
+
+from config import Config
+from app.models.storage_manager import get_storage_manager
+
+_executor = None
+_pending = {}
+_lock = threading.Lock()
+
+def _get_executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=Config.PERSIST_WORKERS, thread_name_prefix='persist')
+        return _executor
+
+def persist_async(filename, data, parent=None):
+    '''
+    Write a file to the uploads folder off the request path
+    
+    The file is written to a temporary name and moved into place, so it is
+    either complete or absent, then registered with the storage manager.
+    
+    Args:
+        filename: Path relative to the uploads folder (also the index key)
+        data: File bytes, or a callable returning them (e.g. a JPEG encoder,
+            so encoding also happens in the background)
+        parent: Upload this file was derived from, for eviction
+    
+    Returns:
+        Future resolving to the written path
+    '''
+    return run_async(filename, _write, filename, data, parent)
+
+def run_async(filename, func, *args, also=()):
+    '''
+    Run a task that produces an upload on the background pool
+    
+    Until it finishes, wait_for_pending(filename) blocks on it, as does
+    wait_for_pending for each of the other files it writes (also).
+    
+    Returns:
+        Future of func(*args)
+    '''
+    future = _get_executor().submit(func, *args)
+    names = [filename, *also]
+    with _lock:
+        for name in names:
+            _pending[name] = future
+    for name in names:
+        future.add_done_callback(lambda f, name=name: _forget(name, f))
+    return future
+
+def wait_for_pending(filename, timeout=None):
+    '''
+    Wait until a background write of filename has finished, if one is queued
+    
+    Returns:
+        True if a pending write was waited for
+    '''
+    with _lock:
+        future = _pending.get(filename)
+    if future is None:
+        return False
+    try:
+        future.result(timeout=timeout if timeout is not None else Config.PERSIST_WAIT_TIMEOUT)
+    except Exception as e:
+        print(f"Background write of {filename} not available: {e}")
+    return True
+
+def _forget(filename, future):
+    with _lock:
+        if _pending.get(filename) is future:
+            del _pending[filename]
+
+def _write(filename, data, parent):
+    if callable(data):
+        data = data()
+    path = os.path.join(Config.UPLOAD_FOLDER, *filename.split('/'))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"✗ Background write failed ({filename}): {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    get_storage_manager().register('uploads', filename, parent=parent)
+    return path
@@ -0,0 +1,131 @@
+"""
+Content-Addressed Upload Store (sharded, deduplicated, reference counted)
+"""
+import hashlib
+import os
+import threading
+import uuid
+
+from config import Config
+from app.models.storage_manager import get_storage_manager
+
+def upload_key(path):
+    '''Storage index key of a file in the uploads folder (its relative path)'''
+    return os.path.relpath(path, Config.UPLOAD_FOLDER).replace(os.sep, '/')
+
+class BlobStore:
+    '''
+    Store uploads under the SHA-256 of their content
+    
+    A blob with digest abcdef... lives at <root>/ab/cd/abcdef....<ext>, so
+    no directory holds more than a few files and identical uploads share
+    one file. Each put registers the blob (or refreshes its last access)
+    in the storage index, so an unsaved upload lives for UPLOAD_TTL after
+    it was last uploaded. Saved results pin their blob with retain() and
+    unpin it with release(); pinned blobs are never evicted.
+    
+    Blobs are written to a temporary file and hard-linked into place, so a
+    blob is either complete or absent and, when the same content is
+    uploaded concurrently, exactly one writer creates it.
+    '''
+    
+    def __init__(self, root=None, namespace='uploads', shard_levels=2, shard_width=2):
+        self.root = root or Config.UPLOAD_FOLDER
+        self.namespace = namespace
+        self.shard_levels = shard_levels
+        self.shard_width = shard_width
+    
+    def key_for(self, digest, ext):
+        '''Relative path (and index key) of the blob with the given digest'''
+        shards = [digest[i * self.shard_width:(i + 1) * self.shard_width] for i in range(self.shard_levels)]
+        return '/'.join(shards + [f"{digest}{ext}"])
+    
+    def path(self, key):
+        return os.path.join(self.root, *key.split('/'))
+    
+    def exists(self, key):
+        return os.path.exists(self.path(key))
+    
+    def put_bytes(self, data, ext, key=None):
+        '''
+        Store in-memory content
+        
+        Args:
+            data: File bytes
+            ext: File extension including the dot
+            key: Key from key_for_bytes, if already computed
+        
+        Returns:
+            Tuple of (key, created)
+        '''
+        key = key or self.key_for_bytes(data, ext)
+        if self.exists(key):
+            return self._reference(key, created=False)
+        
+        tmp_path = self._tmp_path()
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            return self._commit(tmp_path, key)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    
+    def key_for_bytes(self, data, ext):
+        return self.key_for(hashlib.sha256(data).hexdigest(), ext)
+    
+    def retain(self, key):
+        '''
+        Add a reference to a stored blob (a saved result using it)
+        
+        Returns:
+            Reference count after the update
+        '''
+        return get_storage_manager().add_reference(self.namespace, key)
+    
+    def release(self, key):
+        '''
+        Drop one reference to a blob
+        
+        Returns:
+            True if this was the last reference and the blob was deleted
+        '''
+        return get_storage_manager().release(self.namespace, key)
+    
+    def _commit(self, tmp_path, key):
+        final_path = self.path(key)
+        os.makedirs(os.path.dirname(final_path), exist_ok=True)
+        try:
+            # Fails if another writer got there first
+            os.link(tmp_path, final_path)
+            created = True
+        except FileExistsError:
+            created = False
+        except OSError:
+            # Filesystems without hard links: same content, so a rename race is harmless
+            created = not os.path.exists(final_path)
+            os.replace(tmp_path, final_path)
+        return self._reference(key, created)
+    
+    def _reference(self, key, created):
+        # Re-registering a known blob refreshes its last access (and TTL)
+        get_storage_manager().register(self.namespace, key)
+        print(f"{'✓ Stored' if created else '✓ Deduplicated'} upload {key}")
+        return key, created
+    
+    def _tmp_path(self):
+        tmp_dir = os.path.join(self.root, 'tmp')
+        os.makedirs(tmp_dir, exist_ok=True)
+        return os.path.join(tmp_dir, f"{uuid.uuid4().hex}.tmp")
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_blob_store():
+    '''Get the process-wide upload store'''
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = BlobStore()
+    return _store
@@ -0,0 +1,100 @@
+"""
+Circuit Breaker for Calls to Unreliable Upstream Services
+"""
+import threading
+import time
+
+class CircuitBreaker:
+    '''
+    Stop calling a failing dependency for a cool-down period
+    
+    The breaker is closed while calls succeed. After failure_threshold
+    consecutive failures it opens and allow() returns False until
+    reset_timeout seconds have passed; then a single trial call is let
+    through (half-open) and its outcome closes or re-opens the breaker.
+    A call that ends without an outcome (cancelled, interrupted) must call
+    abandon(), or the breaker would wait for the trial forever.
+    '''
+    
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+    
+    def __init__(self, name, failure_threshold=3, reset_timeout=60.0, clock=time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+    
+    @property
+    def state(self):
+        with self._lock:
+            return self._state()
+    
+    def _state(self):
+        if self._opened_at is None:
+            return self.CLOSED
+        if self._clock() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+    
+    def allow(self):
+        '''Return True if a call may be attempted now'''
+        with self._lock:
+            state = self._state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+    
+    def record_success(self):
+        with self._lock:
+            if self._opened_at is not None:
+                print(f"[{self.name}] ✓ Circuit closed")
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+    
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            was_trial = self._trial_in_flight
+            self._trial_in_flight = False
+            if was_trial or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+                print(f"[{self.name}] ✗ Circuit open for {self.reset_timeout:.0f}s "
+                      f"after {self._failures} failures")
+    
+    def abandon(self):
+        '''Forget a call that ended without an outcome; the next call may be the trial'''
+        with self._lock:
+            self._trial_in_flight = False
+    
+    def call(self, func, *args, **kwargs):
+        '''
+        Run func through the breaker
+        
+        Raises:
+            CircuitOpenError: If the breaker is open
+        '''
+        if not self.allow():
+            raise CircuitOpenError(f"Circuit '{self.name}' is open")
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+        except BaseException:
+            self.abandon()
+            raise
+        self.record_success()
+        return result
+
+class CircuitOpenError(Exception):
+    '''Raised when a call is refused because the circuit is open'''
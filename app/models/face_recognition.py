@@ -2,9 +2,27 @@ from deepface import DeepFace
 import os
 import wikipedia
 import cv2
+import threading
+
+from app.models.image_io import read_image_reduced, describe_source
 
 FACE_DB_PATH = "app/models/face_db"
 
+# Longest side faces are analyzed at; DeepFace crops and resizes each face
+# to at most 224px, so larger inputs only cost decode time
+FACE_INPUT_SIZE = 1280
+
+# Classical detector used to skip DeepFace on images without faces; loaded
+# once per thread (a classifier instance is not safe to share)
+_local = threading.local()
+
+def get_face_cascade():
+    cascade = getattr(_local, 'face_cascade', None)
+    if cascade is None:
+        cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+        _local.face_cascade = cascade
+    return cascade
+
 # Load all candidate comparison images
 def get_gallery():
     if not os.path.exists(FACE_DB_PATH):
@@ -25,21 +43,22 @@ def get_gallery():
     return gallery
 
 def recognize_faces(image_path):
+    # image_path may also be a decoded BGR array; it is read once and the
+    # array is handed to DeepFace, which accepts arrays as well as paths
     # Quick sanity check with classical face detector to avoid false positives on non-face images
-    img = cv2.imread(image_path)
+    img, _scale = read_image_reduced(image_path, FACE_INPUT_SIZE)
     if img is None:
-        print(f"Face recognition: cannot read image {image_path}")
+        print(f"Face recognition: cannot read image {describe_source(image_path)}")
         return []
     
     gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-    face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-    detected = face_cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(40, 40))
+    detected = get_face_cascade().detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(40, 40))
     
     if len(detected) == 0:
         print("Face recognition: no human faces detected by OpenCV; skipping DeepFace analysis")
         return []
     
-    faces = DeepFace.analyze(img_path=image_path,
+    faces = DeepFace.analyze(img_path=img,
                              actions=['age', 'gender', 'emotion'],
                              enforce_detection=False)
     if not isinstance(faces, list):
@@ -52,7 +71,7 @@ def recognize_faces(image_path):
         best_result = None
         for candidate in gallery:
             try:
-                result = DeepFace.verify(image_path, candidate['path'], enforce_detection=False)
+                result = DeepFace.verify(img, candidate['path'], enforce_detection=False)
                 if result['verified'] and result['distance'] < best_score:
                     best_score = result['distance']
                     best_match = candidate
@@ -0,0 +1,209 @@
+"""
+SQLite Index of Stored Files (size and last access, for cache lookups and eviction)
+"""
+import os
+import sqlite3
+import threading
+import time
+
+from config import Config
+
+class FileIndex:
+    '''
+    Per-namespace index of files kept on disk
+    
+    Each entry records the file's path, size, creation time, last access
+    time, hit count and, for shared files, a reference count, so lookups
+    and eviction decisions never have to scan the directory. The database
+    runs in WAL mode and is shared by all worker processes.
+    '''
+    
+    def __init__(self, namespace, db_path=None):
+        self.namespace = namespace
+        self.db_path = db_path or Config.STORAGE_INDEX_PATH
+        self._local = threading.local()
+        self._init_db()
+    
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+    
+    def _init_db(self):
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS files (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    hits INTEGER NOT NULL DEFAULT 0,
+                    parent TEXT,
+                    refs INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (namespace, key)
+                )
+            ''')
+            conn.execute(
+                'CREATE INDEX IF NOT EXISTS idx_files_lru ON files (namespace, last_access)'
+            )
+            conn.execute(
+                'CREATE INDEX IF NOT EXISTS idx_files_parent ON files (namespace, parent)'
+            )
+    
+    def get(self, key):
+        '''Get an entry without marking it as accessed, or None'''
+        row = self._connect().execute(
+            'SELECT * FROM files WHERE namespace = ? AND key = ?',
+            (self.namespace, key)
+        ).fetchone()
+        return dict(row) if row else None
+    
+    def lookup(self, key):
+        '''
+        Get an entry and mark it as accessed
+        
+        Returns:
+            Dictionary with the entry's fields, or None if not indexed
+        '''
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT * FROM files WHERE namespace = ? AND key = ?',
+                (self.namespace, key)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                'UPDATE files SET last_access = ?, hits = hits + 1 WHERE namespace = ? AND key = ?',
+                (time.time(), self.namespace, key)
+            )
+        return dict(row)
+    
+    def record(self, key, path, size, parent=None):
+        '''
+        Add or replace an entry for a newly written file
+        
+        Args:
+            key: Entry key (unique within the namespace)
+            path: File path relative to the namespace's directory
+            size: File size in bytes
+            parent: Optional key of the file this one was derived from
+                (e.g. the original of an annotated image)
+        '''
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT INTO files (namespace, key, path, size, created_at, last_access, hits, parent, refs) '
+                'VALUES (?, ?, ?, ?, ?, ?, 0, ?, 0) '
+                'ON CONFLICT (namespace, key) DO UPDATE SET '
+                'path = excluded.path, size = excluded.size, '
+                'last_access = excluded.last_access, parent = excluded.parent',
+                (self.namespace, key, path, size, now, now, parent)
+            )
+    
+    def add_reference(self, key, path, size):
+        '''
+        Record one more reference (a saved result) to a file, adding it if needed
+        
+        Returns:
+            Reference count after the update
+        '''
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT INTO files (namespace, key, path, size, created_at, last_access, hits, refs) '
+                'VALUES (?, ?, ?, ?, ?, ?, 0, 1) '
+                'ON CONFLICT (namespace, key) DO UPDATE SET '
+                'refs = refs + 1, last_access = excluded.last_access',
+                (self.namespace, key, path, size, now, now)
+            )
+            row = conn.execute(
+                'SELECT refs FROM files WHERE namespace = ? AND key = ?',
+                (self.namespace, key)
+            ).fetchone()
+        return row['refs']
+    
+    def release(self, key):
+        '''
+        Drop one reference to a shared file
+        
+        Returns:
+            Remaining reference count (0 when the file is no longer used, or
+            None if the key is not indexed)
+        '''
+        with self._connect() as conn:
+            conn.execute(
+                'UPDATE files SET refs = MAX(refs - 1, 0) WHERE namespace = ? AND key = ?',
+                (self.namespace, key)
+            )
+            row = conn.execute(
+                'SELECT refs FROM files WHERE namespace = ? AND key = ?',
+                (self.namespace, key)
+            ).fetchone()
+        return row['refs'] if row else None
+    
+    def touch(self, key):
+        '''Update the last access time of an entry'''
+        with self._connect() as conn:
+            conn.execute(
+                'UPDATE files SET last_access = ?, hits = hits + 1 WHERE namespace = ? AND key = ?',
+                (time.time(), self.namespace, key)
+            )
+    
+    def remove(self, key):
+        with self._connect() as conn:
+            conn.execute('DELETE FROM files WHERE namespace = ? AND key = ?', (self.namespace, key))
+    
+    def usage(self):
+        '''Return (file count, total bytes) for this namespace'''
+        row = self._connect().execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM files WHERE namespace = ?',
+            (self.namespace,)
+        ).fetchone()
+        return row[0], row[1]
+    
+    def least_recently_used(self, limit=100):
+        '''Return evictable entries ordered from least to most recently accessed'''
+        return self._evictable('', (), limit)
+    
+    def accessed_before(self, timestamp, limit=100):
+        '''Return evictable entries not accessed since timestamp, oldest first'''
+        return self._evictable('AND f.last_access < ?', (timestamp,), limit)
+    
+    def _evictable(self, condition, params, limit):
+        # Referenced files and the files derived from them are kept
+        rows = self._connect().execute(
+            'SELECT f.* FROM files f LEFT JOIN files p '
+            'ON p.namespace = f.namespace AND p.key = f.parent '
+            f'WHERE f.namespace = ? AND f.refs = 0 AND COALESCE(p.refs, 0) = 0 {condition} '
+            'ORDER BY f.last_access ASC LIMIT ?',
+            (self.namespace, *params, limit)
+        ).fetchall()
+        return [dict(row) for row in rows]
+    
+    def children(self, key):
+        '''Return entries derived from the given entry'''
+        rows = self._connect().execute(
+            'SELECT * FROM files WHERE namespace = ? AND parent = ?',
+            (self.namespace, key)
+        ).fetchall()
+        return [dict(row) for row in rows]
+    
+    def orphans(self, limit=100):
+        '''Return derived entries whose parent is no longer indexed'''
+        rows = self._connect().execute(
+            'SELECT c.* FROM files c LEFT JOIN files p '
+            'ON p.namespace = c.namespace AND p.key = c.parent '
+            'WHERE c.namespace = ? AND c.parent IS NOT NULL AND p.key IS NULL LIMIT ?',
+            (self.namespace, limit)
+        ).fetchall()
+        return [dict(row) for row in rows]
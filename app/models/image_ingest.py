@@ -0,0 +1,187 @@
+"""
+Upload Ingest: EXIF Orientation, Blob Storage and Reduced-Size Derivatives
+"""
+import io
+import os
+import threading
+
+import cv2
+from PIL import Image, ImageOps
+
+from config import Config
+from app.models.blob_store import get_blob_store, upload_key
+from app.models.storage_manager import get_storage_manager
+
+EXIF_ORIENTATION = 0x0112
+
+def derivative_sizes():
+    '''Longest side of each derivative, smallest first'''
+    return {
+        'thumb': Config.THUMBNAIL_MAX_SIDE,
+        'infer': Config.INFERENCE_MAX_SIDE,
+    }
+
+def derivative_filename(filename, kind):
+    '''Name of a derivative ('thumb' or 'infer') of an uploaded file'''
+    return f"{os.path.splitext(filename)[0]}_{kind}.jpg"
+
+def normalize_upload(data):
+    '''
+    Apply the EXIF orientation of an uploaded image
+    
+    Args:
+        data: Encoded image bytes as uploaded
+    
+    Returns:
+        Tuple of (upright image bytes, (width, height) or None if the
+        bytes are not a readable image); data itself is returned when it
+        is already upright
+    '''
+    try:
+        with Image.open(io.BytesIO(data)) as opened:
+            if opened.getexif().get(EXIF_ORIENTATION, 1) == 1:
+                return data, opened.size
+            img = ImageOps.exif_transpose(opened)
+            buffer = io.BytesIO()
+            img.save(buffer, format=opened.format, quality=95)
+    except (OSError, ValueError) as e:
+        print(f"Cannot read upload for normalization: {e}")
+        return data, None
+    print("✓ Applied EXIF orientation")
+    return buffer.getvalue(), img.size
+
+def store_upload(data, ext):
+    '''
+    Store an upload in the blob store and write the derivatives of new content
+    
+    The blob is keyed on the upright bytes from normalize_upload, so the
+    stored file always matches its key and a later upload of the same
+    image, rotated by EXIF or not, is deduplicated against it. Both
+    /api/upload and /api/analyze/image (in the background) store through
+    here.
+    
+    Args:
+        data: Encoded image bytes as uploaded
+        ext: File extension including the dot
+    
+    Returns:
+        Tuple of (key, created)
+    '''
+    data, _size = normalize_upload(data)
+    store = get_blob_store()
+    key, created = store.put_bytes(data, ext)
+    if created:
+        try:
+            ingest_upload(store.path(key))
+        except Exception as e:
+            print(f"Ingest warning: {e}")
+    return key, created
+
+def ingest_upload(filepath):
+    '''
+    Write the derivatives of a stored (upright) upload
+    
+    An inference-sized copy and a thumbnail are written next to the
+    original as JPEG, only when the original is larger than their size,
+    and registered with the storage manager as children of the original.
+    
+    Args:
+        filepath: Path of the stored upload
+    
+    Returns:
+        Dictionary with 'width', 'height' and the path of each derivative
+        written ('thumb', 'infer')
+    '''
+    with Image.open(filepath) as img:
+        img.load()
+        info = {'width': img.width, 'height': img.height}
+        if img.mode not in ('RGB', 'L'):
+            img = img.convert('RGB')
+        
+        for kind, path in planned_derivatives(filepath, img.size).items():
+            max_side = derivative_sizes()[kind]
+            copy = img.copy()
+            copy.thumbnail((max_side, max_side), Image.LANCZOS, reducing_gap=3.0)
+            _save_atomic(path, lambda p: copy.save(p, format='JPEG', quality=88))
+            _register(filepath, path)
+            info[kind] = path
+    return info
+
+def planned_derivatives(filepath, size):
+    '''
+    Derivatives an upload of the given size gets
+    
+    Args:
+        filepath: Path of the stored upload
+        size: (width, height) of the upright original
+    
+    Returns:
+        Dictionary with the path of each derivative ('thumb', 'infer')
+        smaller than the original
+    '''
+    return {
+        kind: _derivative_path(filepath, kind)
+        for kind, max_side in derivative_sizes().items()
+        if max(size) > max_side
+    }
+
+def fit_within(image, max_side):
+    '''
+    Downscale a decoded image so its longest side is at most max_side
+    
+    Returns:
+        Tuple of (image, scale) where scale maps the returned image's
+        coordinates back to the input's (1.0 if nothing was resized)
+    '''
+    height, width = image.shape[:2]
+    longest = max(height, width)
+    if longest <= max_side:
+        return image, 1.0
+    scale = longest / max_side
+    size = (max(1, round(width / scale)), max(1, round(height / scale)))
+    return cv2.resize(image, size, interpolation=cv2.INTER_AREA), width / size[0]
+
+def select_version(filepath, min_side):
+    '''
+    Pick the smallest stored version of an upload that is big enough
+    
+    Args:
+        filepath: Path of the original upload
+        min_side: Longest side the consumer needs (e.g. the detector's input)
+    
+    Returns:
+        Path of the smallest derivative whose longest side is at least
+        min_side, or of the original when no such derivative exists
+    '''
+    for kind, max_side in sorted(derivative_sizes().items(), key=lambda item: item[1]):
+        if max_side < min_side:
+            continue
+        path = _derivative_path(filepath, kind)
+        if os.path.exists(path):
+            return path
+    return filepath
+
+def thumbnail_for(filepath):
+    '''Path of an upload's thumbnail, or None if it has none'''
+    path = _derivative_path(filepath, 'thumb')
+    return path if os.path.exists(path) else None
+
+def original_size(filepath):
+    '''Return (width, height) of an image from its header, without decoding it'''
+    with Image.open(filepath) as img:
+        return img.size
+
+def _derivative_path(filepath, kind):
+    return os.path.join(os.path.dirname(filepath), derivative_filename(os.path.basename(filepath), kind))
+
+def _register(original_path, path):
+    get_storage_manager().register('uploads', upload_key(path), parent=upload_key(original_path))
+
+def _save_atomic(path, writer):
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        writer(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
@@ -0,0 +1,101 @@
+"""
+Image Decoding Helpers (file paths and in-memory buffers)
+"""
+import io
+
+import cv2
+import numpy as np
+from PIL import Image
+
+# JPEG decoders can scale by 1/2, 1/4 or 1/8 in the DCT domain, which is
+# much cheaper than decoding at full size and resizing
+REDUCED_DECODE_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+
+def decode_image(data):
+    '''
+    Decode an encoded image (JPEG, PNG, ...) from memory
+    
+    Args:
+        data: Encoded image bytes
+    
+    Returns:
+        BGR image array, or None if the bytes are not a readable image
+    '''
+    if not data:
+        return None
+    buffer = np.frombuffer(data, dtype=np.uint8)
+    return cv2.imdecode(buffer, cv2.IMREAD_COLOR)
+
+def read_image_reduced(image, target_side):
+    '''
+    Read an image no larger than needed for a consumer of target_side pixels
+    
+    The largest reduction (1/2, 1/4, 1/8) that keeps the longest side at
+    or above target_side is picked from the dimensions in the file header,
+    and applied while decoding.
+    
+    Args:
+        image: Path to an image file, or a BGR image array (returned as is)
+        target_side: Longest side the consumer needs, in pixels
+    
+    Returns:
+        Tuple of (BGR image array or None, scale) where scale maps the
+        returned image's coordinates back to the original's
+    '''
+    if isinstance(image, np.ndarray):
+        return image, 1.0
+    try:
+        with Image.open(image) as header:
+            size = header.size
+    except Exception:
+        return cv2.imread(image), 1.0
+    img = cv2.imread(image, _reduced_decode_flag(size, target_side))
+    return img, _decode_scale(size, img)
+
+def decode_image_reduced(data, target_side):
+    '''
+    Decode an encoded image from memory, reduced like read_image_reduced
+    
+    Returns:
+        Tuple of (BGR image array or None, scale)
+    '''
+    if not data:
+        return None, 1.0
+    try:
+        with Image.open(io.BytesIO(data)) as header:
+            size = header.size
+    except Exception:
+        return decode_image(data), 1.0
+    buffer = np.frombuffer(data, dtype=np.uint8)
+    img = cv2.imdecode(buffer, _reduced_decode_flag(size, target_side))
+    return img, _decode_scale(size, img)
+
+def _reduced_decode_flag(size, target_side):
+    longest = max(size)
+    for factor, flag in REDUCED_DECODE_FLAGS:
+        if longest / factor >= target_side:
+            return flag
+    return cv2.IMREAD_COLOR
+
+def _decode_scale(size, img):
+    # Compare longest sides, which EXIF rotation during decoding leaves alone
+    if img is None:
+        return 1.0
+    return max(size) / max(img.shape[:2])
+
+def describe_source(image):
+    '''Short label for log messages'''
+    if isinstance(image, np.ndarray):
+        return f"<in-memory image {image.shape[1]}x{image.shape[0]}>"
+    return image
+
+def encode_jpeg(img, quality=90):
+    '''Encode a BGR image array as JPEG bytes'''
+    ok, buffer = cv2.imencode('.jpg', img, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        raise ValueError("Could not encode image as JPEG")
+    return buffer.tobytes()
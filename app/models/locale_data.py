@@ -0,0 +1,457 @@
+"""
+Pre-translated Sentence Templates and COCO Class Names
+"""
+
+# The 80 classes YOLOv8 is trained on (COCO order)
+COCO_CLASSES = (
+    'person', 'bicycle', 'car', 'motorcycle', 'airplane', 'bus', 'train', 'truck',
+    'boat', 'traffic light', 'fire hydrant', 'stop sign', 'parking meter', 'bench',
+    'bird', 'cat', 'dog', 'horse', 'sheep', 'cow', 'elephant', 'bear', 'zebra',
+    'giraffe', 'backpack', 'umbrella', 'handbag', 'tie', 'suitcase', 'frisbee',
+    'skis', 'snowboard', 'sports ball', 'kite', 'baseball bat', 'baseball glove',
+    'skateboard', 'surfboard', 'tennis racket', 'bottle', 'wine glass', 'cup',
+    'fork', 'knife', 'spoon', 'bowl', 'banana', 'apple', 'sandwich', 'orange',
+    'broccoli', 'carrot', 'hot dog', 'pizza', 'donut', 'cake', 'chair', 'couch',
+    'potted plant', 'bed', 'dining table', 'toilet', 'tv', 'laptop', 'mouse',
+    'remote', 'keyboard', 'cell phone', 'microwave', 'oven', 'toaster', 'sink',
+    'refrigerator', 'book', 'clock', 'vase', 'scissors', 'teddy bear',
+    'hair drier', 'toothbrush'
+)
+
+# Column order of every CLASS_NAMES row
+CLASS_NAME_LANGUAGES = ('te', 'hi', 'es', 'de', 'fr', 'it', 'ja', 'ko', 'zh-cn')
+
+# English class name -> localized names in CLASS_NAME_LANGUAGES order
+# ('object' is the generic fallback class added by detect_objects)
+CLASS_NAMES = {
+    'person': ('వ్యక్తి', 'व्यक्ति', 'persona', 'Person', 'personne', 'persona', '人', '사람', '人'),
+    'bicycle': ('సైకిల్', 'साइकिल', 'bicicleta', 'Fahrrad', 'vélo', 'bicicletta', '自転車', '자전거', '自行车'),
+    'car': ('కారు', 'कार', 'coche', 'Auto', 'voiture', 'auto', '車', '자동차', '汽车'),
+    'motorcycle': ('మోటార్ సైకిల్', 'मोटरसाइकिल', 'motocicleta', 'Motorrad', 'moto', 'moto', 'オートバイ', '오토바이', '摩托车'),
+    'airplane': ('విమానం', 'हवाई जहाज़', 'avión', 'Flugzeug', 'avion', 'aereo', '飛行機', '비행기', '飞机'),
+    'bus': ('బస్సు', 'बस', 'autobús', 'Bus', 'bus', 'autobus', 'バス', '버스', '公共汽车'),
+    'train': ('రైలు', 'रेलगाड़ी', 'tren', 'Zug', 'train', 'treno', '電車', '기차', '火车'),
+    'truck': ('లారీ', 'ट्रक', 'camión', 'Lastwagen', 'camion', 'camion', 'トラック', '트럭', '卡车'),
+    'boat': ('పడవ', 'नाव', 'barco', 'Boot', 'bateau', 'barca', 'ボート', '보트', '船'),
+    'traffic light': ('ట్రాఫిక్ లైట్', 'ट्रैफ़िक लाइट', 'semáforo', 'Ampel', 'feu de circulation', 'semaforo', '信号機', '신호등', '红绿灯'),
+    'fire hydrant': ('ఫైర్ హైడ్రాంట్', 'अग्नि हाइड्रेंट', 'hidrante', 'Hydrant', "bouche d'incendie", 'idrante', '消火栓', '소화전', '消防栓'),
+    'stop sign': ('స్టాప్ గుర్తు', 'रुकने का संकेत', 'señal de stop', 'Stoppschild', 'panneau stop', 'segnale di stop', '一時停止標識', '정지 표지판', '停车标志'),
+    'parking meter': ('పార్కింగ్ మీటర్', 'पार्किंग मीटर', 'parquímetro', 'Parkuhr', 'parcmètre', 'parchimetro', 'パーキングメーター', '주차 미터기', '停车计时器'),
+    'bench': ('బెంచీ', 'बेंच', 'banco', 'Bank', 'banc', 'panchina', 'ベンチ', '벤치', '长椅'),
+    'bird': ('పక్షి', 'पक्षी', 'pájaro', 'Vogel', 'oiseau', 'uccello', '鳥', '새', '鸟'),
+    'cat': ('పిల్లి', 'बिल्ली', 'gato', 'Katze', 'chat', 'gatto', '猫', '고양이', '猫'),
+    'dog': ('కుక్క', 'कुत्ता', 'perro', 'Hund', 'chien', 'cane', '犬', '개', '狗'),
+    'horse': ('గుర్రం', 'घोड़ा', 'caballo', 'Pferd', 'cheval', 'cavallo', '馬', '말', '马'),
+    'sheep': ('గొర్రె', 'भेड़', 'oveja', 'Schaf', 'mouton', 'pecora', '羊', '양', '羊'),
+    'cow': ('ఆవు', 'गाय', 'vaca', 'Kuh', 'vache', 'mucca', '牛', '소', '牛'),
+    'elephant': ('ఏనుగు', 'हाथी', 'elefante', 'Elefant', 'éléphant', 'elefante', '象', '코끼리', '大象'),
+    'bear': ('ఎలుగుబంటి', 'भालू', 'oso', 'Bär', 'ours', 'orso', '熊', '곰', '熊'),
+    'zebra': ('జీబ్రా', 'ज़ेबरा', 'cebra', 'Zebra', 'zèbre', 'zebra', 'シマウマ', '얼룩말', '斑马'),
+    'giraffe': ('జిరాఫీ', 'जिराफ़', 'jirafa', 'Giraffe', 'girafe', 'giraffa', 'キリン', '기린', '长颈鹿'),
+    'backpack': ('బ్యాక్‌ప్యాక్', 'बैकपैक', 'mochila', 'Rucksack', 'sac à dos', 'zaino', 'リュックサック', '배낭', '背包'),
+    'umbrella': ('గొడుగు', 'छाता', 'paraguas', 'Regenschirm', 'parapluie', 'ombrello', '傘', '우산', '雨伞'),
+    'handbag': ('హ్యాండ్‌బ్యాగ్', 'हैंडबैग', 'bolso', 'Handtasche', 'sac à main', 'borsetta', 'ハンドバッグ', '핸드백', '手提包'),
+    'tie': ('టై', 'टाई', 'corbata', 'Krawatte', 'cravate', 'cravatta', 'ネクタイ', '넥타이', '领带'),
+    'suitcase': ('సూట్‌కేస్', 'सूटकेस', 'maleta', 'Koffer', 'valise', 'valigia', 'スーツケース', '여행 가방', '手提箱'),
+    'frisbee': ('ఫ్రిస్బీ', 'फ्रिसबी', 'frisbi', 'Frisbee', 'frisbee', 'frisbee', 'フリスビー', '프리스비', '飞盘'),
+    'skis': ('స్కీలు', 'स्की', 'esquís', 'Skier', 'skis', 'sci', 'スキー板', '스키', '滑雪板'),
+    'snowboard': ('స్నోబోర్డ్', 'स्नोबोर्ड', 'tabla de snowboard', 'Snowboard', 'snowboard', 'snowboard', 'スノーボード', '스노보드', '单板滑雪板'),
+    'sports ball': ('క్రీడా బంతి', 'खेल की गेंद', 'pelota', 'Ball', 'ballon', 'pallone', 'ボール', '공', '球'),
+    'kite': ('గాలిపటం', 'पतंग', 'cometa', 'Drachen', 'cerf-volant', 'aquilone', '凧', '연', '风筝'),
+    'baseball bat': ('బేస్‌బాల్ బ్యాట్', 'बेसबॉल बैट', 'bate de béisbol', 'Baseballschläger', 'batte de baseball', 'mazza da baseball', 'バット', '야구 방망이', '棒球棒'),
+    'baseball glove': ('బేస్‌బాల్ గ్లోవ్', 'बेसबॉल दस्ताना', 'guante de béisbol', 'Baseballhandschuh', 'gant de baseball', 'guantone da baseball', '野球グローブ', '야구 글러브', '棒球手套'),
+    'skateboard': ('స్కేట్‌బోర్డ్', 'स्केटबोर्ड', 'monopatín', 'Skateboard', 'skateboard', 'skateboard', 'スケートボード', '스케이트보드', '滑板'),
+    'surfboard': ('సర్ఫ్‌బోర్డ్', 'सर्फ़बोर्ड', 'tabla de surf', 'Surfbrett', 'planche de surf', 'tavola da surf', 'サーフボード', '서프보드', '冲浪板'),
+    'tennis racket': ('టెన్నిస్ రాకెట్', 'टेनिस रैकेट', 'raqueta de tenis', 'Tennisschläger', 'raquette de tennis', 'racchetta da tennis', 'テニスラケット', '테니스 라켓', '网球拍'),
+    'bottle': ('సీసా', 'बोतल', 'botella', 'Flasche', 'bouteille', 'bottiglia', 'ボトル', '병', '瓶子'),
+    'wine glass': ('వైన్ గ్లాస్', 'वाइन गिलास', 'copa de vino', 'Weinglas', 'verre à vin', 'bicchiere da vino', 'ワイングラス', '와인잔', '酒杯'),
+    'cup': ('కప్పు', 'कप', 'taza', 'Tasse', 'tasse', 'tazza', 'カップ', '컵', '杯子'),
+    'fork': ('ఫోర్క్', 'कांटा', 'tenedor', 'Gabel', 'fourchette', 'forchetta', 'フォーク', '포크', '叉子'),
+    'knife': ('కత్తి', 'चाकू', 'cuchillo', 'Messer', 'couteau', 'coltello', 'ナイフ', '칼', '刀'),
+    'spoon': ('చెంచా', 'चम्मच', 'cuchara', 'Löffel', 'cuillère', 'cucchiaio', 'スプーン', '숟가락', '勺子'),
+    'bowl': ('గిన్నె', 'कटोरा', 'cuenco', 'Schüssel', 'bol', 'ciotola', 'ボウル', '그릇', '碗'),
+    'banana': ('అరటిపండు', 'केला', 'plátano', 'Banane', 'banane', 'banana', 'バナナ', '바나나', '香蕉'),
+    'apple': ('ఆపిల్', 'सेब', 'manzana', 'Apfel', 'pomme', 'mela', 'りんご', '사과', '苹果'),
+    'sandwich': ('శాండ్‌విచ్', 'सैंडविच', 'sándwich', 'Sandwich', 'sandwich', 'panino', 'サンドイッチ', '샌드위치', '三明治'),
+    'orange': ('నారింజ', 'संतरा', 'naranja', 'Orange', 'orange', 'arancia', 'オレンジ', '오렌지', '橙子'),
+    'broccoli': ('బ్రోకలీ', 'ब्रोकली', 'brócoli', 'Brokkoli', 'brocoli', 'broccoli', 'ブロッコリー', '브로콜리', '西兰花'),
+    'carrot': ('క్యారెట్', 'गाजर', 'zanahoria', 'Karotte', 'carotte', 'carota', 'にんじん', '당근', '胡萝卜'),
+    'hot dog': ('హాట్ డాగ్', 'हॉट डॉग', 'perrito caliente', 'Hotdog', 'hot-dog', 'hot dog', 'ホットドッグ', '핫도그', '热狗'),
+    'pizza': ('పిజ్జా', 'पिज़्ज़ा', 'pizza', 'Pizza', 'pizza', 'pizza', 'ピザ', '피자', '披萨'),
+    'donut': ('డోనట్', 'डोनट', 'dona', 'Donut', 'beignet', 'ciambella', 'ドーナツ', '도넛', '甜甜圈'),
+    'cake': ('కేక్', 'केक', 'pastel', 'Kuchen', 'gâteau', 'torta', 'ケーキ', '케이크', '蛋糕'),
+    'chair': ('కుర్చీ', 'कुर्सी', 'silla', 'Stuhl', 'chaise', 'sedia', '椅子', '의자', '椅子'),
+    'couch': ('సోఫా', 'सोफ़ा', 'sofá', 'Sofa', 'canapé', 'divano', 'ソファ', '소파', '沙发'),
+    'potted plant': ('కుండీ మొక్క', 'गमले का पौधा', 'planta en maceta', 'Topfpflanze', 'plante en pot', 'pianta in vaso', '鉢植え', '화분', '盆栽'),
+    'bed': ('మంచం', 'बिस्तर', 'cama', 'Bett', 'lit', 'letto', 'ベッド', '침대', '床'),
+    'dining table': ('భోజనాల బల్ల', 'खाने की मेज़', 'mesa de comedor', 'Esstisch', 'table à manger', 'tavolo da pranzo', 'ダイニングテーブル', '식탁', '餐桌'),
+    'toilet': ('మరుగుదొడ్డి', 'शौचालय', 'inodoro', 'Toilette', 'toilettes', 'water', 'トイレ', '변기', '马桶'),
+    'tv': ('టీవీ', 'टीवी', 'televisor', 'Fernseher', 'télévision', 'televisore', 'テレビ', 'TV', '电视'),
+    'laptop': ('ల్యాప్‌టాప్', 'लैपटॉप', 'portátil', 'Laptop', 'ordinateur portable', 'portatile', 'ノートパソコン', '노트북', '笔记本电脑'),
+    'mouse': ('మౌస్', 'माउस', 'ratón', 'Maus', 'souris', 'mouse', 'マウス', '마우스', '鼠标'),
+    'remote': ('రిమోట్', 'रिमोट', 'mando a distancia', 'Fernbedienung', 'télécommande', 'telecomando', 'リモコン', '리모컨', '遥控器'),
+    'keyboard': ('కీబోర్డ్', 'कीबोर्ड', 'teclado', 'Tastatur', 'clavier', 'tastiera', 'キーボード', '키보드', '键盘'),
+    'cell phone': ('సెల్ ఫోన్', 'मोबाइल फ़ोन', 'teléfono móvil', 'Handy', 'téléphone portable', 'cellulare', '携帯電話', '휴대폰', '手机'),
+    'microwave': ('మైక్రోవేవ్', 'माइक्रोवेव', 'microondas', 'Mikrowelle', 'micro-ondes', 'microonde', '電子レンジ', '전자레인지', '微波炉'),
+    'oven': ('ఓవెన్', 'ओवन', 'horno', 'Backofen', 'four', 'forno', 'オーブン', '오븐', '烤箱'),
+    'toaster': ('టోస్టర్', 'टोस्टर', 'tostadora', 'Toaster', 'grille-pain', 'tostapane', 'トースター', '토스터', '烤面包机'),
+    'sink': ('సింక్', 'सिंक', 'fregadero', 'Waschbecken', 'évier', 'lavandino', 'シンク', '싱크대', '水槽'),
+    'refrigerator': ('ఫ్రిజ్', 'फ्रिज', 'refrigerador', 'Kühlschrank', 'réfrigérateur', 'frigorifero', '冷蔵庫', '냉장고', '冰箱'),
+    'book': ('పుస్తకం', 'किताब', 'libro', 'Buch', 'livre', 'libro', '本', '책', '书'),
+    'clock': ('గడియారం', 'घड़ी', 'reloj', 'Uhr', 'horloge', 'orologio', '時計', '시계', '时钟'),
+    'vase': ('పూలకుండీ', 'फूलदान', 'jarrón', 'Vase', 'vase', 'vaso', '花瓶', '꽃병', '花瓶'),
+    'scissors': ('కత్తెర', 'कैंची', 'tijeras', 'Schere', 'ciseaux', 'forbici', 'はさみ', '가위', '剪刀'),
+    'teddy bear': ('టెడ్డీ బేర్', 'टेडी बियर', 'osito de peluche', 'Teddybär', 'ours en peluche', 'orsacchiotto', 'テディベア', '테디 베어', '泰迪熊'),
+    'hair drier': ('హెయిర్ డ్రైయర్', 'हेयर ड्रायर', 'secador de pelo', 'Haartrockner', 'sèche-cheveux', 'asciugacapelli', 'ヘアドライヤー', '헤어드라이어', '吹风机'),
+    'toothbrush': ('టూత్ బ్రష్', 'टूथब्रश', 'cepillo de dientes', 'Zahnbürste', 'brosse à dents', 'spazzolino', '歯ブラシ', '칫솔', '牙刷'),
+    'object': ('వస్తువు', 'वस्तु', 'objeto', 'Objekt', 'objet', 'oggetto', '物体', '물체', '物体'),
+}
+
+# Sentence templates keyed by language code; slots are filled by localization.render_segment
+TEMPLATES = {
+    'en': {
+        'summary_people_one': "This image contains {people} person along with {others} other objects in the scene.",
+        'summary_people_many': "This image contains {people} people along with {others} other objects in the scene.",
+        'summary_no_people': "This image shows a scene with {total} detected objects. No people are visible in this image.",
+        'celebrity': "The person in the image is identified as {name}, categorized as {category}.",
+        'celebrity_link': "For more information about {name}, visit: {url}",
+        'person': "Person {index}: A {emotion} {gender} who appears to be around {age} years old. This individual is not recognized as a public figure or celebrity in our database.",
+        'objects_intro': "The scene also contains the following objects:",
+        'objects_list': "{items}.",
+        'object_one': "a {name}",
+        'object_many': "{count} {name}s",
+        'list_sep': ", ",
+        'list_last': ", and ",
+        'setting_outdoor': "Based on the detected objects, this appears to be an outdoor scene, possibly on a street, park, or public area.",
+        'setting_indoor': "The composition suggests this is an indoor setting, likely within a home, office, or enclosed space.",
+        'setting_mixed': "This scene contains a mix of elements that could indicate either an indoor-outdoor transition or a semi-enclosed environment.",
+        'activity_group': "Multiple people are present, suggesting a social gathering, meeting, or public event.",
+        'activity_single': "A single individual is captured, possibly in a portrait or candid moment.",
+        'complex_scene': "This is a complex scene with multiple elements. The composition suggests a {scene_type} setting.",
+        'confidence': "The detection system analyzed this image with an average confidence of {confidence:.1f}%, identifying objects across various categories with high accuracy.",
+        'relation_holding': "A {subject} is holding a {object}.",
+        'relation_on': "A {subject} is on the {object}.",
+        'relation_next_to': "A {subject} is next to a {object}.",
+        'relation_overlapping': "A {subject} overlaps with a {object}.",
+        'unknown_age': "unknown age",
+    },
+    'te': {
+        'summary_people_one': "ఈ చిత్రంలో {people} వ్యక్తి మరియు దృశ్యంలో {others} ఇతర వస్తువులు ఉన్నాయి.",
+        'summary_people_many': "ఈ చిత్రంలో {people} మంది వ్యక్తులు మరియు దృశ్యంలో {others} ఇతర వస్తువులు ఉన్నాయి.",
+        'summary_no_people': "ఈ చిత్రం {total} గుర్తించిన వస్తువులతో కూడిన దృశ్యాన్ని చూపిస్తుంది. ఈ చిత్రంలో వ్యక్తులు ఎవరూ కనిపించడం లేదు.",
+        'celebrity': "చిత్రంలోని వ్యక్తి {name}గా గుర్తించబడ్డారు, {category} వర్గానికి చెందినవారు.",
+        'celebrity_link': "{name} గురించి మరింత సమాచారం కోసం సందర్శించండి: {url}",
+        'person': "వ్యక్తి {index}: సుమారు {age} సంవత్సరాల వయస్సు ఉన్నట్లు కనిపించే {emotion} {gender}. ఈ వ్యక్తి మా డేటాబేస్‌లో ప్రముఖ వ్యక్తిగా గుర్తించబడలేదు.",
+        'objects_intro': "దృశ్యంలో ఈ క్రింది వస్తువులు కూడా ఉన్నాయి:",
+        'objects_list': "{items}.",
+        'object_one': "ఒక {name}",
+        'object_many': "{count} {name}",
+        'list_sep': ", ",
+        'list_last': " మరియు ",
+        'setting_outdoor': "గుర్తించిన వస్తువుల ఆధారంగా, ఇది బహిరంగ దృశ్యంగా కనిపిస్తుంది, బహుశా వీధి, పార్కు లేదా బహిరంగ ప్రదేశంలో.",
+        'setting_indoor': "కూర్పును బట్టి ఇది ఇంటి లోపలి ప్రదేశంగా కనిపిస్తుంది, బహుశా ఇల్లు, కార్యాలయం లేదా మూసివున్న ప్రదేశంలో.",
+        'setting_mixed': "ఈ దృశ్యంలో లోపలి మరియు బయటి అంశాల మిశ్రమం ఉంది, ఇది పాక్షికంగా మూసివున్న వాతావరణాన్ని సూచించవచ్చు.",
+        'activity_group': "అనేక మంది వ్యక్తులు ఉన్నారు, ఇది సామాజిక సమావేశం, మీటింగ్ లేదా బహిరంగ కార్యక్రమాన్ని సూచిస్తుంది.",
+        'activity_single': "ఒకే వ్యక్తి కనిపిస్తున్నారు, బహుశా పోర్ట్రెయిట్ లేదా సహజమైన క్షణంలో.",
+        'complex_scene': "ఇది అనేక అంశాలతో కూడిన సంక్లిష్టమైన దృశ్యం. కూర్పు {scene_type} వాతావరణాన్ని సూచిస్తుంది.",
+        'confidence': "గుర్తింపు వ్యవస్థ ఈ చిత్రాన్ని సగటున {confidence:.1f}% విశ్వసనీయతతో విశ్లేషించి, వివిధ వర్గాల వస్తువులను అధిక ఖచ్చితత్వంతో గుర్తించింది.",
+        'relation_holding': "{subject} {object}ను పట్టుకుని ఉంది.",
+        'relation_on': "{subject} {object} పై ఉంది.",
+        'relation_next_to': "{subject} {object} పక్కన ఉంది.",
+        'relation_overlapping': "{subject} మరియు {object} ఒకదానిపై ఒకటి కనిపిస్తున్నాయి.",
+        'unknown_age': "?",
+    },
+    'hi': {
+        'summary_people_one': "इस छवि में {people} व्यक्ति और दृश्य में {others} अन्य वस्तुएँ हैं।",
+        'summary_people_many': "इस छवि में {people} लोग और दृश्य में {others} अन्य वस्तुएँ हैं।",
+        'summary_no_people': "इस छवि में {total} पहचानी गई वस्तुओं वाला एक दृश्य है। इस छवि में कोई व्यक्ति दिखाई नहीं दे रहा है।",
+        'celebrity': "छवि में व्यक्ति की पहचान {name} के रूप में हुई है, जिन्हें {category} श्रेणी में रखा गया है।",
+        'celebrity_link': "{name} के बारे में अधिक जानकारी के लिए देखें: {url}",
+        'person': "व्यक्ति {index}: एक {emotion} {gender} जिसकी उम्र लगभग {age} वर्ष प्रतीत होती है। यह व्यक्ति हमारे डेटाबेस में किसी सार्वजनिक हस्ती या सेलिब्रिटी के रूप में पहचाना नहीं गया है।",
+        'objects_intro': "दृश्य में निम्नलिखित वस्तुएँ भी हैं:",
+        'objects_list': "{items}।",
+        'object_one': "एक {name}",
+        'object_many': "{count} {name}",
+        'list_sep': ", ",
+        'list_last': " और ",
+        'setting_outdoor': "पहचानी गई वस्तुओं के आधार पर, यह एक बाहरी दृश्य प्रतीत होता है, संभवतः किसी सड़क, पार्क या सार्वजनिक स्थान पर।",
+        'setting_indoor': "संरचना से पता चलता है कि यह एक भीतरी स्थान है, संभवतः किसी घर, कार्यालय या बंद जगह के अंदर।",
+        'setting_mixed': "इस दृश्य में ऐसे तत्वों का मिश्रण है जो अंदर-बाहर के संक्रमण या अर्ध-बंद वातावरण का संकेत दे सकते हैं।",
+        'activity_group': "कई लोग मौजूद हैं, जो किसी सामाजिक समारोह, बैठक या सार्वजनिक कार्यक्रम का संकेत देता है।",
+        'activity_single': "एक अकेला व्यक्ति दिखाई दे रहा है, संभवतः किसी पोर्ट्रेट या स्वाभाविक क्षण में।",
+        'complex_scene': "यह कई तत्वों वाला एक जटिल दृश्य है। संरचना {scene_type} परिवेश का संकेत देती है।",
+        'confidence': "पहचान प्रणाली ने इस छवि का विश्लेषण {confidence:.1f}% की औसत विश्वसनीयता के साथ किया, और विभिन्न श्रेणियों की वस्तुओं को उच्च सटीकता से पहचाना।",
+        'relation_holding': "{subject} ने {object} पकड़ा हुआ है।",
+        'relation_on': "{subject} {object} पर है।",
+        'relation_next_to': "{subject} {object} के बगल में है।",
+        'relation_overlapping': "{subject} और {object} एक-दूसरे पर आंशिक रूप से दिखाई देते हैं।",
+        'unknown_age': "?",
+    },
+    'es': {
+        'summary_people_one': "Esta imagen contiene {people} persona junto con otros {others} objetos en la escena.",
+        'summary_people_many': "Esta imagen contiene {people} personas junto con otros {others} objetos en la escena.",
+        'summary_no_people': "Esta imagen muestra una escena con {total} objetos detectados. No hay personas visibles en esta imagen.",
+        'celebrity': "La persona de la imagen ha sido identificada como {name}, en la categoría {category}.",
+        'celebrity_link': "Para más información sobre {name}, visite: {url}",
+        'person': "Persona {index}: {gender} con expresión de {emotion} que aparenta tener unos {age} años. Esta persona no está reconocida como figura pública o celebridad en nuestra base de datos.",
+        'objects_intro': "La escena también contiene los siguientes objetos:",
+        'objects_list': "{items}.",
+        'object_one': "{name}",
+        'object_many': "{name} ({count})",
+        'list_sep': ", ",
+        'list_last': " y ",
+        'setting_outdoor': "Según los objetos detectados, parece ser una escena al aire libre, posiblemente en una calle, un parque o un espacio público.",
+        'setting_indoor': "La composición sugiere un espacio interior, probablemente dentro de una casa, una oficina o un lugar cerrado.",
+        'setting_mixed': "Esta escena contiene una mezcla de elementos que podría indicar una transición entre interior y exterior o un entorno semicerrado.",
+        'activity_group': "Hay varias personas presentes, lo que sugiere una reunión social, un encuentro o un evento público.",
+        'activity_single': "Aparece una sola persona, posiblemente en un retrato o un momento espontáneo.",
+        'complex_scene': "Es una escena compleja con múltiples elementos. La composición sugiere un entorno {scene_type}.",
+        'confidence': "El sistema de detección analizó esta imagen con una confianza media del {confidence:.1f}%, identificando objetos de diversas categorías con gran precisión.",
+        'relation_holding': "Relación espacial: {subject} sosteniendo {object}.",
+        'relation_on': "Relación espacial: {subject} sobre {object}.",
+        'relation_next_to': "Relación espacial: {subject} junto a {object}.",
+        'relation_overlapping': "Relación espacial: {subject} superpuesto con {object}.",
+        'unknown_age': "?",
+    },
+    'de': {
+        'summary_people_one': "Dieses Bild enthält {people} Person sowie {others} weitere Objekte in der Szene.",
+        'summary_people_many': "Dieses Bild enthält {people} Personen sowie {others} weitere Objekte in der Szene.",
+        'summary_no_people': "Dieses Bild zeigt eine Szene mit {total} erkannten Objekten. Auf diesem Bild sind keine Personen zu sehen.",
+        'celebrity': "Die Person auf dem Bild wurde als {name} identifiziert, Kategorie: {category}.",
+        'celebrity_link': "Weitere Informationen über {name} finden Sie unter: {url}",
+        'person': "Person {index}: {gender} mit {emotion} Gesichtsausdruck, etwa {age} Jahre alt. Diese Person ist in unserer Datenbank nicht als Person des öffentlichen Lebens oder Prominente erfasst.",
+        'objects_intro': "Die Szene enthält außerdem folgende Objekte:",
+        'objects_list': "{items}.",
+        'object_one': "{name}",
+        'object_many': "{name} ({count})",
+        'list_sep': ", ",
+        'list_last': " und ",
+        'setting_outdoor': "Den erkannten Objekten nach scheint es sich um eine Außenszene zu handeln, etwa auf einer Straße, in einem Park oder an einem öffentlichen Ort.",
+        'setting_indoor': "Die Komposition deutet auf einen Innenraum hin, wahrscheinlich in einer Wohnung, einem Büro oder einem geschlossenen Raum.",
+        'setting_mixed': "Die Szene enthält eine Mischung von Elementen, die auf einen Übergang zwischen innen und außen oder eine halboffene Umgebung hindeuten könnte.",
+        'activity_group': "Mehrere Personen sind anwesend, was auf ein geselliges Beisammensein, ein Treffen oder eine öffentliche Veranstaltung hindeutet.",
+        'activity_single': "Eine einzelne Person ist zu sehen, möglicherweise in einem Porträt oder einem spontanen Moment.",
+        'complex_scene': "Dies ist eine komplexe Szene mit mehreren Elementen. Die Komposition deutet auf eine Umgebung der Art „{scene_type}“ hin.",
+        'confidence': "Das Erkennungssystem hat dieses Bild mit einer durchschnittlichen Konfidenz von {confidence:.1f} % analysiert und Objekte verschiedener Kategorien mit hoher Genauigkeit erkannt.",
+        'relation_holding': "Räumliche Beziehung: {subject} hält {object}.",
+        'relation_on': "Räumliche Beziehung: {subject} auf {object}.",
+        'relation_next_to': "Räumliche Beziehung: {subject} neben {object}.",
+        'relation_overlapping': "Räumliche Beziehung: {subject} überlappt mit {object}.",
+        'unknown_age': "?",
+    },
+    'fr': {
+        'summary_people_one': "Cette image contient {people} personne ainsi que {others} autres objets dans la scène.",
+        'summary_people_many': "Cette image contient {people} personnes ainsi que {others} autres objets dans la scène.",
+        'summary_no_people': "Cette image montre une scène avec {total} objets détectés. Aucune personne n'est visible sur cette image.",
+        'celebrity': "La personne sur l'image est identifiée comme {name}, dans la catégorie {category}.",
+        'celebrity_link': "Pour plus d'informations sur {name}, consultez : {url}",
+        'person': "Personne {index} : {gender} à l'air {emotion}, qui semble avoir environ {age} ans. Cette personne n'est pas reconnue comme une personnalité publique ou une célébrité dans notre base de données.",
+        'objects_intro': "La scène contient également les objets suivants :",
+        'objects_list': "{items}.",
+        'object_one': "{name}",
+        'object_many': "{name} ({count})",
+        'list_sep': ", ",
+        'list_last': " et ",
+        'setting_outdoor': "D'après les objets détectés, il semble s'agir d'une scène en extérieur, peut-être dans une rue, un parc ou un lieu public.",
+        'setting_indoor': "La composition suggère un espace intérieur, probablement une maison, un bureau ou un lieu clos.",
+        'setting_mixed': "Cette scène contient un mélange d'éléments pouvant indiquer une transition intérieur-extérieur ou un environnement semi-fermé.",
+        'activity_group': "Plusieurs personnes sont présentes, ce qui suggère un rassemblement social, une réunion ou un événement public.",
+        'activity_single': "Une seule personne est visible, peut-être dans un portrait ou un moment spontané.",
+        'complex_scene': "Il s'agit d'une scène complexe comportant de nombreux éléments. La composition suggère un cadre {scene_type}.",
+        'confidence': "Le système de détection a analysé cette image avec une confiance moyenne de {confidence:.1f} %, en identifiant des objets de diverses catégories avec une grande précision.",
+        'relation_holding': "Relation spatiale : {subject} tenant {object}.",
+        'relation_on': "Relation spatiale : {subject} sur {object}.",
+        'relation_next_to': "Relation spatiale : {subject} à côté de {object}.",
+        'relation_overlapping': "Relation spatiale : {subject} chevauchant {object}.",
+        'unknown_age': "?",
+    },
+    'it': {
+        'summary_people_one': "Questa immagine contiene {people} persona insieme ad altri {others} oggetti nella scena.",
+        'summary_people_many': "Questa immagine contiene {people} persone insieme ad altri {others} oggetti nella scena.",
+        'summary_no_people': "Questa immagine mostra una scena con {total} oggetti rilevati. Nessuna persona è visibile in questa immagine.",
+        'celebrity': "La persona nell'immagine è stata identificata come {name}, nella categoria {category}.",
+        'celebrity_link': "Per maggiori informazioni su {name}, visita: {url}",
+        'person': "Persona {index}: {gender} dall'aria {emotion}, che sembra avere circa {age} anni. Questa persona non è riconosciuta come personaggio pubblico o celebrità nel nostro database.",
+        'objects_intro': "La scena contiene anche i seguenti oggetti:",
+        'objects_list': "{items}.",
+        'object_one': "{name}",
+        'object_many': "{name} ({count})",
+        'list_sep': ", ",
+        'list_last': " e ",
+        'setting_outdoor': "In base agli oggetti rilevati, sembra una scena all'aperto, forse in una strada, un parco o un luogo pubblico.",
+        'setting_indoor': "La composizione suggerisce un ambiente interno, probabilmente una casa, un ufficio o uno spazio chiuso.",
+        'setting_mixed': "Questa scena contiene un mix di elementi che potrebbe indicare una transizione tra interno ed esterno o un ambiente semichiuso.",
+        'activity_group': "Sono presenti più persone, il che suggerisce un incontro sociale, una riunione o un evento pubblico.",
+        'activity_single': "È ritratta una sola persona, forse in un ritratto o in un momento spontaneo.",
+        'complex_scene': "Si tratta di una scena complessa con molti elementi. La composizione suggerisce un ambiente {scene_type}.",
+        'confidence': "Il sistema di rilevamento ha analizzato questa immagine con una confidenza media del {confidence:.1f}%, identificando oggetti di varie categorie con elevata precisione.",
+        'relation_holding': "Relazione spaziale: {subject} che tiene {object}.",
+        'relation_on': "Relazione spaziale: {subject} su {object}.",
+        'relation_next_to': "Relazione spaziale: {subject} accanto a {object}.",
+        'relation_overlapping': "Relazione spaziale: {subject} sovrapposto a {object}.",
+        'unknown_age': "?",
+    },
+    'ja': {
+        'summary_people_one': "この画像には{people}人の人物と、その他{others}個の物体が写っています。",
+        'summary_people_many': "この画像には{people}人の人物と、その他{others}個の物体が写っています。",
+        'summary_no_people': "この画像には{total}個の物体が検出されたシーンが写っています。人物は写っていません。",
+        'celebrity': "画像の人物は{name}（{category}）と識別されました。",
+        'celebrity_link': "{name}の詳細については、こちらをご覧ください: {url}",
+        'person': "人物{index}: {age}歳くらいに見える、{emotion}{gender}です。この人物はデータベース上で著名人として認識されていません。",
+        'objects_intro': "シーンには次の物体も含まれています:",
+        'objects_list': "{items}。",
+        'object_one': "{name}",
+        'object_many': "{name}（{count}個）",
+        'list_sep': "、",
+        'list_last': "、",
+        'setting_outdoor': "検出された物体から判断すると、通りや公園、公共の場所などの屋外のシーンのようです。",
+        'setting_indoor': "構図から、住宅、オフィス、その他の閉ざされた空間などの屋内のようです。",
+        'setting_mixed': "このシーンには屋内と屋外の要素が混在しており、屋内外の境界や半屋外の環境である可能性があります。",
+        'activity_group': "複数の人物がいることから、社交的な集まり、会議、または公共のイベントであると考えられます。",
+        'activity_single': "一人の人物が写っており、ポートレートや自然な瞬間を捉えたものと思われます。",
+        'complex_scene': "多くの要素を含む複雑なシーンです。構図から{scene_type}の場面であることがうかがえます。",
+        'confidence': "検出システムはこの画像を平均信頼度{confidence:.1f}%で分析し、さまざまなカテゴリーの物体を高い精度で識別しました。",
+        'relation_holding': "{subject}が{object}を持っています。",
+        'relation_on': "{subject}が{object}の上にあります。",
+        'relation_next_to': "{subject}が{object}の隣にあります。",
+        'relation_overlapping': "{subject}と{object}が重なっています。",
+        'unknown_age': "?",
+    },
+    'ko': {
+        'summary_people_one': "이 이미지에는 {people}명의 사람과 {others}개의 다른 물체가 있습니다.",
+        'summary_people_many': "이 이미지에는 {people}명의 사람과 {others}개의 다른 물체가 있습니다.",
+        'summary_no_people': "이 이미지는 {total}개의 물체가 감지된 장면을 보여줍니다. 이미지에 사람은 보이지 않습니다.",
+        'celebrity': "이미지 속 인물이 식별되었습니다: {name} ({category}).",
+        'celebrity_link': "{name}에 대한 자세한 정보: {url}",
+        'person': "인물 {index}: 약 {age}세로 보이는 {emotion} {gender}입니다. 이 사람은 데이터베이스에서 공인이나 유명인으로 인식되지 않았습니다.",
+        'objects_intro': "장면에는 다음 물체도 포함되어 있습니다:",
+        'objects_list': "{items}.",
+        'object_one': "{name}",
+        'object_many': "{name} {count}개",
+        'list_sep': ", ",
+        'list_last': ", ",
+        'setting_outdoor': "감지된 물체로 볼 때 거리, 공원 또는 공공장소 같은 야외 장면으로 보입니다.",
+        'setting_indoor': "구도로 보아 집, 사무실 또는 닫힌 실내 공간인 것 같습니다.",
+        'setting_mixed': "이 장면에는 실내와 실외 요소가 섞여 있어 실내외 경계나 반개방형 환경일 수 있습니다.",
+        'activity_group': "여러 사람이 있어 사교 모임, 회의 또는 공공 행사로 보입니다.",
+        'activity_single': "한 사람이 포착되어 있으며, 인물 사진이나 자연스러운 순간일 수 있습니다.",
+        'complex_scene': "여러 요소가 있는 복잡한 장면입니다. 구도로 보아 {scene_type} 환경입니다.",
+        'confidence': "감지 시스템은 평균 {confidence:.1f}%의 신뢰도로 이 이미지를 분석하여 다양한 범주의 물체를 높은 정확도로 식별했습니다.",
+        'relation_holding': "{subject}이(가) {object}을(를) 들고 있습니다.",
+        'relation_on': "{subject}이(가) {object} 위에 있습니다.",
+        'relation_next_to': "{subject}이(가) {object} 옆에 있습니다.",
+        'relation_overlapping': "{subject}과(와) {object}이(가) 겹쳐 있습니다.",
+        'unknown_age': "?",
+    },
+    'zh-cn': {
+        'summary_people_one': "这张图片中有{people}个人，以及场景中的其他{others}个物体。",
+        'summary_people_many': "这张图片中有{people}个人，以及场景中的其他{others}个物体。",
+        'summary_no_people': "这张图片显示了一个检测到{total}个物体的场景。图片中看不到任何人。",
+        'celebrity': "图片中的人物被识别为{name}，类别为{category}。",
+        'celebrity_link': "有关{name}的更多信息，请访问：{url}",
+        'person': "人物{index}：一位看起来约{age}岁、{emotion}的{gender}。此人未在我们的数据库中被识别为公众人物或名人。",
+        'objects_intro': "场景中还包含以下物体：",
+        'objects_list': "{items}。",
+        'object_one': "{name}",
+        'object_many': "{count}个{name}",
+        'list_sep': "、",
+        'list_last': "和",
+        'setting_outdoor': "根据检测到的物体，这似乎是一个户外场景，可能在街道、公园或公共区域。",
+        'setting_indoor': "从构图来看，这是一个室内环境，可能在家中、办公室或封闭空间内。",
+        'setting_mixed': "这个场景包含多种元素，可能是室内外过渡区域或半封闭环境。",
+        'activity_group': "有多人在场，可能是社交聚会、会议或公共活动。",
+        'activity_single': "画面中只有一个人，可能是肖像照或抓拍瞬间。",
+        'complex_scene': "这是一个包含多种元素的复杂场景。构图表明这是一个{scene_type}场景。",
+        'confidence': "检测系统以平均{confidence:.1f}%的置信度分析了这张图片，并以较高的准确率识别出各类物体。",
+        'relation_holding': "{subject}拿着{object}。",
+        'relation_on': "{subject}在{object}上。",
+        'relation_next_to': "{subject}在{object}旁边。",
+        'relation_overlapping': "{subject}与{object}重叠。",
+        'unknown_age': "?",
+    },
+}
+
+# Slot vocabularies keyed by language code, then slot name, then the English value
+VOCABULARY = {
+    'te': {
+        'emotion': {'angry': 'కోపంగా ఉన్న', 'disgust': 'అసహ్యంగా ఉన్న', 'fear': 'భయపడిన', 'happy': 'సంతోషంగా ఉన్న',
+                    'sad': 'విచారంగా ఉన్న', 'surprise': 'ఆశ్చర్యపోయిన', 'neutral': 'ప్రశాంతంగా ఉన్న'},
+        'gender': {'man': 'పురుషుడు', 'woman': 'స్త్రీ', 'person': 'వ్యక్తి'},
+        'scene_type': {'social or group': 'సామాజిక లేదా సమూహ', 'urban or transportation': 'పట్టణ లేదా రవాణా',
+                       'residential or home': 'నివాస లేదా గృహ', 'workspace or office': 'కార్యస్థల లేదా కార్యాలయ',
+                       'general': 'సాధారణ'},
+        'category': {'celebrity': 'ప్రముఖ వ్యక్తి'},
+    },
+    'hi': {
+        'emotion': {'angry': 'गुस्से में', 'disgust': 'नाराज़', 'fear': 'डरा हुआ', 'happy': 'खुश',
+                    'sad': 'उदास', 'surprise': 'आश्चर्यचकित', 'neutral': 'शांत'},
+        'gender': {'man': 'पुरुष', 'woman': 'महिला', 'person': 'व्यक्ति'},
+        'scene_type': {'social or group': 'सामाजिक या समूह', 'urban or transportation': 'शहरी या परिवहन',
+                       'residential or home': 'आवासीय या घरेलू', 'workspace or office': 'कार्यस्थल या कार्यालय',
+                       'general': 'सामान्य'},
+        'category': {'celebrity': 'सेलिब्रिटी'},
+    },
+    'es': {
+        'emotion': {'angry': 'enfado', 'disgust': 'asco', 'fear': 'miedo', 'happy': 'alegría',
+                    'sad': 'tristeza', 'surprise': 'sorpresa', 'neutral': 'neutralidad'},
+        'gender': {'man': 'un hombre', 'woman': 'una mujer', 'person': 'una persona'},
+        'scene_type': {'social or group': 'social o de grupo', 'urban or transportation': 'urbano o de transporte',
+                       'residential or home': 'residencial o doméstico', 'workspace or office': 'de trabajo u oficina',
+                       'general': 'general'},
+        'category': {'celebrity': 'Celebridad'},
+    },
+    'de': {
+        'emotion': {'angry': 'wütendem', 'disgust': 'angewidertem', 'fear': 'ängstlichem', 'happy': 'fröhlichem',
+                    'sad': 'traurigem', 'surprise': 'überraschtem', 'neutral': 'neutralem'},
+        'gender': {'man': 'ein Mann', 'woman': 'eine Frau', 'person': 'eine Person'},
+        'scene_type': {'social or group': 'Gesellschaft oder Gruppe', 'urban or transportation': 'Stadt oder Verkehr',
+                       'residential or home': 'Wohnbereich oder Zuhause', 'workspace or office': 'Arbeitsplatz oder Büro',
+                       'general': 'allgemein'},
+        'category': {'celebrity': 'Prominente'},
+    },
+    'fr': {
+        'emotion': {'angry': 'en colère', 'disgust': 'dégoûté', 'fear': 'apeuré', 'happy': 'joyeux',
+                    'sad': 'triste', 'surprise': 'surpris', 'neutral': 'neutre'},
+        'gender': {'man': 'un homme', 'woman': 'une femme', 'person': 'une personne'},
+        'scene_type': {'social or group': 'social ou de groupe', 'urban or transportation': 'urbain ou de transport',
+                       'residential or home': 'résidentiel ou domestique', 'workspace or office': 'de travail ou de bureau',
+                       'general': 'général'},
+        'category': {'celebrity': 'Célébrité'},
+    },
+    'it': {
+        'emotion': {'angry': 'arrabbiata', 'disgust': 'disgustata', 'fear': 'spaventata', 'happy': 'felice',
+                    'sad': 'triste', 'surprise': 'sorpresa', 'neutral': 'neutrale'},
+        'gender': {'man': 'un uomo', 'woman': 'una donna', 'person': 'una persona'},
+        'scene_type': {'social or group': 'sociale o di gruppo', 'urban or transportation': 'urbano o di trasporto',
+                       'residential or home': 'residenziale o domestico', 'workspace or office': "di lavoro o d'ufficio",
+                       'general': 'generico'},
+        'category': {'celebrity': 'Celebrità'},
+    },
+    'ja': {
+        'emotion': {'angry': '怒った表情の', 'disgust': '嫌悪の表情の', 'fear': '怯えた表情の', 'happy': '嬉しそうな',
+                    'sad': '悲しそうな', 'surprise': '驚いた表情の', 'neutral': '落ち着いた表情の'},
+        'gender': {'man': '男性', 'woman': '女性', 'person': '人物'},
+        'scene_type': {'social or group': '社交・グループ', 'urban or transportation': '都市・交通',
+                       'residential or home': '住宅・家庭', 'workspace or office': '職場・オフィス',
+                       'general': '一般'},
+        'category': {'celebrity': '著名人'},
+    },
+    'ko': {
+        'emotion': {'angry': '화난', 'disgust': '불쾌한', 'fear': '겁먹은', 'happy': '행복한',
+                    'sad': '슬픈', 'surprise': '놀란', 'neutral': '무표정한'},
+        'gender': {'man': '남성', 'woman': '여성', 'person': '사람'},
+        'scene_type': {'social or group': '사교 또는 단체', 'urban or transportation': '도시 또는 교통',
+                       'residential or home': '주거 또는 가정', 'workspace or office': '업무 또는 사무실',
+                       'general': '일반'},
+        'category': {'celebrity': '유명인'},
+    },
+    'zh-cn': {
+        'emotion': {'angry': '生气', 'disgust': '厌恶', 'fear': '害怕', 'happy': '开心',
+                    'sad': '难过', 'surprise': '惊讶', 'neutral': '平静'},
+        'gender': {'man': '男性', 'woman': '女性', 'person': '人'},
+        'scene_type': {'social or group': '社交或团体', 'urban or transportation': '城市或交通',
+                       'residential or home': '住宅或家庭', 'workspace or office': '工作或办公',
+                       'general': '一般'},
+        'category': {'celebrity': '名人'},
+    },
+}
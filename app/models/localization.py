@@ -0,0 +1,245 @@
+"""
+Localization Layer for Template-Based Scene Descriptions
+"""
+import re
+import string
+
+from app.models.locale_data import (
+    CLASS_NAMES, CLASS_NAME_LANGUAGES, TEMPLATES, VOCABULARY
+)
+
+DEFAULT_LANGUAGE = 'en'
+
+# Slots whose values are English vocabulary words rather than free data
+VOCABULARY_SLOTS = ('emotion', 'gender', 'scene_type', 'category')
+
+def supports_language(language):
+    '''Return True if descriptions can be rendered locally in this language'''
+    return language in TEMPLATES
+
+def localize_class_name(class_name, language=DEFAULT_LANGUAGE):
+    '''
+    Translate a COCO class name
+    
+    Args:
+        class_name: English class name as returned by YOLO
+        language: Target language code
+    
+    Returns:
+        Localized class name (the English name if no entry exists)
+    '''
+    if language == DEFAULT_LANGUAGE or language not in CLASS_NAME_LANGUAGES:
+        return class_name
+    names = CLASS_NAMES.get(class_name.lower())
+    if names is None:
+        return class_name
+    return names[CLASS_NAME_LANGUAGES.index(language)]
+
+def localize_term(slot, value, language=DEFAULT_LANGUAGE):
+    '''Translate a vocabulary word (emotion, gender, scene type, category)'''
+    if value is None:
+        return value
+    table = VOCABULARY.get(language, {}).get(slot, {})
+    return table.get(str(value).lower(), value)
+
+def _join_items(items, templates):
+    if len(items) == 1:
+        return items[0]
+    return templates['list_sep'].join(items[:-1]) + templates['list_last'] + items[-1]
+
+def render_segment(segment, language=DEFAULT_LANGUAGE):
+    '''
+    Render one description segment in the target language
+    
+    Args:
+        segment: Dictionary with a template 'key' and its 'params'
+        language: Target language code
+    
+    Returns:
+        Rendered sentence string
+    '''
+    templates = TEMPLATES.get(language, TEMPLATES[DEFAULT_LANGUAGE])
+    key = segment['key']
+    params = dict(segment.get('params') or {})
+    
+    if key == 'free_text':
+        return params.get('text', '')
+    
+    if key == 'objects_list':
+        items = []
+        for item in params.get('items', []):
+            name = localize_class_name(item['name'], language)
+            if item['count'] == 1:
+                items.append(templates['object_one'].format(name=name))
+            else:
+                items.append(templates['object_many'].format(name=name, count=item['count']))
+        return templates['objects_list'].format(items=_join_items(items, templates))
+    
+    if key.startswith('relation_'):
+        return templates[key].format(
+            subject=localize_class_name(params['subject'], language),
+            object=localize_class_name(params['object'], language)
+        )
+    
+    if key == 'scenario':
+        sentences = [templates[f"setting_{params['setting']}"]]
+        if params.get('activity'):
+            sentences.append(templates[f"activity_{params['activity']}"])
+        return ' '.join(sentences)
+    
+    for slot in VOCABULARY_SLOTS:
+        if slot in params:
+            params[slot] = localize_term(slot, params[slot], language)
+    if 'age' in params and params['age'] is None:
+        params['age'] = templates['unknown_age']
+    
+    return templates[key].format(**params)
+
+def render_segments(segments, language=DEFAULT_LANGUAGE, translate_free_text=None):
+    '''
+    Render a list of description segments
+    
+    Args:
+        segments: List of segment dictionaries from scene_description
+        language: Target language code
+        translate_free_text: Optional callable taking a list of free-text
+            segments (e.g. Wikipedia summaries) and returning their
+            translations; called once per render for non-English languages
+    
+    Returns:
+        List of rendered description lines
+    '''
+    lines = [render_segment(segment, language) for segment in segments]
+    
+    if translate_free_text and language != DEFAULT_LANGUAGE:
+        free_idx = [i for i, segment in enumerate(segments)
+                    if segment['key'] == 'free_text' and lines[i]]
+        if free_idx:
+            try:
+                translated = translate_free_text([lines[i] for i in free_idx])
+                for i, line in zip(free_idx, translated):
+                    lines[i] = line
+            except Exception as e:
+                print(f"[{language}] Free-text translation error: {e}")
+    
+    return lines
+
+# Templates that form whole sentences and can be recognised in English text
+SENTENCE_KEYS = (
+    'summary_people_one', 'summary_people_many', 'summary_no_people',
+    'celebrity', 'celebrity_link', 'person', 'objects_intro',
+    'setting_outdoor', 'setting_indoor', 'setting_mixed',
+    'activity_group', 'activity_single', 'complex_scene', 'confidence',
+    'relation_holding', 'relation_on', 'relation_next_to', 'relation_overlapping'
+)
+
+SLOT_PATTERNS = {
+    'people': r'\d+', 'others': r'\d+', 'total': r'\d+', 'index': r'\d+',
+    'confidence': r'\d+(?:\.\d+)?', 'age': r'\d+|unknown age|None',
+    'url': r'\S+', 'gender': r'\w+', 'emotion': r'\w+',
+}
+INT_SLOTS = ('people', 'others', 'total', 'index')
+CLASS_SLOTS = ('subject', 'object')
+
+_compiled_patterns = None
+_unmatched_sentence = re.compile(r'.*?(?:[.!?:](?=\s|$)|$)', re.S)
+
+def _compile_patterns():
+    '''Turn the English sentence templates into anchored regular expressions'''
+    global _compiled_patterns
+    if _compiled_patterns is not None:
+        return _compiled_patterns
+    
+    patterns = []
+    formatter = string.Formatter()
+    # Class name slots (relations, object lists) only match known class names
+    names = '|'.join(re.escape(n) for n in sorted(CLASS_NAMES, key=len, reverse=True))
+    for key in SENTENCE_KEYS:
+        regex = ''
+        for literal, field, _spec, _conv in formatter.parse(TEMPLATES[DEFAULT_LANGUAGE][key]):
+            regex += re.escape(literal)
+            if field:
+                slot = names if field in CLASS_SLOTS else SLOT_PATTERNS.get(field, r'.+?')
+                regex += f"(?P<{field}>{slot})"
+        patterns.append((key, re.compile(regex)))
+    
+    # Object lists ("a car, 2 chairs, and a cup.") are matched against known class names
+    item = rf'(?:a (?:{names})|\d+ (?:{names})s)'
+    patterns.append(('objects_list', re.compile(rf'(?P<items>{item}(?:, (?:and )?{item})*)\.')))
+    
+    _compiled_patterns = (patterns, re.compile(rf'a ({names})|(\d+) ({names})s'))
+    return _compiled_patterns
+
+def _segment_from_match(key, match, item_pattern):
+    params = match.groupdict()
+    if key == 'objects_list':
+        items = []
+        for single, count, plural in item_pattern.findall(params['items']):
+            items.append({'name': single, 'count': 1} if single else {'name': plural, 'count': int(count)})
+        return {'key': key, 'params': {'items': items}}
+    if key.startswith('setting_') or key.startswith('activity_'):
+        return {'key': key, 'params': {}}
+    for slot in INT_SLOTS:
+        if slot in params:
+            params[slot] = int(params[slot])
+    if 'confidence' in params:
+        params['confidence'] = float(params['confidence'])
+    if params.get('age') in ('unknown age', 'None'):
+        params['age'] = None
+    return {'key': key, 'params': params}
+
+def translate_templated_text(text, language):
+    '''
+    Translate English text made of known description templates without a remote service
+    
+    Sentences that match a template are re-rendered in the target language;
+    anything else (e.g. a Wikipedia summary) is left as it is.
+    
+    Args:
+        text: English text, such as a full scene description
+        language: Target language code
+    
+    Returns:
+        Tuple of (translated text, number of matched sentences, number of unmatched sentences)
+    '''
+    stripped = text.strip()
+    if language == DEFAULT_LANGUAGE or not supports_language(language) or not stripped:
+        return text, 0, 0
+    
+    # A bare class name ("car") is a dictionary lookup
+    if stripped.lower() in CLASS_NAMES:
+        return localize_class_name(stripped.lower(), language), 1, 0
+    
+    patterns, item_pattern = _compile_patterns()
+    templates = TEMPLATES[language]
+    output, matched, unmatched = [], 0, 0
+    pos = 0
+    while pos < len(text):
+        while pos < len(text) and text[pos].isspace():
+            pos += 1
+        if pos >= len(text):
+            break
+        
+        best = None
+        for key, pattern in patterns:
+            m = pattern.match(text, pos)
+            if m and (best is None or m.end() > best[1].end()):
+                best = (key, m)
+        
+        if best:
+            key, m = best
+            segment = _segment_from_match(key, m, item_pattern)
+            if key.startswith('setting_') or key.startswith('activity_'):
+                output.append(templates[key])
+            else:
+                output.append(render_segment(segment, language))
+            matched += 1
+            pos = m.end()
+        else:
+            m = _unmatched_sentence.match(text, pos)
+            end = max(m.end(), pos + 1)
+            output.append(text[pos:end])
+            unmatched += 1
+            pos = end
+    
+    return ' '.join(output), matched, unmatched
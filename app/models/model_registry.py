@@ -0,0 +1,78 @@
+"""
+Lazy Model Registry: Imports Each Vision Stage on First Use
+"""
+import importlib
+import threading
+import time
+
+# Stage name -> module; importing a module loads its ML stack (torch and
+# ultralytics for detection, deepface/TensorFlow for faces, OpenCV and
+# Pillow for the image stages, gTTS and the translators for text)
+STAGES = {
+    'detection': 'app.models.object_detection',
+    'faces': 'app.models.face_recognition',
+    'translation': 'app.models.translation',
+    'speech': 'app.models.speech',
+    'annotation': 'app.models.annotation_cache',
+    'ingest': 'app.models.image_ingest',
+    'image_io': 'app.models.image_io',
+}
+
+class ModelRegistry:
+    '''
+    Attribute access to vision stages that imports each one when first used
+    
+    models.detection.detect_objects(image) imports app.models.object_detection
+    (and torch) on the first call only; processes that never run a stage,
+    such as the auth pages or the history export, never pay for its import.
+    Import times are recorded per stage for the warm-up and benchmark logs.
+    '''
+    
+    def __init__(self, stages):
+        self._stages = dict(stages)
+        self._modules = {}
+        self._lock = threading.RLock()
+        self.import_times = {}
+    
+    def __getattr__(self, name):
+        # Only called for names that are not instance attributes
+        if name.startswith('_') or name not in self._stages:
+            raise AttributeError(f"No model stage named '{name}'")
+        return self.load(name)
+    
+    def load(self, name):
+        '''
+        Import a stage's module if it is not loaded yet
+        
+        Args:
+            name: Stage name from STAGES
+        
+        Returns:
+            The stage's module
+        
+        Raises:
+            KeyError: If the stage is unknown
+            ImportError: If the stage's dependencies are not installed
+        '''
+        module = self._modules.get(name)
+        if module is not None:
+            return module
+        
+        module_name = self._stages[name]
+        # RLock: a stage may import another stage while it loads
+        with self._lock:
+            module = self._modules.get(name)
+            if module is None:
+                start = time.perf_counter()
+                module = importlib.import_module(module_name)
+                self.import_times[name] = round(time.perf_counter() - start, 3)
+                self._modules[name] = module
+                print(f"✓ Loaded model stage '{name}' ({module_name}) in {self.import_times[name]}s")
+        return module
+    
+    def loaded(self):
+        '''Names of the stages imported so far'''
+        return list(self._modules)
+
+# Process-wide registry used by the routes and the warm-up
+models = ModelRegistry(STAGES)
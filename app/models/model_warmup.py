@@ -0,0 +1,137 @@
+"""
+Model Preloading, Warm-Up Inference and Readiness State
+"""
+import os
+import threading
+import time
+
+from config import Config
+
+# Thread pools of the numeric libraries read these when they are first
+# imported, so configure_threads() must run before torch/tensorflow load
+THREAD_ENV_VARS = (
+    'OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS',
+    'TF_NUM_INTRAOP_THREADS',
+)
+
+_state = {'ready': False, 'started_at': None, 'finished_at': None, 'stages': {}, 'error': None}
+_state_lock = threading.Lock()
+
+def configure_threads(threads=None):
+    '''
+    Limit the intra-op threads of torch, TensorFlow, OpenCV and BLAS
+    
+    Each worker process runs its own pools; without a limit every worker
+    starts one thread per core and they oversubscribe the CPU.
+    
+    Args:
+        threads: Threads per pool (default: Config.INFERENCE_THREADS)
+    '''
+    threads = threads or Config.INFERENCE_THREADS
+    for name in THREAD_ENV_VARS:
+        os.environ.setdefault(name, str(threads))
+    os.environ.setdefault('TF_NUM_INTEROP_THREADS', '1')
+    
+    try:
+        import cv2
+        cv2.setNumThreads(threads)
+    except ImportError:
+        pass
+
+def _warm_detection():
+    import numpy as np
+    from app.models.model_registry import models
+    
+    detection = models.detection
+    try:
+        import torch
+        torch.set_num_threads(Config.INFERENCE_THREADS)
+    except ImportError:
+        pass
+    model = detection.load_model()
+    size = detection.DETECTION_INPUT_SIZE
+    model(np.zeros((size, size, 3), dtype=np.uint8), verbose=False)
+
+def _warm_faces():
+    import numpy as np
+    from deepface import DeepFace
+    from app.models.model_registry import models
+    
+    models.faces.get_face_cascade()
+    # Builds the age, gender and emotion models and runs each once
+    DeepFace.analyze(img_path=np.zeros((224, 224, 3), dtype=np.uint8),
+                     actions=['age', 'gender', 'emotion'], enforce_detection=False)
+
+def _warm_descriptions():
+    from app.models.scene_description import generate_detailed_scene_description
+    from app.models.shopping import get_shopping_links_with_description
+    
+    objects = [
+        {'class': 'person', 'confidence': 0.9, 'bbox': [0, 0, 100, 200]},
+        {'class': 'cup', 'confidence': 0.8, 'bbox': [40, 80, 60, 100]},
+    ]
+    generate_detailed_scene_description(objects, [], None)
+    get_shopping_links_with_description(objects)
+
+# (name, function) in the order they run
+WARMUP_STAGES = (
+    ('detection', _warm_detection),
+    ('faces', _warm_faces),
+    ('descriptions', _warm_descriptions),
+)
+
+def warm_up_models(stages=None):
+    '''
+    Load every model and run one dummy inference through it
+    
+    Stages that fail are recorded and logged; the process is marked ready
+    once all stages have run (a failed optional stage, such as faces,
+    degrades the results but does not keep the worker out of rotation
+    unless it is listed in Config.REQUIRED_WARMUP_STAGES).
+    
+    Returns:
+        True if every required stage succeeded
+    '''
+    with _state_lock:
+        _state.update(ready=False, started_at=time.time(), finished_at=None, error=None, stages={})
+    
+    ok = True
+    for name, func in stages or WARMUP_STAGES:
+        start = time.perf_counter()
+        try:
+            func()
+            result = {'ok': True}
+        except Exception as e:
+            result = {'ok': False, 'error': str(e)}
+            print(f"✗ Warm-up stage '{name}' failed: {e}")
+            if name in Config.REQUIRED_WARMUP_STAGES:
+                ok = False
+        result['seconds'] = round(time.perf_counter() - start, 3)
+        print(f"Warm-up stage '{name}': {result['seconds']}s")
+        with _state_lock:
+            _state['stages'][name] = result
+    
+    with _state_lock:
+        _state['finished_at'] = time.time()
+        _state['ready'] = ok
+        if not ok:
+            _state['error'] = 'Required warm-up stage failed'
+    return ok
+
+def is_ready():
+    '''
+    True once warm-up has finished; always True when PRELOAD_MODELS is off
+    and models load on first use instead
+    '''
+    return _state['ready'] or not Config.PRELOAD_MODELS
+
+def readiness():
+    '''Copy of the warm-up state for /readyz'''
+    with _state_lock:
+        return {
+            'ready': is_ready(),
+            'started_at': _state['started_at'],
+            'finished_at': _state['finished_at'],
+            'stages': dict(_state['stages']),
+            'error': _state['error'],
+        }
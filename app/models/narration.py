@@ -0,0 +1,138 @@
+"""
+Concurrent Multilingual Narration Pipeline (translation -> speech)
+"""
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import queue
+import threading
+import time
+
+from config import Config
+from app.models.translation import translate_description, translate_description_async
+from app.models.speech import generate_speech, generate_speech_async
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def _get_pool(name, workers):
+    with _pools_lock:
+        if name not in _pools:
+            _pools[name] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"narrate-{name}")
+        return _pools[name]
+
+def iter_narrations(text, languages, segments=None, lines=None, slow=False):
+    '''
+    Translate and synthesize a description in several languages concurrently
+    
+    Each language is translated on the translation pool and, as soon as its
+    translation is ready, synthesized on the speech pool, so translation of
+    one language overlaps speech synthesis of another. Both pools are
+    bounded (NARRATION_TRANSLATE_WORKERS / NARRATION_TTS_WORKERS).
+    
+    Args:
+        text: English description text
+        languages: List of target language codes
+        segments: Optional template segments from scene_description
+        lines: Optional list of description lines
+        slow: Whether to speak slowly (default: False)
+    
+    Yields:
+        (language, narration) tuples in completion order, where narration is
+        a dictionary with 'text', 'audio_file' and, on failure, 'error'
+    '''
+    languages = list(dict.fromkeys(languages))
+    if not languages:
+        return
+    
+    translate_pool = _get_pool('translate', Config.NARRATION_TRANSLATE_WORKERS)
+    tts_pool = _get_pool('tts', Config.NARRATION_TTS_WORKERS)
+    results = queue.Queue()
+    
+    def on_spoken(lang, translated, future):
+        try:
+            audio_file = future.result()
+            narration = {'text': translated, 'audio_file': audio_file}
+            if not audio_file:
+                narration['error'] = 'Failed to generate audio'
+        except Exception as e:
+            narration = {'text': translated, 'audio_file': None, 'error': str(e)}
+        results.put((lang, narration))
+    
+    def on_translated(lang, future):
+        try:
+            translated = future.result()
+        except Exception as e:
+            print(f"[{lang}] Narration translation error: {e}")
+            translated = text
+        tts_pool.submit(generate_speech, translated, lang, slow).add_done_callback(
+            lambda f: on_spoken(lang, translated, f)
+        )
+    
+    for lang in languages:
+        translate_pool.submit(translate_description, text, lang, segments, lines).add_done_callback(
+            lambda f, lang=lang: on_translated(lang, f)
+        )
+    
+    deadline = time.monotonic() + Config.NARRATION_TIMEOUT
+    pending = set(languages)
+    while pending:
+        try:
+            lang, narration = results.get(timeout=max(0.0, deadline - time.monotonic()))
+        except queue.Empty:
+            break
+        pending.discard(lang)
+        yield lang, narration
+    
+    for lang in pending:
+        yield lang, {'text': None, 'audio_file': None, 'error': 'Timed out'}
+
+async def iter_narrations_async(text, languages, segments=None, lines=None, slow=False):
+    '''
+    Async iter_narrations for the async serving mode
+    
+    Every language runs as one task on the event loop (translate, then
+    speak); the network calls share pooled connections, so no worker pools
+    are needed and many requests can narrate at once.
+    
+    Yields:
+        (language, narration) tuples in completion order
+    '''
+    languages = list(dict.fromkeys(languages))
+    
+    async def narrate_one(lang):
+        try:
+            translated = await translate_description_async(text, lang, segments, lines)
+        except Exception as e:
+            print(f"[{lang}] Narration translation error: {e}")
+            translated = text
+        audio_file = await generate_speech_async(translated, lang, slow)
+        narration = {'text': translated, 'audio_file': audio_file}
+        if not audio_file:
+            narration['error'] = 'Failed to generate audio'
+        return lang, narration
+    
+    tasks = [asyncio.ensure_future(narrate_one(lang)) for lang in languages]
+    pending = set(languages)
+    try:
+        for next_done in asyncio.as_completed(tasks, timeout=Config.NARRATION_TIMEOUT):
+            try:
+                lang, narration = await next_done
+            except asyncio.TimeoutError:
+                break
+            pending.discard(lang)
+            yield lang, narration
+    finally:
+        for task in tasks:
+            task.cancel()
+    
+    for lang in pending:
+        yield lang, {'text': None, 'audio_file': None, 'error': 'Timed out'}
+
+def narrate(text, languages, segments=None, lines=None, slow=False):
+    '''
+    Narrate a description in several languages and wait for all of them
+    
+    Returns:
+        Dictionary with language codes as keys and narrations as values
+    '''
+    return dict(iter_narrations(text, languages, segments=segments, lines=lines, slow=slow))
@@ -2,11 +2,12 @@
 Enhanced Object Detection with PyTorch 2.6 Compatibility
 """
 from ultralytics import YOLO
-import cv2
 import os
 import torch
 import warnings
 
+from app.models.image_io import read_image_reduced, describe_source
+
 # Suppress warnings
 warnings.filterwarnings('ignore')
 
@@ -21,6 +22,9 @@ except:
 # Global model instance
 model = None
 
+# Longest side YOLOv8 resizes its input to; larger images add no detail
+DETECTION_INPUT_SIZE = 640
+
 def load_model():
     """Load YOLO model with proper error handling"""
     global model
@@ -39,7 +43,7 @@ def detect_objects(image_path, confidence=0.25):
     Detect objects using YOLOv8
     
     Args:
-        image_path: Path to image
+        image_path: Path to image, or an already decoded BGR image array
         confidence: Confidence threshold (default: 0.25)
     
     Returns:
@@ -50,20 +54,20 @@ def detect_objects(image_path, confidence=0.25):
         model = load_model()
         
         # Check if image exists
-        if not os.path.exists(image_path):
+        if isinstance(image_path, str) and not os.path.exists(image_path):
             print(f"✗ Image not found: {image_path}")
             return []
         
-        # Verify image is readable
-        img = cv2.imread(image_path)
+        # Verify image is readable; large files are decoded at reduced size
+        img, scale = read_image_reduced(image_path, DETECTION_INPUT_SIZE)
         if img is None:
             print(f"✗ Cannot read image: {image_path}")
             return []
         
-        print(f"✓ Processing image: {image_path} ({img.shape})")
+        print(f"✓ Processing image: {describe_source(image_path)} ({img.shape})")
         
-        # Run detection
-        results = model(image_path, conf=confidence)
+        # Run detection on the decoded array so the file is only read once
+        results = model(img, conf=confidence)
         
         detected_objects = []
         
@@ -78,10 +82,11 @@ def detect_objects(image_path, confidence=0.25):
                     cls = int(box.cls[0])
                     class_name = model.names[cls]
                     
+                    # Boxes are reported in the original image's coordinates
                     detected_objects.append({
                         'class': class_name,
                         'confidence': conf,
-                        'bbox': [int(x1), int(y1), int(x2), int(y2)]
+                        'bbox': [int(x1 * scale), int(y1 * scale), int(x2 * scale), int(y2 * scale)]
                     })
                     
                     print(f"  - {class_name}: {conf*100:.1f}%")
@@ -90,7 +95,7 @@ def detect_objects(image_path, confidence=0.25):
         
         # Fallback: if model did not return any objects, treat whole image as a generic object
         if not detected_objects:
-            h, w = img.shape[:2]
+            h, w = (round(side * scale) for side in img.shape[:2])
             print("⚠ Model did not recognize any known classes; adding a generic object region covering the image")
             detected_objects.append({
                 'class': 'object',
@@ -106,6 +111,22 @@ def detect_objects(image_path, confidence=0.25):
         traceback.print_exc()
         return []
 
+def scale_detections(detected_objects, scale):
+    """
+    Map bounding boxes found on a reduced image back to original coordinates
+    
+    Args:
+        detected_objects: List of detected objects (updated in place)
+        scale: Ratio of original to reduced image size
+    
+    Returns:
+        The same list
+    """
+    if scale != 1.0:
+        for obj in detected_objects:
+            obj['bbox'] = [int(round(v * scale)) for v in obj['bbox']]
+    return detected_objects
+
 def get_description(detected_objects):
     '''Generate natural language description of detected objects'''
     if not detected_objects:
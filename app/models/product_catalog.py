@@ -0,0 +1,217 @@
+"""
+Local Product Catalog (SQLite FTS5 index built from a CSV or JSON feed)
+
+Feed format (PRODUCT_CATALOG_FEED):
+
+    JSON  {"sample": false,
+           "classes": {"cup": "A small open container for drinks."},
+           "products": [{"id": "sku-123", "class": "cup", "title": "...",
+                         "description": "...", "tags": "mug ceramic coffee",
+                         "retailer": "...", "url": "https://...", "price": 9.99}]}
+    CSV   header row of PRODUCT_FIELDS, one product per row
+
+Every product needs 'class' (a COCO class name as returned by
+detect_objects) and 'title'; 'price' is a number in the shop's currency
+and may be empty. 'tags' are extra search words, so they should not
+repeat the class. The bundled catalog/products.sample.json is a sample
+("sample": true): retailer search links per class, without prices.
+"""
+import csv
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+
+from config import Config
+
+# Feed columns; 'class' is the COCO class a product is suggested for
+PRODUCT_FIELDS = ('id', 'class', 'title', 'description', 'tags', 'retailer', 'url', 'price')
+
+class ProductCatalog:
+    '''
+    Offline product suggestions per detected class
+    
+    Products are loaded from a feed into a SQLite database with an FTS5
+    index over class, title, tags and description. A search returns only
+    the products listed under the detected class, ranked with bm25 over
+    their title and tags. The index is rebuilt only when the feed's
+    content changes, and search results are cached per (class, limit)
+    until then, so a lookup after the first is a dictionary hit.
+    
+    Feeds are JSON or CSV (format in the module docstring).
+    '''
+    
+    def __init__(self, feed_path=None, db_path=None):
+        self.feed_path = feed_path or Config.PRODUCT_CATALOG_FEED
+        self.db_path = db_path or Config.PRODUCT_CATALOG_DB
+        self._local = threading.local()
+        self._cache = {}
+        self._lock = threading.Lock()
+        self.available = True
+        try:
+            self._init_db()
+            self.refresh()
+        except (OSError, ValueError, sqlite3.Error) as e:
+            print(f"Product catalog unavailable: {e}")
+            self.available = False
+    
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
+    
+    def _init_db(self):
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript('''
+                CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+                CREATE TABLE IF NOT EXISTS classes (name TEXT PRIMARY KEY, description TEXT);
+                CREATE VIRTUAL TABLE IF NOT EXISTS products USING fts5(
+                    class, title, tags, description,
+                    product_id UNINDEXED, retailer UNINDEXED, url UNINDEXED, price UNINDEXED
+                );
+            ''')
+    
+    def refresh(self):
+        '''
+        Re-index the feed if its content changed since the last build
+        
+        Returns:
+            True if the index was rebuilt
+        '''
+        with open(self.feed_path, 'rb') as f:
+            data = f.read()
+        signature = hashlib.sha256(data).hexdigest()
+        
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT value FROM meta WHERE key = 'feed'").fetchone()
+            if row and row['value'] == signature:
+                return False
+            
+            classes, products, sample = parse_feed(self.feed_path, data)
+            with conn:
+                conn.execute('DELETE FROM products')
+                conn.execute('DELETE FROM classes')
+                conn.executemany('INSERT INTO classes (name, description) VALUES (?, ?)', classes.items())
+                conn.executemany(
+                    'INSERT INTO products (class, title, tags, description, product_id, retailer, url, price) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                    [(p['class'], p['title'], p.get('tags') or '', p.get('description') or '',
+                      p.get('id'), p.get('retailer'), p.get('url'), p.get('price')) for p in products]
+                )
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('feed', ?)", (signature,))
+            self._cache.clear()
+        
+        print(f"✓ Product catalog indexed: {len(products)} products, {len(classes)} classes")
+        if sample:
+            print(f"Product catalog {self.feed_path} is a sample feed (search links, no prices); "
+                  f"set PRODUCT_CATALOG_FEED to a real feed")
+        return True
+    
+    def search(self, class_name, limit=3):
+        '''
+        Ranked products for a detected class
+        
+        Args:
+            class_name: Class name as returned by detect_objects
+            limit: Maximum number of products
+        
+        Returns:
+            Tuple of product dictionaries (id, class, title, description,
+            retailer, url, price), best match first
+        '''
+        key = (class_name.lower(), limit)
+        cached = self._cache.get(key)
+        if cached is not None or not self.available:
+            return cached or ()
+        
+        # Detected classes are exact labels: only products listed under the
+        # class qualify (a "hot dog" roller is no suggestion for a dog). The
+        # phrase matches each of them through its class column; bm25 over
+        # title and tags puts those that also name it there first
+        query = '"' + class_name.lower().replace('"', '""') + '"'
+        try:
+            rows = self._connect().execute(
+                'SELECT product_id, class, title, description, retailer, url, price FROM products '
+                'WHERE products MATCH ? AND class = ? '
+                'ORDER BY bm25(products, 0.0, 2.0, 4.0, 0.0), rowid LIMIT ?',
+                (query, class_name.lower(), limit)
+            ).fetchall()
+        except sqlite3.Error as e:
+            print(f"Product catalog search error ({class_name}): {e}")
+            return ()
+        
+        results = tuple(
+            {
+                'id': row['product_id'], 'class': row['class'], 'title': row['title'],
+                'description': row['description'], 'retailer': row['retailer'],
+                'url': row['url'], 'price': row['price']
+            }
+            for row in rows
+        )
+        with self._lock:
+            self._cache[key] = results
+        return results
+    
+    def describe(self, class_name):
+        '''Catalog description of a class, or None'''
+        key = ('$description', class_name.lower())
+        if key in self._cache or not self.available:
+            return self._cache.get(key)
+        row = self._connect().execute(
+            'SELECT description FROM classes WHERE name = ?', (class_name.lower(),)
+        ).fetchone()
+        description = row['description'] if row else None
+        with self._lock:
+            self._cache[key] = description
+        return description
+
+def parse_feed(path, data):
+    '''
+    Parse a catalog feed
+    
+    Returns:
+        Tuple of ({class: description}, list of product dictionaries,
+        True if the feed is marked as a sample)
+    
+    Raises:
+        ValueError: If a product lacks a class or title
+    '''
+    text = data.decode('utf-8-sig')
+    if path.lower().endswith('.csv'):
+        classes = {}
+        products = list(csv.DictReader(text.splitlines()))
+        sample = False
+    else:
+        feed = json.loads(text)
+        classes = feed.get('classes', {})
+        products = feed.get('products', [])
+        sample = bool(feed.get('sample'))
+    
+    for number, product in enumerate(products, 1):
+        if not product.get('class') or not product.get('title'):
+            raise ValueError(f"Catalog product {number} needs a class and a title")
+        product['class'] = product['class'].strip().lower()
+        price = product.get('price')
+        product['price'] = float(price) if price not in ('', None) else None
+    return {name.lower(): text for name, text in classes.items()}, products, sample
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+def get_product_catalog():
+    '''Get the process-wide product catalog'''
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = ProductCatalog()
+    return _catalog
@@ -0,0 +1,205 @@
+"""
+Compact Storage Encoding for Saved Analysis Results
+"""
+import hashlib
+import json
+import threading
+
+# Version of the compact schema written by encode_result; documents saved
+# before it have no 'schema' field and are stored as the payload itself
+SCHEMA_VERSION = 1
+
+# Fields rebuilt from the detections and description segments on read
+DERIVED_FIELDS = ('objects', 'faces', 'person_detected', 'detailed_description', 'shopping_links')
+
+# Wikipedia summaries are stored once per content key in this shared collection
+WIKI_COLLECTION = 'wiki_info'
+
+_wiki_cache = {}
+_wiki_cache_lock = threading.Lock()
+
+def wiki_key(info):
+    '''Content key of a Wikipedia info dictionary'''
+    data = json.dumps(info, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha256(data).hexdigest()[:24]
+
+def encode_detections(objects):
+    '''
+    Columnar form of a detection list
+    
+    Returns:
+        Dictionary with the distinct 'classes', and per detection its index
+        into them ('cls'), its confidence ('conf', 4 decimals) and its box
+        as four consecutive integers in 'boxes'
+    '''
+    classes, cls, conf, boxes = [], [], [], []
+    index = {}
+    for obj in objects:
+        name = obj['class']
+        if name not in index:
+            index[name] = len(classes)
+            classes.append(name)
+        cls.append(index[name])
+        conf.append(round(float(obj['confidence']), 4))
+        boxes.extend(int(v) for v in obj['bbox'])
+    return {'classes': classes, 'cls': cls, 'conf': conf, 'boxes': boxes}
+
+def decode_detections(columns):
+    '''Rebuild the detection list from encode_detections'''
+    classes, boxes = columns['classes'], columns['boxes']
+    return [
+        {'class': classes[c], 'confidence': conf, 'bbox': boxes[4 * i:4 * i + 4]}
+        for i, (c, conf) in enumerate(zip(columns['cls'], columns['conf']))
+    ]
+
+def encode_result(data, save_shared):
+    '''
+    Convert a results payload into the compact stored schema
+    
+    Detections become columnar arrays; shopping links, person_detected and
+    the rendered description lines are dropped because decode_result
+    regenerates them from the detections and description segments;
+    Wikipedia info is written once to WIKI_COLLECTION and referenced by
+    key. Fields the encoder does not know are kept as they are.
+    
+    Args:
+        data: Results dictionary as returned by the analyze endpoints
+        save_shared: Callable (collection, key, document) storing a shared
+            document
+    
+    Returns:
+        New dictionary in the stored schema
+    '''
+    stored = {key: value for key, value in data.items()
+              if key not in DERIVED_FIELDS and value is not None}
+    stored['schema'] = SCHEMA_VERSION
+    stored['detections'] = encode_detections(data.get('objects') or [])
+    
+    wiki_refs = {}
+    faces = []
+    for face in data.get('faces') or []:
+        face = {key: value for key, value in face.items() if value is not None}
+        face.pop('is_celebrity', None)  # Implied by celebrity_name
+        category = face.pop('celebrity_category', None)
+        if category not in (None, 'Celebrity'):
+            face['celebrity_category'] = category
+        info = face.pop('celebrity_info', None)
+        if info:
+            key = wiki_key(info)
+            if key not in wiki_refs:
+                save_shared(WIKI_COLLECTION, key, info)
+                wiki_refs[key] = info
+            face['wiki'] = key
+        faces.append(face)
+    if faces:
+        stored['faces'] = faces
+    
+    description = data.get('detailed_description')
+    if isinstance(description, dict) and description.get('segments'):
+        summaries = {info.get('summary'): key for key, info in wiki_refs.items()}
+        segments = []
+        for segment in description['segments']:
+            text = (segment.get('params') or {}).get('text')
+            if segment['key'] == 'free_text' and text in summaries:
+                segment = {'key': 'free_text', 'params': {'wiki': summaries[text]}}
+            segments.append(segment)
+        stored['description'] = {
+            'language': description.get('language', 'en'),
+            'segments': segments
+        }
+    elif description:
+        stored['detailed_description'] = description  # Fallback text, not templated
+    
+    return stored
+
+def decode_result(stored, get_shared):
+    '''
+    Expand a stored document back into the results payload
+    
+    Documents saved before the compact schema (no 'schema' field) are
+    returned unchanged.
+    
+    Args:
+        stored: Document from the storage backend
+        get_shared: Callable (collection, keys) returning a dictionary of
+            the shared documents found
+    
+    Returns:
+        Results dictionary
+    '''
+    if stored.get('schema') != SCHEMA_VERSION:
+        return stored
+    
+    from app.models.localization import render_segments, localize_term
+    from app.models.scene_rules import classify_scene
+    from app.models.shopping import get_shopping_links_with_description
+    
+    data = {key: value for key, value in stored.items()
+            if key not in ('schema', 'detections', 'description', 'faces')}
+    objects = decode_detections(stored['detections'])
+    
+    wiki_keys = {face['wiki'] for face in stored.get('faces', []) if face.get('wiki')}
+    for segment in (stored.get('description') or {}).get('segments', []):
+        if 'wiki' in (segment.get('params') or {}):
+            wiki_keys.add(segment['params']['wiki'])
+    wiki = _wiki_info(wiki_keys, get_shared)
+    
+    faces = []
+    for face in stored.get('faces', []):
+        face = dict(face)
+        key = face.pop('wiki', None)
+        is_celebrity = bool(face.get('celebrity_name'))
+        face.setdefault('celebrity_name', None)
+        face['celebrity_info'] = wiki.get(key) if key else None
+        face['is_celebrity'] = is_celebrity
+        face.setdefault('celebrity_category', 'Celebrity' if is_celebrity else None)
+        face.setdefault('celebrity_confidence', None)
+        faces.append(face)
+    
+    data['objects'] = objects
+    data['faces'] = faces
+    data['person_detected'] = any(obj['class'].lower() == 'person' for obj in objects)
+    data['shopping_links'] = get_shopping_links_with_description(objects)
+    
+    description = stored.get('description')
+    if description:
+        language = description['language']
+        segments = []
+        for segment in description['segments']:
+            params = segment.get('params') or {}
+            if 'wiki' in params:
+                info = wiki.get(params['wiki']) or {}
+                segment = {'key': 'free_text', 'params': {'text': info.get('summary', '')}}
+            segments.append(segment)
+        
+        counts = {}
+        for obj in objects:
+            counts[obj['class']] = counts.get(obj['class'], 0) + 1
+        lines = render_segments(segments, language)
+        data['detailed_description'] = {
+            'full_description': ' '.join(lines),
+            'line_count': len(lines),
+            'description_lines': lines,
+            'has_celebrity': any(face['is_celebrity'] for face in faces),
+            'scene_type': localize_term('scene_type', classify_scene(counts), language),
+            'language': language,
+            'segments': segments
+        }
+    
+    return data
+
+def _wiki_info(keys, get_shared):
+    '''Wikipedia info by key; entries are immutable, so they are cached'''
+    with _wiki_cache_lock:
+        found = {key: _wiki_cache[key] for key in keys if key in _wiki_cache}
+    missing = [key for key in keys if key not in found]
+    if missing:
+        try:
+            fetched = get_shared(WIKI_COLLECTION, missing)
+        except Exception as e:
+            print(f"Wikipedia info lookup error: {e}")
+            fetched = {}
+        with _wiki_cache_lock:
+            _wiki_cache.update(fetched)
+        found.update(fetched)
+    return found
@@ -1,8 +1,10 @@
 """
 Detailed Scene Description Generator
 """
+from app.models.localization import render_segment, render_segments, localize_term
+from app.models.scene_rules import classify_scene, classify_setting, spatial_relations
 
-def generate_detailed_scene_description(detected_objects, recognized_faces, image_path):
+def generate_detailed_scene_description(detected_objects, recognized_faces, image_path, language='en'):
     """
     Generate a detailed description of the scene
     
@@ -10,11 +12,12 @@ def generate_detailed_scene_description(detected_objects, recognized_faces, imag
         detected_objects: List of detected objects from YOLO
         recognized_faces: List of recognized faces from DeepFace
         image_path: Path to analyzed image
+        language: Language code to render the description in (default: 'en')
     
     Returns:
         Dictionary with detailed descriptions
     """
-    description_lines = []
+    segments = []
     
     # Count objects
     object_counts = {}
@@ -27,15 +30,13 @@ def generate_detailed_scene_description(detected_objects, recognized_faces, imag
     total_people = object_counts.get('person', 0)
     
     if total_people > 0:
-        description_lines.append(
-            f"This image contains {total_people} {'person' if total_people == 1 else 'people'} "
-            f"along with {total_objects - total_people} other objects in the scene."
-        )
+        segments.append(_segment(
+            'summary_people_one' if total_people == 1 else 'summary_people_many',
+            people=total_people,
+            others=total_objects - total_people
+        ))
     else:
-        description_lines.append(
-            f"This image shows a scene with {total_objects} detected objects. "
-            f"No people are visible in this image."
-        )
+        segments.append(_segment('summary_no_people', total=total_objects))
     
     # === LINE 3-5: Celebrity/Person Details ===
     if recognized_faces and len(recognized_faces) > 0:
@@ -45,115 +46,82 @@ def generate_detailed_scene_description(detected_objects, recognized_faces, imag
                 celeb_category = face.get('celebrity_category', 'Celebrity')
                 celeb_info = face['celebrity_info']
                 
-                description_lines.append(
-                    f"The person in the image is identified as {celeb_name}, "
-                    f"categorized as {celeb_category}."
-                )
+                segments.append(_segment('celebrity', name=celeb_name, category=celeb_category))
                 
-                # Add Wikipedia summary
+                # Add Wikipedia summary (free text, the only part needing a translator)
                 if celeb_info.get('summary'):
-                    description_lines.append(celeb_info['summary'])
+                    segments.append(_segment('free_text', text=celeb_info['summary']))
                 
                 # Add Wikipedia link
                 if celeb_info.get('url'):
-                    description_lines.append(
-                        f"For more information about {celeb_name}, "
-                        f"visit: {celeb_info['url']}"
-                    )
+                    segments.append(_segment('celebrity_link', name=celeb_name, url=celeb_info['url']))
             else:
                 # Non-celebrity person description
-                gender = face.get('gender', 'person')
-                age = face.get('age', 'unknown age')
-                emotion = face.get('emotion', 'neutral')
-                
-                description_lines.append(
-                    f"Person {idx + 1}: A {emotion} {gender} who appears to be around {age} years old. "
-                    f"This individual is not recognized as a public figure or celebrity in our database."
-                )
+                segments.append(_segment(
+                    'person',
+                    index=idx + 1,
+                    emotion=face.get('emotion') or 'neutral',
+                    gender=face.get('gender') or 'person',
+                    age=face.get('age')
+                ))
     
     # === LINE 6-8: Objects and Environment ===
     if len(object_counts) > 1:  # More than just people
         non_person_objects = {k: v for k, v in object_counts.items() if k != 'person'}
         
         if non_person_objects:
-            description_lines.append(
-                "The scene also contains the following objects:"
-            )
-            
-            object_descriptions = []
-            for obj_name, count in list(non_person_objects.items())[:5]:  # Top 5 objects
-                if count == 1:
-                    object_descriptions.append(f"a {obj_name}")
-                else:
-                    object_descriptions.append(f"{count} {obj_name}s")
-            
-            description_lines.append(
-                f"{', '.join(object_descriptions[:-1])}, and {object_descriptions[-1]}."
-            )
+            segments.append(_segment('objects_intro'))
+            segments.append(_segment('objects_list', items=[
+                {'name': obj_name, 'count': count}
+                for obj_name, count in list(non_person_objects.items())[:5]  # Top 5 objects
+            ]))
+    
+    # === Spatial relations between detections (holding, on, next to, ...) ===
+    for relation in spatial_relations(detected_objects):
+        segments.append(_segment(
+            f"relation_{relation['relation']}",
+            subject=relation['subject'],
+            object=relation['object']
+        ))
     
     # === LINE 9-10: Context and Scenario ===
-    scenario = analyze_scenario(object_counts, recognized_faces)
-    description_lines.append(scenario)
+    segments.append(get_scenario_segment(object_counts, recognized_faces))
     
     # === LINE 11+: Additional Details ===
+    scene_type = classify_scene(object_counts)
     if total_objects > 5:
-        description_lines.append(
-            f"This is a complex scene with multiple elements. "
-            f"The composition suggests a {get_scene_type(object_counts)} setting."
-        )
+        segments.append(_segment('complex_scene', scene_type=scene_type))
     
     # Add confidence
     if detected_objects:
         avg_confidence = sum(obj['confidence'] for obj in detected_objects) / len(detected_objects)
-        description_lines.append(
-            f"The detection system analyzed this image with an average confidence of {avg_confidence*100:.1f}%, "
-            f"identifying objects across various categories with high accuracy."
-        )
+        segments.append(_segment('confidence', confidence=avg_confidence * 100))
+    
+    description_lines = render_segments(segments, language)
     
     return {
         'full_description': ' '.join(description_lines),
         'line_count': len(description_lines),
         'description_lines': description_lines,
         'has_celebrity': any(f.get('is_celebrity') for f in recognized_faces) if recognized_faces else False,
-        'scene_type': get_scene_type(object_counts)
+        'scene_type': localize_term('scene_type', scene_type, language),
+        'language': language,
+        'segments': segments
     }
 
-def analyze_scenario(object_counts, recognized_faces):
+def _segment(key, **params):
+    """Build a description segment (template key plus slot values)"""
+    return {'key': key, 'params': params}
+
+def get_scenario_segment(object_counts, recognized_faces):
+    """Build the scenario segment (setting plus optional activity)"""
+    setting, activity = classify_setting(object_counts)
+    return _segment('scenario', setting=setting, activity=activity)
+
+def analyze_scenario(object_counts, recognized_faces, language='en'):
     """Analyze and describe the likely scenario"""
-    
-    # Indoor vs Outdoor detection
-    outdoor_objects = {'car', 'truck', 'bus', 'bicycle', 'motorcycle', 'traffic light'}
-    indoor_objects = {'tv', 'laptop', 'mouse', 'keyboard', 'chair', 'couch', 'bed'}
-    
-    outdoor_count = sum(count for obj, count in object_counts.items() if obj in outdoor_objects)
-    indoor_count = sum(count for obj, count in object_counts.items() if obj in indoor_objects)
-    
-    if outdoor_count > indoor_count:
-        scenario = "Based on the detected objects, this appears to be an outdoor scene, possibly on a street, park, or public area."
-    elif indoor_count > outdoor_count:
-        scenario = "The composition suggests this is an indoor setting, likely within a home, office, or enclosed space."
-    else:
-        scenario = "This scene contains a mix of elements that could indicate either an indoor-outdoor transition or a semi-enclosed environment."
-    
-    # Activity detection
-    if 'person' in object_counts:
-        if object_counts['person'] > 1:
-            scenario += " Multiple people are present, suggesting a social gathering, meeting, or public event."
-        else:
-            scenario += " A single individual is captured, possibly in a portrait or candid moment."
-    
-    return scenario
+    return render_segment(get_scenario_segment(object_counts, recognized_faces), language)
 
-def get_scene_type(object_counts):
+def get_scene_type(object_counts, language='en'):
     """Determine the type of scene"""
-    
-    if 'person' in object_counts and object_counts['person'] >= 2:
-        return "social or group"
-    elif any(obj in object_counts for obj in ['car', 'bus', 'truck']):
-        return "urban or transportation"
-    elif any(obj in object_counts for obj in ['couch', 'bed', 'chair', 'tv']):
-        return "residential or home"
-    elif any(obj in object_counts for obj in ['laptop', 'keyboard', 'mouse']):
-        return "workspace or office"
-    else:
-        return "general"
+    return localize_term('scene_type', classify_scene(object_counts), language)
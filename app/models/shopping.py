@@ -3,6 +3,9 @@ Shopping Link Generator with Descriptions
 """
 from urllib.parse import quote
 
+from config import Config
+from app.models.product_catalog import get_product_catalog
+
 def get_shopping_links_with_description(detected_objects):
     """
     Generate shopping links with detailed descriptions for each object
@@ -29,6 +32,7 @@ def get_shopping_links_with_description(detected_objects):
                 unique_objects[obj_class]['count'] += 1
     
     # Generate shopping links and descriptions for each object
+    catalog = get_product_catalog()
     for obj_name, obj_data in unique_objects.items():
         count = obj_data['count']
         confidence = obj_data['confidence']
@@ -38,6 +42,7 @@ def get_shopping_links_with_description(detected_objects):
             'count': count,
             'confidence': round(confidence * 100, 1),
             'description': generate_object_description(obj_name, count),
+            'products': [dict(product) for product in catalog.search(obj_name, Config.PRODUCTS_PER_CLASS)],
             'shopping_links': [
                 {
                     'name': 'Amazon',
@@ -76,11 +81,10 @@ def generate_object_description(object_name, count):
         'tv': "A television set for viewing broadcast programs.",
     }
     
-    # Get description or generate generic one
-    base_description = object_descriptions.get(
-        object_name.lower(),
-        f"A {object_name} detected in the image."
-    )
+    # Get description from the catalog, or generate generic one
+    base_description = object_descriptions.get(object_name.lower()) \
+        or get_product_catalog().describe(object_name) \
+        or f"A {object_name} detected in the image."
     
     # Add count information
     if count > 1:
@@ -1,14 +1,53 @@
 """
-Text-to-Speech Module using gTTS - FIXED VERSION
+Text-to-Speech Module using gTTS with a Content-Addressed Audio Cache
 """
 from gtts import gTTS
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import io
 import os
+import re
 import uuid
 
+from config import Config
+from app.models.file_index import FileIndex
+
+_audio_index = None
+_tts_executor = None
+# One semaphore per event loop (asyncio primitives are bound to their loop)
+_tts_semaphores = {}
+
+# Sentence boundaries: Latin punctuation followed by whitespace, or CJK/Devanagari
+# full stops, which are not followed by a space
+SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+|(?<=[。！？।])\s*')
+MIN_SENTENCE_CHARS = 20
+STREAM_CHUNK_SIZE = 16 * 1024
+
+def get_audio_index():
+    '''Get the index of cached audio files'''
+    global _audio_index
+    if _audio_index is None:
+        _audio_index = FileIndex('audio')
+    return _audio_index
+
+def audio_cache_key(text, language='en', slow=False):
+    '''Content hash identifying the audio for (text, language, slow)'''
+    payload = f"{language}\0{int(bool(slow))}\0{text}".encode('utf-8')
+    return hashlib.sha256(payload).hexdigest()
+
+def audio_paths(text, language='en', slow=False):
+    '''Cache filename and path of the audio for (text, language, slow)'''
+    filename = f"{audio_cache_key(text, language, slow)[:40]}_{language}.mp3"
+    return filename, os.path.join(Config.AUDIO_FOLDER, filename)
+
 def generate_speech(text, language='en', slow=False):
     '''
     Generate speech from text using gTTS
     
+    Audio files are named by a hash of (text, language, slow), so a repeat
+    request returns the existing file without a gTTS round trip.
+    
     Args:
         text: Text to convert to speech
         language: Language code (default: 'en')
@@ -19,31 +58,43 @@ def generate_speech(text, language='en', slow=False):
     '''
     try:
         # Create audio directory if it doesn't exist
-        audio_dir = os.path.join('static', 'audio')
+        audio_dir = Config.AUDIO_FOLDER
         os.makedirs(audio_dir, exist_ok=True)
         
-        # Generate unique filename
-        filename = f"{uuid.uuid4().hex[:8]}_{language}.mp3"
-        filepath = os.path.join(audio_dir, filename)
+        # Content-addressed filename
+        filename, filepath = audio_paths(text, language, slow)
+        index = get_audio_index()
+        
+        if os.path.exists(filepath):
+            _index_cached(filename, filepath)
+            print(f"[{language}] ✓ Cache hit: {filename}")
+            return filename
         
         print(f"[{language}] Generating audio...")
         print(f"[{language}] Text length: {len(text)} chars")
         print(f"[{language}] Saving to: {filepath}")
         
-        # Generate speech
-        tts = gTTS(text=text, lang=language, slow=slow)
-        tts.save(filepath)
+        # Generate speech into a temp file, then publish it atomically
+        tmp_path = f"{filepath}.{uuid.uuid4().hex[:8]}.tmp"
+        try:
+            tts = gTTS(text=text, lang=language, slow=slow)
+            tts.save(tmp_path)
+            os.replace(tmp_path, filepath)
+        finally:
+            # Not in the file index, so eviction would never remove it
+            _remove_quietly(tmp_path)
         
         # Verify file exists
         if os.path.exists(filepath):
             size = os.path.getsize(filepath)
+            index.record(filename, filename, size)
             print(f"[{language}] ✓ Saved: {filepath} ({size} bytes)")
             print(f"[{language}] ✓ Returning filename: {filename}")
             return filename  # ONLY filename, NOT full path
         else:
             print(f"[{language}] ✗ File not created")
             return None
-        
+    
     except Exception as e:
         print(f"[{language}] ✗ Error: {str(e)}")
         import traceback
@@ -62,10 +113,15 @@ def generate_multilingual_audio(text_dict, languages):
         Dictionary with language codes and corresponding audio filenames
     '''
     audio_files = {}
+    requested = [lang for lang in languages if lang in text_dict]
+    if not requested:
+        return audio_files
     
-    for lang in languages:
-        if lang in text_dict:
-            audio_file = generate_speech(text_dict[lang], language=lang)
+    # Languages are synthesized concurrently; results are collected in order
+    with ThreadPoolExecutor(max_workers=min(len(requested), Config.NARRATION_TTS_WORKERS)) as pool:
+        futures = {lang: pool.submit(generate_speech, text_dict[lang], lang) for lang in requested}
+        for lang, future in futures.items():
+            audio_file = future.result()
             if audio_file:
                 audio_files[lang] = audio_file
                 print(f"[{lang}] ✓ Audio ready: {audio_file}")
@@ -73,3 +129,237 @@ def generate_multilingual_audio(text_dict, languages):
                 print(f"[{lang}] ✗ Audio failed")
     
     return audio_files
+
+def split_sentences(text):
+    '''
+    Split text into sentences for pipelined synthesis
+    
+    Fragments shorter than MIN_SENTENCE_CHARS are merged into the next
+    sentence so tiny pieces do not cost a gTTS request each.
+    '''
+    sentences = []
+    pending = ''
+    for part in SENTENCE_BOUNDARY.split(text.strip()):
+        part = part.strip()
+        if not part:
+            continue
+        pending = f"{pending} {part}" if pending else part
+        if len(pending) >= MIN_SENTENCE_CHARS:
+            sentences.append(pending)
+            pending = ''
+    if pending:
+        if sentences:
+            sentences[-1] = f"{sentences[-1]} {pending}"
+        else:
+            sentences.append(pending)
+    return sentences
+
+def _get_tts_executor():
+    global _tts_executor
+    if _tts_executor is None:
+        _tts_executor = ThreadPoolExecutor(
+            max_workers=Config.TTS_PIPELINE_WORKERS,
+            thread_name_prefix='tts'
+        )
+    return _tts_executor
+
+def _synthesize_sentence(sentence, language, slow):
+    buffer = io.BytesIO()
+    gTTS(text=sentence, lang=language, slow=slow).write_to_fp(buffer)
+    return buffer.getvalue()
+
+def stream_speech(text, language='en', slow=False):
+    '''
+    Stream MP3 audio for text sentence by sentence
+    
+    Sentences are synthesized in a pipeline (up to TTS_PIPELINE_WORKERS
+    ahead of the one being sent) and each is yielded as soon as it is ready,
+    so playback can start after the first sentence. Once the whole text has
+    been streamed the audio is stored in the content-addressed cache, and a
+    cached text is streamed straight from disk.
+    
+    Args:
+        text: Text to convert to speech
+        language: Language code (default: 'en')
+        slow: Whether to speak slowly (default: False)
+    
+    Yields:
+        Chunks of MP3 data
+    '''
+    filename, filepath = audio_paths(text, language, slow)
+    
+    if os.path.exists(filepath):
+        get_audio_index().touch(filename)
+        print(f"[{language}] ✓ Streaming cached audio: {filename}")
+        with open(filepath, 'rb') as f:
+            while True:
+                chunk = f.read(STREAM_CHUNK_SIZE)
+                if not chunk:
+                    return
+                yield chunk
+    
+    sentences = split_sentences(text)
+    print(f"[{language}] Streaming {len(sentences)} sentences...")
+    
+    executor = _get_tts_executor()
+    remaining = iter(sentences)
+    in_flight = deque()
+    
+    def submit_next():
+        sentence = next(remaining, None)
+        if sentence is not None:
+            in_flight.append(executor.submit(_synthesize_sentence, sentence, language, slow))
+    
+    for _ in range(Config.TTS_PIPELINE_WORKERS):
+        submit_next()
+    
+    parts = []
+    try:
+        while in_flight:
+            audio = in_flight.popleft().result()
+            submit_next()
+            parts.append(audio)
+            for i in range(0, len(audio), STREAM_CHUNK_SIZE):
+                yield audio[i:i + STREAM_CHUNK_SIZE]
+    finally:
+        # Client went away or synthesis failed: drop work nobody will hear
+        for future in in_flight:
+            future.cancel()
+    
+    # Nothing was said (whitespace or punctuation only): cache no empty MP3
+    audio = b''.join(parts)
+    if audio:
+        _store_audio(filename, filepath, audio, language)
+
+async def synthesize_async(text, language='en', slow=False):
+    '''
+    Synthesize MP3 audio without blocking the event loop (async serving mode)
+    
+    gTTS runs on the I/O executor; at most TTS_ASYNC_CONCURRENCY syntheses
+    run at once per event loop, so a burst of speech requests waits here
+    instead of taking every I/O thread from storage calls.
+    
+    Returns:
+        MP3 data
+    '''
+    import asyncio
+    from app.models.async_http import run_blocking
+    
+    loop = asyncio.get_running_loop()
+    semaphore = _tts_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _tts_semaphores.setdefault(loop, asyncio.Semaphore(Config.TTS_ASYNC_CONCURRENCY))
+    async with semaphore:
+        return await run_blocking(_synthesize_sentence, text, language, slow)
+
+async def generate_speech_async(text, language='en', slow=False):
+    '''
+    Async generate_speech: same content-addressed cache, synthesized with
+    synthesize_async; index and file writes run on the I/O executor
+    
+    Returns:
+        ONLY the filename, or None on failure
+    '''
+    from app.models.async_http import run_blocking
+    
+    try:
+        filename, filepath = audio_paths(text, language, slow)
+        if os.path.exists(filepath):
+            await run_blocking(_index_cached, filename, filepath)
+            print(f"[{language}] ✓ Cache hit: {filename}")
+            return filename
+        
+        print(f"[{language}] Generating audio ({len(text)} chars)...")
+        audio = await synthesize_async(text, language, slow)
+        await run_blocking(_store_audio, filename, filepath, audio, language)
+        return filename if os.path.exists(filepath) else None
+    
+    except Exception as e:
+        print(f"[{language}] ✗ Error: {str(e)}")
+        return None
+
+async def stream_speech_async(text, language='en', slow=False):
+    '''
+    Async stream_speech: sentences are synthesized TTS_PIPELINE_WORKERS
+    ahead as tasks on the event loop, and the full audio is cached at the end
+    
+    Yields:
+        Chunks of MP3 data
+    '''
+    import asyncio
+    from app.models.async_http import run_blocking
+    
+    filename, filepath = audio_paths(text, language, slow)
+    
+    if os.path.exists(filepath):
+        await run_blocking(get_audio_index().touch, filename)
+        print(f"[{language}] ✓ Streaming cached audio: {filename}")
+        data = await run_blocking(_read_file, filepath)
+        for i in range(0, len(data), STREAM_CHUNK_SIZE):
+            yield data[i:i + STREAM_CHUNK_SIZE]
+        return
+    
+    sentences = split_sentences(text)
+    print(f"[{language}] Streaming {len(sentences)} sentences...")
+    
+    remaining = iter(sentences)
+    in_flight = deque()
+    
+    def submit_next():
+        sentence = next(remaining, None)
+        if sentence is not None:
+            in_flight.append(asyncio.ensure_future(synthesize_async(sentence, language, slow)))
+    
+    for _ in range(Config.TTS_PIPELINE_WORKERS):
+        submit_next()
+    
+    parts = []
+    try:
+        while in_flight:
+            audio = await in_flight.popleft()
+            submit_next()
+            parts.append(audio)
+            for i in range(0, len(audio), STREAM_CHUNK_SIZE):
+                yield audio[i:i + STREAM_CHUNK_SIZE]
+    finally:
+        for task in in_flight:
+            task.cancel()
+    
+    audio = b''.join(parts)
+    if audio:
+        await run_blocking(_store_audio, filename, filepath, audio, language)
+
+def _index_cached(filename, filepath):
+    '''Mark cached audio as accessed, indexing it if it predates the index'''
+    index = get_audio_index()
+    if index.lookup(filename) is None:
+        index.record(filename, filename, os.path.getsize(filepath))
+
+def _remove_quietly(path):
+    '''Delete a leftover temp file; a no-op once it has been renamed'''
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        print(f"✗ Could not remove {path}: {e}")
+
+def _read_file(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+def _store_audio(filename, filepath, data, language):
+    '''Publish streamed audio into the cache atomically'''
+    try:
+        os.makedirs(Config.AUDIO_FOLDER, exist_ok=True)
+        tmp_path = f"{filepath}.{uuid.uuid4().hex[:8]}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, filepath)
+        finally:
+            _remove_quietly(tmp_path)
+        get_audio_index().record(filename, filename, len(data))
+        print(f"[{language}] ✓ Cached streamed audio: {filename} ({len(data)} bytes)")
+    except Exception as e:
+        print(f"[{language}] ✗ Could not cache streamed audio: {str(e)}")
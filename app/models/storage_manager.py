@@ -0,0 +1,224 @@
+"""
+Disk-Budgeted Retention for Uploads and Generated Audio
+"""
+import os
+import threading
+import time
+
+from config import Config
+from app.models.file_index import FileIndex
+
+EVICTION_BATCH = 100
+
+def default_budgets():
+    '''Budgets per managed namespace, from Config'''
+    return {
+        'uploads': {
+            'directory': Config.UPLOAD_FOLDER,
+            'max_bytes': Config.UPLOAD_MAX_BYTES,
+            'max_files': Config.UPLOAD_MAX_FILES,
+            'ttl': Config.UPLOAD_TTL,
+        },
+        'audio': {
+            'directory': Config.AUDIO_FOLDER,
+            'max_bytes': Config.AUDIO_MAX_BYTES,
+            'max_files': Config.AUDIO_MAX_FILES,
+            'ttl': Config.AUDIO_TTL,
+        },
+    }
+
+class StorageManager:
+    '''
+    Keep managed directories within byte, file-count and age budgets
+    
+    Files are registered in a FileIndex when written and touched when
+    served, so eviction works from the index alone and never scans the
+    directories. A background thread sweeps every interval seconds:
+    expired files (TTL) go first, then least recently used files until
+    the namespace is back under budget. Files pinned by saved results
+    (add_reference) and their derived files are never evicted; an upload
+    nothing pins is kept for its TTL after it was last uploaded or
+    served. Deleting a file also deletes the files derived from it
+    (annotated images with their original), and derived files whose
+    parent has gone are removed as orphans.
+    
+    A budget value of 0 disables that limit.
+    '''
+    
+    def __init__(self, budgets=None, interval=None):
+        self.budgets = budgets or default_budgets()
+        self.interval = interval or Config.STORAGE_SWEEP_INTERVAL
+        self.indexes = {namespace: FileIndex(namespace) for namespace in self.budgets}
+        self._stop = threading.Event()
+        self._thread = None
+    
+    def register(self, namespace, key, path=None, parent=None):
+        '''
+        Record a newly written file
+        
+        Args:
+            namespace: Managed namespace ('uploads' or 'audio')
+            key: Index key of the file
+            path: File path relative to the namespace directory (default: key)
+            parent: Key of the file this one was derived from
+        '''
+        path = path or key
+        try:
+            size = os.path.getsize(os.path.join(self.budgets[namespace]['directory'], path))
+            self.indexes[namespace].record(key, path, size, parent=parent)
+        except OSError as e:
+            print(f"Storage register warning ({namespace}/{path}): {e}")
+    
+    def add_reference(self, namespace, key, path=None):
+        '''
+        Pin a file for a saved result; eviction skips referenced files and
+        the files derived from them
+        
+        Returns:
+            Reference count after the update
+        
+        Raises:
+            OSError: If the file does not exist
+        '''
+        path = path or key
+        size = os.path.getsize(os.path.join(self.budgets[namespace]['directory'], path))
+        return self.indexes[namespace].add_reference(key, path, size)
+    
+    def release(self, namespace, key):
+        '''
+        Drop one reference to a file
+        
+        When the last reference goes, the file is deleted at once if it has
+        also outlived the namespace's TTL; otherwise a recent upload of the
+        same content may still use it, and it is left to the sweep.
+        
+        Returns:
+            True if the file was deleted
+        '''
+        index = self.indexes[namespace]
+        if index.release(key) != 0:
+            return False
+        entry = index.get(key)
+        ttl = self.budgets[namespace]['ttl']
+        if entry is None or not ttl or entry['last_access'] >= time.time() - ttl:
+            return False
+        return bool(self._delete(namespace, entry)[0])
+    
+    def touch(self, namespace, key):
+        '''Mark a file as recently used'''
+        try:
+            self.indexes[namespace].touch(key)
+        except Exception as e:
+            print(f"Storage touch warning ({namespace}/{key}): {e}")
+    
+    def sweep(self):
+        '''
+        Run one eviction pass over every namespace
+        
+        Returns:
+            Dictionary with the number of files removed per namespace
+        '''
+        removed = {}
+        for namespace, budget in self.budgets.items():
+            index = self.indexes[namespace]
+            # Keys deleted in this pass; a batch fetched before its parent
+            # was deleted may still list the parent's derived files
+            gone = set()
+            
+            if budget['ttl']:
+                cutoff = time.time() - budget['ttl']
+                while True:
+                    expired = index.accessed_before(cutoff, EVICTION_BATCH)
+                    deleted = sum(self._delete(namespace, entry, gone)[0] for entry in expired)
+                    if not deleted:
+                        break  # Nothing left, or nothing could be deleted
+            
+            # Aggregated once; each eviction subtracts what it freed
+            files, total_bytes = index.usage()
+            while self._over_budget(budget, files, total_bytes):
+                deleted = 0
+                for entry in index.least_recently_used(EVICTION_BATCH):
+                    if not self._over_budget(budget, files, total_bytes):
+                        break
+                    if entry['key'] in gone:
+                        continue
+                    freed_files, freed_bytes = self._delete(namespace, entry, gone)
+                    deleted += freed_files
+                    files -= freed_files
+                    total_bytes -= freed_bytes
+                if not deleted:
+                    break
+            
+            for entry in index.orphans(EVICTION_BATCH):
+                self._delete(namespace, entry, gone)
+            
+            count = len(gone)
+            removed[namespace] = count
+            if count:
+                print(f"[storage:{namespace}] Evicted {count} files")
+        return removed
+    
+    def _over_budget(self, budget, files, total_bytes):
+        return ((budget['max_files'] and files > budget['max_files'])
+                or (budget['max_bytes'] and total_bytes > budget['max_bytes']))
+    
+    def _delete(self, namespace, entry, gone=None):
+        '''
+        Delete a file, its derived files and their index entries
+        
+        Args:
+            gone: Set of keys already deleted in this pass; skipped, and
+                updated with the keys deleted now
+        
+        Returns:
+            Tuple of (number of files deleted, their indexed size in bytes)
+        '''
+        gone = set() if gone is None else gone
+        if entry['key'] in gone:
+            return 0, 0
+        index = self.indexes[namespace]
+        count, size = 0, 0
+        for child in index.children(entry['key']):
+            child_count, child_size = self._delete(namespace, child, gone)
+            count += child_count
+            size += child_size
+        try:
+            os.remove(os.path.join(self.budgets[namespace]['directory'], entry['path']))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"[storage:{namespace}] Could not delete {entry['path']}: {e}")
+            return count, size
+        index.remove(entry['key'])
+        gone.add(entry['key'])
+        return count + 1, size + entry['size']
+    
+    def start(self):
+        '''Start the background eviction thread'''
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='storage-sweeper', daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        self._stop.set()
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.sweep()
+            except Exception as e:
+                print(f"Storage sweep error: {str(e)}")
+
+_manager = None
+_manager_lock = threading.Lock()
+
+def get_storage_manager():
+    '''Get the process-wide storage manager'''
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = StorageManager()
+    return _manager
@@ -1,9 +1,34 @@
 """
-Translation Module using Googletrans
+Translation Module with Pluggable Backends (Googletrans, offline templates)
 """
-from googletrans import Translator
+from collections import OrderedDict
+import threading
 
-translator = Translator()
+from app.models.translation_backends import get_translation_chain, TranslationBackendError
+from app.models.localization import render_segment, render_segments, supports_language
+
+# Segments are packed into one request separated by newlines, which the
+# translation service preserves; inner newlines are flattened beforehand
+SEGMENT_DELIMITER = '\n'
+MAX_BATCH_CHARS = 4500
+CACHE_SIZE = 4096
+
+_segment_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+def _cache_get(key):
+    with _cache_lock:
+        value = _segment_cache.get(key)
+        if value is not None:
+            _segment_cache.move_to_end(key)
+        return value
+
+def _cache_put(key, value):
+    with _cache_lock:
+        _segment_cache[key] = value
+        _segment_cache.move_to_end(key)
+        while len(_segment_cache) > CACHE_SIZE:
+            _segment_cache.popitem(last=False)
 
 def translate_text(text, source_lang='en', target_lang='hi'):
     '''
@@ -17,12 +42,191 @@ def translate_text(text, source_lang='en', target_lang='hi'):
     Returns:
         Translated text string
     '''
+    return translate_batch([text], source_lang=source_lang, target_lang=target_lang)[0]
+
+def translate_batch(segments, source_lang='en', target_lang='hi'):
+    '''
+    Translate many text segments with as few backend requests as possible
+    
+    Uncached segments are packed into one delimited request (split only when
+    it would exceed MAX_BATCH_CHARS), the result is split back into aligned
+    segments and every segment is cached on its own.
+    
+    Args:
+        segments: List of text segments
+        source_lang: Source language code (default: 'en')
+        target_lang: Target language code (default: 'hi')
+    
+    Returns:
+        List of translated segments, aligned with the input
+    '''
+    results, pending = _split_cached(segments, source_lang, target_lang)
+    for batch in _pack_batches(list(pending)):
+        _store_batch(results, pending, batch, _translate_packed(batch, source_lang, target_lang),
+                     source_lang, target_lang)
+    return results
+
+async def translate_batch_async(segments, source_lang='en', target_lang='hi'):
+    '''
+    Async translate_batch for the async serving mode
+    
+    Same cache and packing; the batches of one call are sent concurrently
+    over the shared aiohttp session.
+    '''
+    import asyncio
+    
+    results, pending = _split_cached(segments, source_lang, target_lang)
+    batches = _pack_batches(list(pending))
+    translated = await asyncio.gather(*(
+        _translate_packed_async(batch, source_lang, target_lang) for batch in batches
+    ))
+    for batch, pairs in zip(batches, translated):
+        _store_batch(results, pending, batch, pairs, source_lang, target_lang)
+    return results
+
+def _split_cached(segments, source_lang, target_lang):
+    '''Fill in cached translations; returns (results, {uncached text: [indexes]})'''
+    results = list(segments)
+    pending = OrderedDict()
+    if source_lang == target_lang:
+        return results, pending
+    
+    # Group uncached segments by text so duplicates are translated once
+    for idx, segment in enumerate(segments):
+        if not segment or not segment.strip():
+            continue
+        cached = _cache_get((source_lang, target_lang, segment))
+        if cached is not None:
+            results[idx] = cached
+        else:
+            pending.setdefault(segment, []).append(idx)
+    return results, pending
+
+def _store_batch(results, pending, batch, pairs, source_lang, target_lang):
+    for text, (translated, ok) in zip(batch, pairs):
+        if ok:
+            _cache_put((source_lang, target_lang, text), translated)
+        for idx in pending[text]:
+            results[idx] = translated
+
+def translate_description(text, target_lang, segments=None, lines=None, source_lang='en'):
+    '''
+    Translate a scene description with the fewest remote calls available
+    
+    Templated segments are rendered locally (only free text is sent, in one
+    batch); otherwise description lines are translated as one batch; plain
+    text is translated as a single string.
+    
+    Args:
+        text: Full description text
+        target_lang: Target language code
+        segments: Optional template segments from scene_description
+        lines: Optional list of description lines
+        source_lang: Source language code (default: 'en')
+    
+    Returns:
+        Translated description string
+    '''
+    if target_lang == source_lang:
+        return text
+    if segments and supports_language(target_lang):
+        return ' '.join(render_segments(
+            segments, target_lang,
+            translate_free_text=lambda texts: translate_batch(texts, source_lang, target_lang)
+        ))
+    if lines:
+        return ' '.join(translate_batch(lines, source_lang, target_lang))
+    return translate_text(text, source_lang, target_lang)
+
+async def translate_description_async(text, target_lang, segments=None, lines=None, source_lang='en'):
+    '''Async translate_description for the async serving mode'''
+    if target_lang == source_lang:
+        return text
+    if segments and supports_language(target_lang):
+        # Free-text segments are translated first, then the templates are
+        # rendered with the results
+        free_text = [render_segment(segment, target_lang) for segment in segments
+                     if segment['key'] == 'free_text']
+        free_text = [line for line in free_text if line]
+        translated = dict(zip(free_text, await translate_batch_async(free_text, source_lang, target_lang)))
+        return ' '.join(render_segments(
+            segments, target_lang,
+            translate_free_text=lambda texts: [translated.get(t, t) for t in texts]
+        ))
+    if lines:
+        return ' '.join(await translate_batch_async(lines, source_lang, target_lang))
+    return (await translate_batch_async([text], source_lang, target_lang))[0]
+
+def _pack_batches(texts):
+    '''Split texts into batches whose packed length stays under MAX_BATCH_CHARS'''
+    batches, current, size = [], [], 0
+    for text in texts:
+        if current and size + len(text) + len(SEGMENT_DELIMITER) > MAX_BATCH_CHARS:
+            batches.append(current)
+            current, size = [], 0
+        current.append(text)
+        size += len(text) + len(SEGMENT_DELIMITER)
+    if current:
+        batches.append(current)
+    return batches
+
+def _pack(texts):
+    return SEGMENT_DELIMITER.join(' '.join(t.splitlines()) for t in texts)
+
+def _unpack(texts, translated, backend, target_lang):
+    '''Split a packed translation back into (text, cacheable) pairs, or None'''
+    parts = [part.strip() for part in translated.split(SEGMENT_DELIMITER)]
+    if len(parts) == len(texts):
+        return [(part, backend.authoritative) for part in parts]
+    print(f"[{target_lang}] Batch split mismatch ({len(parts)} != {len(texts)}), "
+          f"falling back to per-segment translation")
+    return None
+
+def _translate_packed(texts, source_lang, target_lang):
+    '''Translate a batch in one request; returns (text, cacheable) pairs'''
+    if len(texts) > 1:
+        try:
+            translated, backend = get_translation_chain().translate(_pack(texts), source_lang, target_lang)
+            pairs = _unpack(texts, translated, backend, target_lang)
+            if pairs is not None:
+                return pairs
+        except TranslationBackendError as e:
+            print(f"[{target_lang}] Batch translation error: {str(e)}")
+            return [(text, False) for text in texts]
+    
+    return [_translate_one(text, source_lang, target_lang) for text in texts]
+
+async def _translate_packed_async(texts, source_lang, target_lang):
+    import asyncio
+    
+    chain = get_translation_chain()
+    if len(texts) > 1:
+        try:
+            translated, backend = await chain.translate_async(_pack(texts), source_lang, target_lang)
+            pairs = _unpack(texts, translated, backend, target_lang)
+            if pairs is not None:
+                return pairs
+        except TranslationBackendError as e:
+            print(f"[{target_lang}] Batch translation error: {str(e)}")
+            return [(text, False) for text in texts]
+    
+    return await asyncio.gather(*(_translate_one_async(text, source_lang, target_lang) for text in texts))
+
+def _translate_one(text, source_lang, target_lang):
     try:
-        translation = translator.translate(text, src=source_lang, dest=target_lang)
-        return translation.text
-    except Exception as e:
+        translated, backend = get_translation_chain().translate(text, source_lang, target_lang)
+        return translated, backend.authoritative
+    except TranslationBackendError as e:
+        print(f"Translation error: {str(e)}")
+        return text, False  # Return original text if translation fails
+
+async def _translate_one_async(text, source_lang, target_lang):
+    try:
+        translated, backend = await get_translation_chain().translate_async(text, source_lang, target_lang)
+        return translated, backend.authoritative
+    except TranslationBackendError as e:
         print(f"Translation error: {str(e)}")
-        return text  # Return original text if translation fails
+        return text, False
 
 def detect_language(text):
     '''
@@ -35,8 +239,7 @@ def detect_language(text):
         Detected language code
     '''
     try:
-        detection = translator.detect(text)
-        return detection.lang
+        return get_translation_chain().detect(text)
     except Exception as e:
         print(f"Language detection error: {str(e)}")
         return 'en'  # Default to English
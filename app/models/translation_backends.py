@@ -0,0 +1,214 @@
+"""
+Pluggable Translation Backends with Circuit Breakers and Fallback
+"""
+import threading
+
+from config import Config
+from app.models.circuit_breaker import CircuitBreaker
+from app.models.localization import translate_templated_text
+
+class TranslationBackendError(Exception):
+    '''Raised when a backend cannot translate the given text'''
+
+class TranslationBackend:
+    '''
+    Base class for translation backends
+    
+    authoritative is False for best-effort backends whose output should
+    not be cached in place of a real translation.
+    '''
+    
+    name = 'base'
+    authoritative = True
+    
+    def translate(self, text, source_lang, target_lang):
+        raise NotImplementedError
+    
+    def detect(self, text):
+        raise TranslationBackendError(f"{self.name} backend cannot detect languages")
+    
+    async def translate_async(self, text, source_lang, target_lang):
+        '''Async translate; backends without native support run on the I/O executor'''
+        from app.models.async_http import run_blocking
+        return await run_blocking(self.translate, text, source_lang, target_lang)
+
+GOOGLE_ASYNC_URL = 'https://translate.googleapis.com/translate_a/single'
+
+class GoogleTranslateBackend(TranslationBackend):
+    '''Remote backend using googletrans, with a request timeout'''
+    
+    name = 'google'
+    
+    def __init__(self, timeout=None):
+        self.timeout = timeout
+        self._translator = None
+        self._lock = threading.Lock()
+    
+    def _get_translator(self):
+        if self._translator is None:
+            with self._lock:
+                if self._translator is None:
+                    from googletrans import Translator
+                    self._translator = Translator(timeout=self.timeout) if self.timeout else Translator()
+        return self._translator
+    
+    def translate(self, text, source_lang, target_lang):
+        result = self._get_translator().translate(text, src=source_lang, dest=target_lang)
+        if result is None or result.text is None:
+            raise TranslationBackendError("Empty response from Google Translate")
+        return result.text
+    
+    def detect(self, text):
+        return self._get_translator().detect(text).lang
+    
+    async def translate_async(self, text, source_lang, target_lang):
+        '''
+        Translate over the shared aiohttp session (async serving mode)
+        
+        googletrans has no async client, so this posts to the public
+        translate_a/single endpoint instead; connections are pooled and
+        reused across requests.
+        '''
+        import aiohttp
+        from app.models.async_http import get_session
+        
+        params = {'client': 'gtx', 'sl': source_lang, 'tl': target_lang, 'dt': 't'}
+        timeout = aiohttp.ClientTimeout(total=self.timeout) if self.timeout else None
+        async with get_session().post(GOOGLE_ASYNC_URL, params=params, data={'q': text},
+                                      timeout=timeout) as response:
+            response.raise_for_status()
+            data = await response.json(content_type=None)
+        
+        # [[[translated chunk, source chunk, ...], ...], ...]
+        chunks = data[0] if data else None
+        if not chunks:
+            raise TranslationBackendError("Empty response from Google Translate")
+        return ''.join(chunk[0] for chunk in chunks if chunk and chunk[0])
+
+class OfflineTemplateBackend(TranslationBackend):
+    '''
+    Local backend that re-renders known description templates and class names
+    
+    Text is handled line by line so packed batches keep their delimiters.
+    Sentences that match no template are left untranslated; a text in
+    which nothing matches raises TranslationBackendError.
+    '''
+    
+    name = 'offline'
+    authoritative = False
+    
+    def translate(self, text, source_lang, target_lang):
+        if source_lang != 'en':
+            raise TranslationBackendError("Offline templates only translate from English")
+        
+        lines, matched = [], 0
+        for line in text.split('\n'):
+            translated, line_matched, _unmatched = translate_templated_text(line, target_lang)
+            lines.append(translated)
+            matched += line_matched
+        
+        if matched == 0:
+            raise TranslationBackendError("No known templates in text")
+        return '\n'.join(lines)
+
+BACKENDS = {
+    'google': lambda: GoogleTranslateBackend(timeout=Config.TRANSLATION_TIMEOUT),
+    'offline': OfflineTemplateBackend,
+}
+
+class TranslationChain:
+    '''
+    Ordered fallback chain of backends, each guarded by its own circuit breaker
+    '''
+    
+    def __init__(self, backends, failure_threshold=3, reset_timeout=60.0):
+        self.entries = [
+            (backend, CircuitBreaker(f"translate:{backend.name}", failure_threshold, reset_timeout))
+            for backend in backends
+        ]
+    
+    def translate(self, text, source_lang, target_lang):
+        '''
+        Translate with the first backend that is available and succeeds
+        
+        Returns:
+            Tuple of (translated text, backend that produced it)
+        
+        Raises:
+            TranslationBackendError: If every backend failed or was skipped
+        '''
+        return self._first_success('translate', text, source_lang, target_lang)
+    
+    def detect(self, text):
+        '''Detect the language of text with the first backend able to do so'''
+        return self._first_success('detect', text)[0]
+    
+    async def translate_async(self, text, source_lang, target_lang):
+        '''Async translate with the same fallback order and circuit breakers'''
+        errors = []
+        for backend, breaker in self.entries:
+            if not breaker.allow():
+                errors.append(f"{backend.name}: circuit open")
+                continue
+            try:
+                result = await backend.translate_async(text, source_lang, target_lang)
+            except TranslationBackendError as e:
+                breaker.record_success()
+                errors.append(f"{backend.name}: {e}")
+            except Exception as e:
+                breaker.record_failure()
+                errors.append(f"{backend.name}: {e}")
+            except BaseException:
+                # Cancelled (client gone, narration deadline): no verdict
+                breaker.abandon()
+                raise
+            else:
+                breaker.record_success()
+                return result, backend
+        raise TranslationBackendError('; '.join(errors) or 'No translation backends configured')
+    
+    def _first_success(self, method, *args):
+        errors = []
+        for backend, breaker in self.entries:
+            if not breaker.allow():
+                errors.append(f"{backend.name}: circuit open")
+                continue
+            try:
+                result = getattr(backend, method)(*args)
+            except TranslationBackendError as e:
+                # The backend answered, it just cannot handle this input
+                breaker.record_success()
+                errors.append(f"{backend.name}: {e}")
+            except Exception as e:
+                breaker.record_failure()
+                errors.append(f"{backend.name}: {e}")
+            except BaseException:
+                breaker.abandon()
+                raise
+            else:
+                breaker.record_success()
+                return result, backend
+        raise TranslationBackendError('; '.join(errors) or 'No translation backends configured')
+
+_chain = None
+_chain_lock = threading.Lock()
+
+def get_translation_chain():
+    '''Get the process-wide translation chain built from Config.TRANSLATION_BACKENDS'''
+    global _chain
+    if _chain is None:
+        with _chain_lock:
+            if _chain is None:
+                backends = []
+                for name in Config.TRANSLATION_BACKENDS:
+                    factory = BACKENDS.get(name)
+                    if factory is None:
+                        print(f"Unknown translation backend: {name}")
+                        continue
+                    backends.append(factory())
+                _chain = TranslationChain(
+                    backends,
+                    failure_threshold=Config.TRANSLATION_FAILURE_THRESHOLD,
+                    reset_timeout=Config.TRANSLATION_COOLDOWN
+                )
+    return _chain
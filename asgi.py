@@ -0,0 +1,41 @@
+"""
+ASGI Entry Point: Async I/O Serving Mode
+
+    uvicorn asgi:app --workers 2
+    gunicorn -c gunicorn.conf.py -k uvicorn.workers.UvicornWorker asgi:app
+
+Translation, speech, narration and saving (app/api/async_routes.py) run on
+the event loop with pooled HTTP connections; all other routes, including
+inference, are served by the Flask app on a bounded thread pool.
+"""
+import contextlib
+
+from a2wsgi import WSGIMiddleware
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.routing import Mount
+
+from app.models.model_warmup import configure_threads
+
+# Before torch/TensorFlow are imported anywhere in this process
+configure_threads()
+
+from config import Config
+from app import create_app
+from app.api.async_routes import routes
+from app.models.async_http import close_session
+
+flask_app = create_app()
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    yield
+    await close_session()
+
+app = Starlette(
+    routes=routes + [Mount('/', app=WSGIMiddleware(flask_app, workers=Config.ASYNC_WSGI_THREADS))],
+    middleware=[Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'])],
+    lifespan=lifespan
+)
+app.state.flask_app = flask_app
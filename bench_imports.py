@@ -0,0 +1,99 @@
+"""
+Import-Time Benchmark
+
+Imports each target in a fresh interpreter and reports wall time and peak
+memory, so a module that starts pulling in torch, TensorFlow or OpenCV at
+import time shows up as a regression. Light targets (everything that does
+not run inference) must stay under the budget:
+
+    python bench_imports.py                 # all targets
+    python bench_imports.py --light         # light targets only, as in CI
+    python bench_imports.py --budget 0.5 app.api.auth_routes
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+# (target, light); a target is a module name or 'factory' for create_app()
+TARGETS = (
+    ('config', True),
+    ('app.api.auth_routes', True),
+    ('app.api.main_routes', True),
+    ('app.api.health_routes', True),
+    ('app.api.vision_routes', True),
+    ('firebase.history_export', True),
+    ('factory', True),
+    ('app.models.image_io', False),
+    ('app.models.translation', False),
+    ('app.models.speech', False),
+    ('app.models.object_detection', False),
+    ('app.models.face_recognition', False),
+)
+
+# Runs in the child interpreter; prints one JSON line
+CHILD = '''
+import json, resource, sys, time
+start = time.perf_counter()
+target = sys.argv[1]
+if target == 'factory':
+    from app import create_app
+    create_app()
+else:
+    __import__(target)
+seconds = time.perf_counter() - start
+heavy = [name for name in ('torch', 'tensorflow', 'cv2', 'deepface', 'ultralytics', 'firebase_admin',
+                           'google.cloud.firestore_v1', 'grpc')
+         if name in sys.modules]
+print(json.dumps({'seconds': seconds, 'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                  'heavy': heavy}))
+'''
+
+def measure(target):
+    '''
+    Import a target in a fresh interpreter
+    
+    Returns:
+        Dictionary with seconds, max_rss_kb and the heavy modules loaded,
+        or with an error if the import failed
+    '''
+    proc = subprocess.run([sys.executable, '-c', CHILD, target], capture_output=True, text=True)
+    if proc.returncode != 0:
+        lines = proc.stderr.strip().splitlines()
+        return {'error': lines[-1] if lines else f"exit code {proc.returncode}"}
+    # Modules may print while importing; the result is the last line
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Measure import time of the app modules')
+    parser.add_argument('targets', nargs='*', help='Targets to measure (default: all)')
+    parser.add_argument('--light', action='store_true', help='Only measure light targets')
+    parser.add_argument('--budget', type=float, default=1.0,
+                        help='Seconds a light target may take (default: 1.0)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per target; the fastest counts')
+    args = parser.parse_args(argv)
+    
+    light_targets = {name for name, light in TARGETS if light}
+    targets = args.targets or [name for name, light in TARGETS if light or not args.light]
+    
+    failed = False
+    print(f"{'target':32} {'seconds':>8} {'max RSS MB':>11}  heavy modules")
+    for target in targets:
+        runs = [measure(target) for _ in range(max(args.repeat, 1))]
+        errors = [run for run in runs if 'error' in run]
+        if errors:
+            print(f"{target:32} {'-':>8} {'-':>11}  ✗ {errors[0]['error']}")
+            failed = failed or target in light_targets
+            continue
+        
+        best = min(runs, key=lambda run: run['seconds'])
+        over = target in light_targets and best['seconds'] > args.budget
+        marker = '✗' if over else '✓'
+        print(f"{target:32} {best['seconds']:8.3f} {best['max_rss_kb'] / 1024:11.1f}  "
+              f"{marker} {', '.join(best['heavy']) or '-'}")
+        failed = failed or over
+    
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -7,11 +7,91 @@ load_dotenv()
 class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
     UPLOAD_FOLDER = 'uploads'
+    AUDIO_FOLDER = os.path.join('static', 'audio')
+    STORAGE_INDEX_PATH = os.environ.get('STORAGE_INDEX_PATH', os.path.join('data', 'storage_index.sqlite3'))
     ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'bmp', 'webp'}
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024
     FIREBASE_CREDENTIALS = os.environ.get('FIREBASE_CREDENTIALS', 'firebase/serviceAccountKey.json')
+    # Use a process-local in-memory stand-in instead of Firestore (local runs, tests)
+    FIRESTORE_IN_MEMORY = os.environ.get('FIRESTORE_IN_MEMORY', '').lower() in ('1', 'true', 'yes')
+    # Users and history: 'firestore', 'sqlite', or 'auto' (Firestore when its
+    # credentials exist, otherwise the embedded SQLite database)
+    STORAGE_BACKEND = os.environ.get('STORAGE_BACKEND', 'auto')
+    SQLITE_DB_PATH = os.environ.get('SQLITE_DB_PATH', os.path.join('data', 'vision.sqlite3'))
+    SQLITE_POOL_SIZE = int(os.environ.get('SQLITE_POOL_SIZE', 4))
+    # get_user_by_id results are cached per process for USER_CACHE_TTL seconds
+    USER_CACHE_TTL = float(os.environ.get('USER_CACHE_TTL', 60))
+    USER_CACHE_SIZE = int(os.environ.get('USER_CACHE_SIZE', 1024))
     YOLO_MODEL_PATH = 'weights/yolov8n.pt'
     
+    # Disk budgets for uploads/ and static/audio/ (0 disables a limit);
+    # least recently used files are evicted every STORAGE_SWEEP_INTERVAL seconds
+    UPLOAD_MAX_BYTES = int(os.environ.get('UPLOAD_MAX_BYTES', 2 * 1024 ** 3))
+    UPLOAD_MAX_FILES = int(os.environ.get('UPLOAD_MAX_FILES', 20000))
+    UPLOAD_TTL = int(os.environ.get('UPLOAD_TTL', 7 * 24 * 3600))
+    AUDIO_MAX_BYTES = int(os.environ.get('AUDIO_MAX_BYTES', 512 * 1024 ** 2))
+    AUDIO_MAX_FILES = int(os.environ.get('AUDIO_MAX_FILES', 20000))
+    AUDIO_TTL = int(os.environ.get('AUDIO_TTL', 3 * 24 * 3600))
+    STORAGE_SWEEP_INTERVAL = int(os.environ.get('STORAGE_SWEEP_INTERVAL', 300))
+    
+    # Translation backends, tried in order; each is skipped for
+    # TRANSLATION_COOLDOWN seconds after TRANSLATION_FAILURE_THRESHOLD failures
+    TRANSLATION_BACKENDS = os.environ.get('TRANSLATION_BACKENDS', 'google,offline').split(',')
+    TRANSLATION_TIMEOUT = float(os.environ.get('TRANSLATION_TIMEOUT', 5))
+    TRANSLATION_FAILURE_THRESHOLD = int(os.environ.get('TRANSLATION_FAILURE_THRESHOLD', 3))
+    TRANSLATION_COOLDOWN = float(os.environ.get('TRANSLATION_COOLDOWN', 60))
+    
+    # Sentences synthesized ahead of the one being streamed by /api/speak/stream
+    TTS_PIPELINE_WORKERS = int(os.environ.get('TTS_PIPELINE_WORKERS', 2))
+    
+    # /api/narrate: bounded pools for translation and speech, and overall deadline
+    NARRATION_TRANSLATE_WORKERS = int(os.environ.get('NARRATION_TRANSLATE_WORKERS', 4))
+    NARRATION_TTS_WORKERS = int(os.environ.get('NARRATION_TTS_WORKERS', 4))
+    NARRATION_TIMEOUT = float(os.environ.get('NARRATION_TIMEOUT', 120))
+    
+    # Uploads get an inference-sized copy and a thumbnail (longest side, px)
+    INFERENCE_MAX_SIDE = int(os.environ.get('INFERENCE_MAX_SIDE', 1280))
+    THUMBNAIL_MAX_SIDE = int(os.environ.get('THUMBNAIL_MAX_SIDE', 256))
+    
+    # /api/analyze/image: background writers for images kept for history, and
+    # how long /uploads waits for a file that is still being written
+    PERSIST_WORKERS = int(os.environ.get('PERSIST_WORKERS', 2))
+    PERSIST_WAIT_TIMEOUT = float(os.environ.get('PERSIST_WAIT_TIMEOUT', 5))
+    
+    # Browser cache lifetime for files that never change once written
+    # (content-addressed audio, uploads and their derivatives)
+    IMMUTABLE_MAX_AGE = int(os.environ.get('IMMUTABLE_MAX_AGE', 365 * 24 * 3600))
+    
+    # Offline shopping suggestions: product feed (JSON or CSV, format in
+    # app/models/product_catalog.py; the bundled one is a sample of search
+    # links without prices) and its search index
+    PRODUCT_CATALOG_FEED = os.environ.get('PRODUCT_CATALOG_FEED', os.path.join('app', 'models', 'catalog', 'products.sample.json'))
+    PRODUCT_CATALOG_DB = os.environ.get('PRODUCT_CATALOG_DB', os.path.join('data', 'product_catalog.sqlite3'))
+    PRODUCTS_PER_CLASS = int(os.environ.get('PRODUCTS_PER_CLASS', 3))
+    
+    # Production serving (gunicorn.conf.py): load and warm every model before a
+    # worker accepts traffic, and threads per worker for inference libraries
+    PRELOAD_MODELS = os.environ.get('PRELOAD_MODELS', '').lower() in ('1', 'true', 'yes')
+    REQUIRED_WARMUP_STAGES = tuple(filter(None, os.environ.get('REQUIRED_WARMUP_STAGES', 'detection').split(',')))
+    INFERENCE_THREADS = int(os.environ.get('INFERENCE_THREADS', 2))
+    
+    # Async serving (asgi.py): pooled connections for translation, threads
+    # for blocking storage/file/speech calls, speech syntheses running at
+    # once (fewer than the I/O threads), and threads running the mounted
+    # Flask routes (inference, uploads, history pages)
+    ASYNC_HTTP_CONNECTIONS = int(os.environ.get('ASYNC_HTTP_CONNECTIONS', 100))
+    ASYNC_IO_THREADS = int(os.environ.get('ASYNC_IO_THREADS', 16))
+    TTS_ASYNC_CONCURRENCY = int(os.environ.get('TTS_ASYNC_CONCURRENCY', 8))
+    ASYNC_WSGI_THREADS = int(os.environ.get('ASYNC_WSGI_THREADS', 8))
+    
+    # Firestore writes (saved results, stats, last_login) are queued and committed
+    # in batches; a full queue makes callers write synchronously
+    WRITE_BEHIND_BATCH_SIZE = int(os.environ.get('WRITE_BEHIND_BATCH_SIZE', 200))
+    WRITE_BEHIND_INTERVAL = float(os.environ.get('WRITE_BEHIND_INTERVAL', 1.0))
+    WRITE_BEHIND_MAX_PENDING = int(os.environ.get('WRITE_BEHIND_MAX_PENDING', 5000))
+    WRITE_BEHIND_MAX_RETRIES = int(os.environ.get('WRITE_BEHIND_MAX_RETRIES', 5))
+    WRITE_BEHIND_ENQUEUE_TIMEOUT = float(os.environ.get('WRITE_BEHIND_ENQUEUE_TIMEOUT', 2.0))
+    
     LANGUAGES = {
         'te': 'Telugu', 'hi': 'Hindi', 'en': 'English',
         'es': 'Spanish', 'de': 'German', 'fr': 'French',
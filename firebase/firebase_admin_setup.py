@@ -4,11 +4,27 @@ Firebase Admin SDK Setup
 import firebase_admin
 from firebase_admin import credentials, firestore
 import os
+import threading
 from config import Config
 
+_memory_client = None
+_memory_lock = threading.Lock()
+
+def _get_memory_client():
+    global _memory_client
+    with _memory_lock:
+        if _memory_client is None:
+            from firebase.memory_client import InMemoryFirestore
+            _memory_client = InMemoryFirestore()
+            print("Using in-memory Firestore stand-in (FIRESTORE_IN_MEMORY)")
+        return _memory_client
+
 # Initialize Firebase Admin SDK
 def initialize_firebase():
     '''Initialize Firebase Admin SDK with service account credentials'''
+    if Config.FIRESTORE_IN_MEMORY:
+        return _get_memory_client()
+    
     try:
         # Check if already initialized
         if not firebase_admin._apps:
@@ -32,6 +48,9 @@ def initialize_firebase():
 # Get Firestore client
 def get_firestore_client():
     '''Get Firestore database client'''
+    if Config.FIRESTORE_IN_MEMORY:
+        return _get_memory_client()
+    
     try:
         return firestore.client()
     except Exception as e:
@@ -1,74 +1,226 @@
 """
 Firestore Service for storing and retrieving analysis history
+
+Documents are kept by the configured storage backend (Firestore or SQLite).
 """
-from firebase.firebase_admin_setup import get_firestore_client
+from firebase.storage_backends import get_storage
+from app.models.result_codec import encode_result, decode_result
+from app.models.background_writer import wait_for_pending
+from app.models.blob_store import get_blob_store, upload_key
 from datetime import datetime
+import base64
+import json
 import uuid
 
-def save_result(data):
+# Fields the history list needs; full documents are fetched one at a time
+HISTORY_SUMMARY_FIELDS = [
+    'id', 'user_id', 'timestamp', 'thumbnail_image', 'original_image',
+    'top_classes', 'object_count', 'summary'
+]
+TOP_CLASSES = 5
+MAX_PAGE_SIZE = 100
+
+def save_result(data, user_id=None):
     '''
-    Save analysis result to Firestore
+    Save analysis result
     
     Args:
         data: Dictionary containing analysis results
+        user_id: ID of the user the result belongs to
     
     Returns:
         Document ID of saved result
     '''
     try:
-        db = get_firestore_client()
-        if db is None:
-            return None
-        
-        # Add timestamp and ID
+        # Add timestamp, ID, owner and the summary shown in history lists
         data['timestamp'] = datetime.now()
         data['id'] = str(uuid.uuid4())
+        data['user_id'] = user_id
+        data.update(summarize_result(data))
         
-        # Save to Firestore
-        doc_ref = db.collection('analysis_history').document(data['id'])
-        doc_ref.set(data)
+        # Stored compactly; get_result expands it again
+        storage = get_storage()
+        storage.save_result(encode_result(data, storage.save_shared))
+        
+        # Keep the upload for as long as the result is in history
+        retain_upload(data)
+        
+        if user_id is not None:
+            try:
+                storage.increment_stats(user_id, stats_increments(data))
+            except Exception as e:
+                print(f"Error updating stats: {str(e)}")
         
         return data['id']
     
     except Exception as e:
-        print(f"Error saving to Firestore: {str(e)}")
+        print(f"Error saving result: {str(e)}")
         return None
 
-def get_history(limit=20):
+def summarize_result(data):
+    '''
+    Derive the history list fields of a result
+    
+    Returns:
+        Dictionary with top_classes (most frequent first), object_count
+        and summary (first description line)
+    '''
+    counts = {}
+    for obj in data.get('objects') or []:
+        counts[obj['class']] = counts.get(obj['class'], 0) + 1
+    top_classes = sorted(counts, key=lambda name: (-counts[name], name))[:TOP_CLASSES]
+    
+    description = data.get('detailed_description') or {}
+    lines = description.get('description_lines') or []
+    return {
+        'top_classes': top_classes,
+        'object_count': sum(counts.values()),
+        'summary': lines[0] if lines else description.get('full_description', '')
+    }
+
+def stats_increments(data, sign=1):
+    '''
+    Counter changes for one result
+    
+    Args:
+        data: Full (decoded) result document
+        sign: 1 when the result is added, -1 when it is removed
+    
+    Returns:
+        Dictionary {group: {name: amount}} with groups 'totals', 'classes',
+        'identities' (recognized celebrities) and per-day 'results_by_day',
+        'objects_by_day' and 'faces_by_day' keyed by YYYY-MM-DD
+    '''
+    objects = data.get('objects') or []
+    faces = data.get('faces') or []
+    
+    classes = {}
+    for obj in objects:
+        classes[obj['class']] = classes.get(obj['class'], 0) + sign
+    identities = {}
+    for face in faces:
+        if face.get('celebrity_name'):
+            identities[face['celebrity_name']] = identities.get(face['celebrity_name'], 0) + sign
+    
+    timestamp = data['timestamp']
+    day = timestamp.date().isoformat() if hasattr(timestamp, 'date') else str(timestamp)[:10]
+    return {
+        'totals': {
+            'results': sign,
+            'objects': sign * len(objects),
+            'faces': sign * len(faces),
+            'identities': sum(identities.values())
+        },
+        'classes': classes,
+        'identities': identities,
+        'results_by_day': {day: sign},
+        'objects_by_day': {day: sign * len(objects)},
+        'faces_by_day': {day: sign * len(faces)}
+    }
+
+def get_stats(user_id):
+    '''
+    Get a user's aggregate counters (one document or a few rows, however
+    long the history is)
+    
+    Returns:
+        Dictionary {group: {name: count}} as described in stats_increments
+    '''
+    try:
+        return get_storage().get_stats(user_id)
+    
+    except Exception as e:
+        print(f"Error retrieving stats: {str(e)}")
+        return {}
+
+def encode_cursor(doc):
+    '''Opaque cursor pointing just after a history document'''
+    timestamp = doc['timestamp']
+    payload = {'t': timestamp.isoformat() if hasattr(timestamp, 'isoformat') else timestamp, 'id': doc['id']}
+    return base64.urlsafe_b64encode(json.dumps(payload).encode('utf-8')).decode('ascii')
+
+def decode_cursor(cursor):
     '''
-    Get analysis history from Firestore
+    Decode a cursor from encode_cursor
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    '''
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return {'timestamp': datetime.fromisoformat(payload['t']), 'id': payload['id']}
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {e}")
+
+def get_history(user_id, limit=20, cursor=None, fields=None):
+    '''
+    Get one page of a user's analysis history, newest first
     
     Args:
-        limit: Maximum number of results to return
+        user_id: Owner of the results
+        limit: Page size (at most MAX_PAGE_SIZE)
+        cursor: Cursor returned with the previous page
+        fields: Fields to fetch (default: HISTORY_SUMMARY_FIELDS; an empty
+            list fetches full documents)
     
     Returns:
-        List of analysis history documents
+        Tuple of (list of documents, cursor for the next page or None)
+    
+    Raises:
+        ValueError: If the cursor is malformed
     '''
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    fields = HISTORY_SUMMARY_FIELDS if fields is None else fields
+    start_after = decode_cursor(cursor) if cursor else None
+    
     try:
-        db = get_firestore_client()
-        if db is None:
-            return []
+        # One extra document tells whether there is a next page
+        if fields:
+            fields = list(dict.fromkeys(list(fields) + ['id', 'timestamp']))
+        storage = get_storage()
+        history = storage.list_results(user_id, limit + 1, start_after=start_after, fields=fields)
         
-        # Query Firestore
-        docs = db.collection('analysis_history')\
-            .order_by('timestamp', direction=firestore.Query.DESCENDING)\
-            .limit(limit)\
-            .stream()
+        next_cursor = None
+        if len(history) > limit:
+            history = history[:limit]
+            next_cursor = encode_cursor(history[-1])
         
-        history = []
-        for doc in docs:
-            data = doc.to_dict()
-            history.append(data)
+        if not fields:
+            history = [decode_result(doc, storage.get_shared) for doc in history]
         
-        return history
+        return history, next_cursor
     
     except Exception as e:
         print(f"Error retrieving history: {str(e)}")
-        return []
+        return [], None
+
+def get_result(result_id, user_id=None):
+    '''
+    Get a full analysis result
+    
+    Args:
+        result_id: ID of the result
+        user_id: If given, the result must belong to this user
+    
+    Returns:
+        Result document, or None if not found
+    '''
+    try:
+        storage = get_storage()
+        data = storage.get_result(result_id)
+        if data is None:
+            return None
+        if user_id is not None and data.get('user_id') != user_id:
+            return None
+        return decode_result(data, storage.get_shared)
+    
+    except Exception as e:
+        print(f"Error retrieving result: {str(e)}")
+        return None
 
 def delete_result(result_id):
     '''
-    Delete a result from Firestore
+    Delete a saved result
     
     Args:
         result_id: ID of the result to delete
@@ -77,13 +229,49 @@ def delete_result(result_id):
         Boolean indicating success
     '''
     try:
-        db = get_firestore_client()
-        if db is None:
-            return False
+        storage = get_storage()
+        stored = storage.get_result(result_id)
+        storage.delete_result(result_id)
         
-        db.collection('analysis_history').document(result_id).delete()
+        if stored is not None:
+            release_upload(stored)
+        
+        # Take the result back out of its owner's counters
+        if stored is not None and stored.get('user_id') is not None:
+            data = decode_result(stored, storage.get_shared)
+            storage.increment_stats(data['user_id'], stats_increments(data, sign=-1))
         return True
     
     except Exception as e:
         print(f"Error deleting result: {str(e)}")
         return False
+
+def _upload_key(data):
+    '''Blob store key of a result's original image, or None'''
+    path = data.get('original_image')
+    if not path:
+        return None
+    key = upload_key(path)
+    return None if key.startswith('..') else key
+
+def retain_upload(data):
+    '''Pin the upload a saved result refers to, so eviction keeps it'''
+    key = _upload_key(data)
+    if key is None:
+        return
+    try:
+        # Images from /api/analyze/image may still be on their way to disk
+        wait_for_pending(key)
+        get_blob_store().retain(key)
+    except Exception as e:
+        print(f"Upload pin warning ({key}): {str(e)}")
+
+def release_upload(data):
+    '''Unpin the upload of a deleted result'''
+    key = _upload_key(data)
+    if key is None:
+        return
+    try:
+        get_blob_store().release(key)
+    except Exception as e:
+        print(f"Upload release warning ({key}): {str(e)}")
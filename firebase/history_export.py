@@ -0,0 +1,105 @@
+"""
+Streaming NDJSON Export of Analysis History
+
+Usage:
+    python -m firebase.history_export USER_ID [-o FILE] [--gzip] [--page-size N]
+"""
+from contextlib import redirect_stdout
+from datetime import datetime
+import argparse
+import json
+import sys
+import zlib
+
+from firebase.storage_backends import get_storage
+from app.models.result_codec import decode_result
+
+EXPORT_PAGE_SIZE = 500
+
+def iter_history(user_id, page_size=EXPORT_PAGE_SIZE):
+    '''
+    Yield every result of a user, newest first, one page in memory at a time
+    
+    Args:
+        user_id: Owner of the results
+        page_size: Documents fetched per query
+    
+    Yields:
+        Full (decoded) result documents
+    '''
+    storage = get_storage()
+    start_after = None
+    while True:
+        page = storage.list_results(user_id, page_size, start_after=start_after)
+        for doc in page:
+            yield decode_result(doc, storage.get_shared)
+        if len(page) < page_size:
+            return
+        start_after = {'timestamp': page[-1]['timestamp'], 'id': page[-1]['id']}
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+def iter_ndjson(user_id, page_size=EXPORT_PAGE_SIZE):
+    '''Yield a user's history as NDJSON, one encoded line per result'''
+    for doc in iter_history(user_id, page_size):
+        yield (json.dumps(doc, default=_json_default, ensure_ascii=False) + '\n').encode('utf-8')
+
+def iter_gzip(chunks, level=6, flush_bytes=64 * 1024):
+    '''
+    Gzip a stream of byte chunks incrementally
+    
+    Compressed output is emitted whenever about flush_bytes of input have
+    been consumed, so neither side of the stream is ever held in full.
+    '''
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    pending = 0
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        pending += len(chunk)
+        if pending >= flush_bytes:
+            data += compressor.flush(zlib.Z_SYNC_FLUSH)
+            pending = 0
+        if data:
+            yield data
+    yield compressor.flush()
+
+def export_history(user_id, compress=False, page_size=EXPORT_PAGE_SIZE):
+    '''
+    Stream a user's full history
+    
+    Args:
+        user_id: Owner of the results
+        compress: Gzip the NDJSON stream
+        page_size: Documents fetched per query
+    
+    Returns:
+        Iterator of byte chunks
+    '''
+    chunks = iter_ndjson(user_id, page_size)
+    return iter_gzip(chunks) if compress else chunks
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Export a user\'s analysis history as NDJSON')
+    parser.add_argument('user_id', help='Owner of the results')
+    parser.add_argument('-o', '--output', help='Output file (default: stdout)')
+    parser.add_argument('--gzip', action='store_true', help='Gzip-compress the output')
+    parser.add_argument('--page-size', type=int, default=EXPORT_PAGE_SIZE, help='Documents per query')
+    args = parser.parse_args(argv)
+    
+    out = open(args.output, 'wb') if args.output else sys.stdout.buffer
+    try:
+        # Progress messages go to stderr so they cannot corrupt the export
+        with redirect_stdout(sys.stderr):
+            for chunk in export_history(args.user_id, compress=args.gzip, page_size=args.page_size):
+                out.write(chunk)
+    finally:
+        if args.output:
+            out.close()
+        else:
+            out.flush()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,217 @@
+"""
+In-Memory Stand-In for the Firestore Client (local runs and tests)
+"""
+import copy
+import threading
+
+class InMemoryFirestore:
+    '''
+    Minimal thread-safe substitute for firestore.client()
+    
+    Supports the calls this app makes: collection().document() with get,
+    set (optionally merged, with Increment transforms), create, update and
+    delete, queries with where, order_by, select, start_after and limit,
+    and write batches that apply atomically on commit. Enabled with
+    FIRESTORE_IN_MEMORY=1; nothing is persisted.
+    '''
+    
+    def __init__(self):
+        self._collections = {}
+        self._lock = threading.RLock()
+        self.commits = 0
+    
+    def collection(self, name):
+        return MemoryCollection(self, name)
+    
+    def batch(self):
+        return MemoryBatch(self)
+    
+    def _docs(self, collection):
+        return self._collections.setdefault(collection, {})
+    
+    def _set(self, collection, doc_id, data, merge=False):
+        with self._lock:
+            docs = self._docs(collection)
+            if merge:
+                _merge(docs.setdefault(doc_id, {}), copy.deepcopy(data))
+            else:
+                docs[doc_id] = _merge({}, copy.deepcopy(data))
+    
+    def _update(self, collection, doc_id, fields):
+        with self._lock:
+            docs = self._docs(collection)
+            if doc_id not in docs:
+                raise KeyError(f"No document to update: {collection}/{doc_id}")
+            docs[doc_id].update(copy.deepcopy(fields))
+
+def _merge(target, data):
+    '''Merge nested maps into target as Firestore does, applying Increment transforms'''
+    from firebase.storage_backends import increment_type
+    
+    Increment = increment_type()
+    for key, value in data.items():
+        if isinstance(value, Increment):
+            current = target.get(key)
+            target[key] = (current if isinstance(current, (int, float)) else 0) + value.value
+        elif isinstance(value, dict):
+            current = target.get(key)
+            target[key] = _merge(current if isinstance(current, dict) else {}, value)
+        else:
+            target[key] = value
+    return target
+
+class MemoryQuery:
+    '''Query with where, order_by, select, start_after and limit'''
+    
+    OPERATORS = {
+        '==': lambda a, b: a == b,
+        '!=': lambda a, b: a != b,
+        '<': lambda a, b: a is not None and a < b,
+        '<=': lambda a, b: a is not None and a <= b,
+        '>': lambda a, b: a is not None and a > b,
+        '>=': lambda a, b: a is not None and a >= b,
+        'in': lambda a, b: a in b,
+        'array_contains': lambda a, b: isinstance(a, list) and b in a,
+    }
+    
+    def __init__(self, client, collection, filters=(), orders=(), fields=None, cursor=None, limit_count=None):
+        self._client = client
+        self._collection = collection
+        self._filters = tuple(filters)
+        self._orders = tuple(orders)
+        self._fields = fields
+        self._cursor = cursor
+        self._limit = limit_count
+    
+    def _copy(self, **changes):
+        state = {
+            'filters': self._filters, 'orders': self._orders, 'fields': self._fields,
+            'cursor': self._cursor, 'limit_count': self._limit
+        }
+        state.update(changes)
+        return MemoryQuery(self._client, self._collection, **state)
+    
+    def where(self, field, op, value):
+        return self._copy(filters=self._filters + ((field, op, value),))
+    
+    def order_by(self, field, direction='ASCENDING'):
+        return self._copy(orders=self._orders + ((field, direction == 'DESCENDING'),))
+    
+    def select(self, fields):
+        return self._copy(fields=list(fields))
+    
+    def start_after(self, values):
+        return self._copy(cursor=values)
+    
+    def limit(self, count):
+        return self._copy(limit_count=count)
+    
+    def _after_cursor(self, data):
+        # Lexicographic comparison over the order_by fields
+        for field, descending in self._orders:
+            value, bound = data.get(field), self._cursor.get(field)
+            if value == bound:
+                continue
+            return value < bound if descending else value > bound
+        return False
+    
+    def stream(self):
+        with self._client._lock:
+            items = [
+                (doc_id, copy.deepcopy(data))
+                for doc_id, data in self._client._docs(self._collection).items()
+                if all(self.OPERATORS[op](data.get(field), value) for field, op, value in self._filters)
+            ]
+        for field, descending in reversed(self._orders):
+            items.sort(key=lambda item: item[1].get(field), reverse=descending)
+        if self._cursor is not None:
+            items = [item for item in items if self._after_cursor(item[1])]
+        if self._limit is not None:
+            items = items[:self._limit]
+        for doc_id, data in items:
+            if self._fields is not None:
+                data = {field: data[field] for field in self._fields if field in data}
+            yield MemoryDocumentSnapshot(
+                MemoryDocumentReference(self._client, self._collection, doc_id), data
+            )
+
+class MemoryCollection(MemoryQuery):
+    def __init__(self, client, name):
+        super().__init__(client, name)
+        self.id = name
+    
+    def document(self, doc_id):
+        return MemoryDocumentReference(self._client, self.id, doc_id)
+
+class MemoryDocumentReference:
+    def __init__(self, client, collection, doc_id):
+        self._client = client
+        self.collection_id = collection
+        self.id = doc_id
+    
+    def get(self):
+        with self._client._lock:
+            data = self._client._docs(self.collection_id).get(self.id)
+        return MemoryDocumentSnapshot(self, copy.deepcopy(data))
+    
+    def set(self, data, merge=False):
+        self._client._set(self.collection_id, self.id, data, merge)
+    
+    def create(self, data):
+        from firebase.storage_backends import already_exists_error
+        
+        with self._client._lock:
+            if self.id in self._client._docs(self.collection_id):
+                raise already_exists_error()(f"Document already exists: {self.collection_id}/{self.id}")
+            self._client._set(self.collection_id, self.id, data)
+    
+    def update(self, fields):
+        self._client._update(self.collection_id, self.id, fields)
+    
+    def delete(self):
+        with self._client._lock:
+            self._client._docs(self.collection_id).pop(self.id, None)
+
+class MemoryDocumentSnapshot:
+    def __init__(self, reference, data):
+        self.reference = reference
+        self.id = reference.id
+        self._data = data
+    
+    @property
+    def exists(self):
+        return self._data is not None
+    
+    def to_dict(self):
+        return copy.deepcopy(self._data)
+
+class MemoryBatch:
+    def __init__(self, client):
+        self._client = client
+        self._writes = []
+    
+    def set(self, reference, data, merge=False):
+        self._writes.append(('set', reference, copy.deepcopy(data), merge))
+    
+    def update(self, reference, fields):
+        self._writes.append(('update', reference, copy.deepcopy(fields), False))
+    
+    def delete(self, reference):
+        self._writes.append(('delete', reference, None, False))
+    
+    def commit(self):
+        client = self._client
+        with client._lock:
+            # Validate first so a failing batch changes nothing
+            for kind, ref, _data, _merge in self._writes:
+                if kind == 'update' and ref.id not in client._docs(ref.collection_id):
+                    raise KeyError(f"No document to update: {ref.collection_id}/{ref.id}")
+            for kind, ref, data, merge in self._writes:
+                if kind == 'set':
+                    client._set(ref.collection_id, ref.id, data, merge)
+                elif kind == 'update':
+                    client._update(ref.collection_id, ref.id, data)
+                else:
+                    ref.delete()
+            client.commits += 1
+        self._writes = []
@@ -0,0 +1,228 @@
+"""
+Embedded SQLite Storage Backend (WAL mode, pooled connections)
+"""
+from contextlib import contextmanager
+from datetime import datetime
+import json
+import os
+import queue
+import sqlite3
+
+from firebase.storage_backends import StorageBackend
+
+# Columns kept next to each result so history lists never parse full documents
+SUMMARY_COLUMN_FIELDS = {
+    'id', 'user_id', 'timestamp', 'thumbnail_image', 'original_image',
+    'top_classes', 'object_count', 'summary'
+}
+
+def _encode(value):
+    if isinstance(value, datetime):
+        return {'$dt': value.isoformat()}
+    raise TypeError(f"Cannot store {type(value).__name__}")
+
+def _decode(obj):
+    if len(obj) == 1 and '$dt' in obj:
+        return datetime.fromisoformat(obj['$dt'])
+    return obj
+
+def dumps(doc):
+    return json.dumps(doc, default=_encode, ensure_ascii=False, separators=(',', ':'))
+
+def loads(text):
+    return json.loads(text, object_hook=_decode)
+
+def _epoch(value):
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return float(value)
+
+class ConnectionPool:
+    '''Fixed-size pool of SQLite connections shared by request threads'''
+    
+    def __init__(self, db_path, size=4, timeout=10.0):
+        self.db_path = db_path
+        self.timeout = timeout
+        self._pool = queue.LifoQueue(maxsize=size)
+        for _ in range(size):
+            self._pool.put(self._open())
+    
+    def _open(self):
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA foreign_keys=ON')
+        return conn
+    
+    @contextmanager
+    def connection(self):
+        '''Borrow a connection; the block runs as one transaction'''
+        conn = self._pool.get(timeout=self.timeout)
+        try:
+            with conn:
+                yield conn
+        finally:
+            self._pool.put(conn)
+
+class SQLiteBackend(StorageBackend):
+    '''
+    Users and analysis history in a local SQLite database
+    
+    Documents are stored as JSON next to the columns that are queried:
+    users are looked up by a unique email index, results by primary key
+    and by (user_id, timestamp DESC, id DESC) for history pages, which
+    read a separate summary column instead of the full document.
+    Per-user counters live in user_stats, one row per (group, name).
+    '''
+    
+    name = 'sqlite'
+    
+    def __init__(self, db_path, pool_size=4):
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.pool = ConnectionPool(db_path, size=pool_size)
+        self._init_db()
+    
+    def _init_db(self):
+        with self.pool.connection() as conn:
+            conn.executescript('''
+                CREATE TABLE IF NOT EXISTS users (
+                    id TEXT PRIMARY KEY,
+                    email TEXT NOT NULL,
+                    doc TEXT NOT NULL
+                );
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_users_email ON users (email);
+                
+                CREATE TABLE IF NOT EXISTS results (
+                    id TEXT PRIMARY KEY,
+                    user_id TEXT,
+                    timestamp REAL NOT NULL,
+                    summary TEXT NOT NULL,
+                    doc TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_results_user_time
+                    ON results (user_id, timestamp DESC, id DESC);
+                
+                CREATE TABLE IF NOT EXISTS user_stats (
+                    user_id TEXT NOT NULL,
+                    grp TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    count INTEGER NOT NULL,
+                    PRIMARY KEY (user_id, grp, name)
+                ) WITHOUT ROWID;
+                
+                CREATE TABLE IF NOT EXISTS shared (
+                    collection TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    doc TEXT NOT NULL,
+                    PRIMARY KEY (collection, key)
+                );
+            ''')
+    
+    def save_result(self, data):
+        summary = {key: value for key, value in data.items() if key in SUMMARY_COLUMN_FIELDS}
+        with self.pool.connection() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO results (id, user_id, timestamp, summary, doc) VALUES (?, ?, ?, ?, ?)',
+                (data['id'], data.get('user_id'), _epoch(data['timestamp']), dumps(summary), dumps(data))
+            )
+    
+    def get_result(self, result_id):
+        with self.pool.connection() as conn:
+            row = conn.execute('SELECT doc FROM results WHERE id = ?', (result_id,)).fetchone()
+        return loads(row['doc']) if row else None
+    
+    def delete_result(self, result_id):
+        with self.pool.connection() as conn:
+            conn.execute('DELETE FROM results WHERE id = ?', (result_id,))
+    
+    def list_results(self, user_id, limit, start_after=None, fields=None):
+        column = 'summary' if fields and set(fields) <= SUMMARY_COLUMN_FIELDS else 'doc'
+        sql = f'SELECT {column} FROM results WHERE user_id = ?'
+        params = [user_id]
+        if start_after:
+            timestamp = _epoch(start_after['timestamp'])
+            sql += ' AND (timestamp < ? OR (timestamp = ? AND id < ?))'
+            params += [timestamp, timestamp, start_after['id']]
+        sql += ' ORDER BY timestamp DESC, id DESC LIMIT ?'
+        params.append(limit)
+        
+        with self.pool.connection() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        
+        docs = [loads(row[column]) for row in rows]
+        if fields:
+            docs = [{key: doc[key] for key in fields if key in doc} for doc in docs]
+        return docs
+    
+    def save_shared(self, collection, key, data):
+        with self.pool.connection() as conn:
+            conn.execute(
+                'INSERT OR IGNORE INTO shared (collection, key, doc) VALUES (?, ?, ?)',
+                (collection, key, dumps(data))
+            )
+    
+    def get_shared(self, collection, keys):
+        keys = list(keys)
+        if not keys:
+            return {}
+        placeholders = ','.join('?' * len(keys))
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                f'SELECT key, doc FROM shared WHERE collection = ? AND key IN ({placeholders})',
+                [collection] + keys
+            ).fetchall()
+        return {row['key']: loads(row['doc']) for row in rows}
+    
+    def increment_stats(self, user_id, counters):
+        rows = [
+            (user_id, group, name, amount)
+            for group, values in counters.items()
+            for name, amount in values.items()
+        ]
+        if not rows:
+            return
+        with self.pool.connection() as conn:
+            conn.executemany(
+                'INSERT INTO user_stats (user_id, grp, name, count) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT (user_id, grp, name) DO UPDATE SET count = count + excluded.count',
+                rows
+            )
+    
+    def get_stats(self, user_id):
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                'SELECT grp, name, count FROM user_stats WHERE user_id = ?', (user_id,)
+            ).fetchall()
+        stats = {}
+        for row in rows:
+            stats.setdefault(row['grp'], {})[row['name']] = row['count']
+        return stats
+    
+    def create_user(self, user_data):
+        try:
+            with self.pool.connection() as conn:
+                conn.execute(
+                    'INSERT INTO users (id, email, doc) VALUES (?, ?, ?)',
+                    (user_data['id'], user_data['email'], dumps(user_data))
+                )
+        except sqlite3.IntegrityError:
+            return False  # Email already registered
+        return True
+    
+    def get_user_by_email(self, email):
+        with self.pool.connection() as conn:
+            row = conn.execute('SELECT doc FROM users WHERE email = ?', (email.strip().lower(),)).fetchone()
+        return loads(row['doc']) if row else None
+    
+    def get_user(self, user_id):
+        with self.pool.connection() as conn:
+            row = conn.execute('SELECT doc FROM users WHERE id = ?', (user_id,)).fetchone()
+        return loads(row['doc']) if row else None
+    
+    def update_user(self, user_id, fields):
+        # Merged inside SQLite so concurrent updates cannot lose each other
+        with self.pool.connection() as conn:
+            conn.execute('UPDATE users SET doc = json_patch(doc, ?) WHERE id = ?', (dumps(fields), user_id))
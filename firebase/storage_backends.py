@@ -0,0 +1,332 @@
+"""
+Storage Backends for Users and Analysis History (Firestore or embedded SQLite)
+"""
+from datetime import datetime, timezone
+import hashlib
+import os
+import threading
+
+from config import Config
+
+class _AlreadyExists(Exception):
+    '''Raised when creating a document that already exists'''
+
+class _Increment:
+    '''Field transform adding value to a numeric field'''
+    def __init__(self, value):
+        self.value = value
+
+def already_exists_error():
+    '''
+    Exception type Firestore raises from create() on an existing document
+    
+    Imported on first use, so SQLite-only processes never load google-cloud.
+    '''
+    try:
+        from google.api_core.exceptions import AlreadyExists
+    except ImportError:  # google-api-core is installed with firebase-admin
+        return _AlreadyExists
+    return AlreadyExists
+
+def increment_type():
+    '''Firestore's Increment field transform, imported on first use'''
+    try:
+        from google.cloud.firestore_v1 import Increment
+    except ImportError:  # google-cloud-firestore is installed with firebase-admin
+        return _Increment
+    return Increment
+
+def email_key(email):
+    '''Document key derived from a normalized email address'''
+    return hashlib.sha256(email.strip().lower().encode('utf-8')).hexdigest()[:40]
+
+class StorageBackend:
+    '''
+    Interface of the user and history store
+    
+    Documents are plain dictionaries. Results carry 'id', 'user_id' and
+    'timestamp'; users carry 'id' and 'email'.
+    '''
+    
+    name = 'base'
+    
+    def save_result(self, data):
+        raise NotImplementedError
+    
+    def get_result(self, result_id):
+        '''Return a result document, or None'''
+        raise NotImplementedError
+    
+    def delete_result(self, result_id):
+        raise NotImplementedError
+    
+    def list_results(self, user_id, limit, start_after=None, fields=None):
+        '''
+        Return up to limit of a user's results ordered by (timestamp, id), newest first
+        
+        Args:
+            user_id: Owner of the results
+            limit: Maximum number of documents
+            start_after: Optional {'timestamp', 'id'} of the last document
+                of the previous page
+            fields: Optional list of fields to return (projection)
+        '''
+        raise NotImplementedError
+    
+    def save_shared(self, collection, key, data):
+        '''Store a document that many results reference by key (content-addressed)'''
+        raise NotImplementedError
+    
+    def get_shared(self, collection, keys):
+        '''Return {key: document} for the shared documents that exist'''
+        raise NotImplementedError
+    
+    def increment_stats(self, user_id, counters):
+        '''
+        Add to a user's aggregate counters
+        
+        Args:
+            user_id: Owner of the counters
+            counters: {group: {name: amount}}; amounts may be negative
+        '''
+        raise NotImplementedError
+    
+    def get_stats(self, user_id):
+        '''Return a user's counters as {group: {name: count}}'''
+        raise NotImplementedError
+    
+    def create_user(self, user_data):
+        '''
+        Store a new user unless one with the same email key exists, atomically
+        
+        Users stored before email keys (Firestore) are not checked here;
+        callers look the email up with get_user_by_email first.
+        
+        Returns:
+            True if the user was created
+        '''
+        raise NotImplementedError
+    
+    def get_user_by_email(self, email):
+        '''
+        Return the user with an email, or None
+        
+        Args:
+            email: Email address as typed; matched case-insensitively, and
+                as typed or lowercased for users stored before email keys
+        '''
+        raise NotImplementedError
+    
+    def get_user(self, user_id):
+        raise NotImplementedError
+    
+    def update_user(self, user_id, fields):
+        raise NotImplementedError
+
+class FirestoreBackend(StorageBackend):
+    '''
+    Firestore collections 'users', 'analysis_history' and 'user_stats'
+    
+    User documents are keyed by email_key(email) (and carry it as their
+    id), so a login is one point read and registration one create() that
+    fails if the document exists. Result saves, stats increments and user
+    updates go through the write-behind queue.
+    The history query needs a composite index on
+    analysis_history (user_id ASC, timestamp DESC, id DESC).
+    '''
+    
+    name = 'firestore'
+    
+    def __init__(self, client_factory):
+        self.client_factory = client_factory
+    
+    def _db(self):
+        db = self.client_factory()
+        if db is None:
+            raise RuntimeError("Firestore client unavailable")
+        return db
+    
+    def save_result(self, data):
+        from firebase.write_behind import get_write_behind
+        
+        db = self._db()
+        # Committed in a batch by the write-behind queue; written here only
+        # when the queue is full
+        if not get_write_behind().set('analysis_history', data['id'], data):
+            db.collection('analysis_history').document(data['id']).set(data)
+    
+    def get_result(self, result_id):
+        from firebase.write_behind import get_write_behind
+        
+        # A result saved or deleted moments ago may still be in the queue
+        documents, deleted = get_write_behind().queued('analysis_history')
+        if result_id in deleted:
+            return None
+        if result_id in documents:
+            return documents[result_id]
+        doc = self._db().collection('analysis_history').document(result_id).get()
+        return doc.to_dict() if doc.exists else None
+    
+    def delete_result(self, result_id):
+        from firebase.write_behind import get_write_behind
+        
+        # Replaces a queued save of the result and is committed after one
+        # already in flight; written here only when the queue is full
+        if not get_write_behind().delete('analysis_history', result_id):
+            self._db().collection('analysis_history').document(result_id).delete()
+    
+    def list_results(self, user_id, limit, start_after=None, fields=None):
+        from firebase.write_behind import get_write_behind
+        
+        documents, deleted = get_write_behind().queued('analysis_history')
+        # 'DESCENDING' is firestore.Query.DESCENDING
+        query = self._db().collection('analysis_history')\
+            .where('user_id', '==', user_id)\
+            .order_by('timestamp', direction='DESCENDING')\
+            .order_by('id', direction='DESCENDING')
+        if fields:
+            query = query.select(list(fields))
+        if start_after:
+            query = query.start_after(start_after)
+        # Read past results whose delete is queued, so the page stays full
+        results = [doc.to_dict() for doc in query.limit(limit + len(deleted)).stream()]
+        return _merge_queued(results, documents, deleted, user_id, limit, start_after, fields)
+    
+    def save_shared(self, collection, key, data):
+        from firebase.write_behind import get_write_behind
+        
+        # Keys are content hashes, so rewriting an existing document is harmless
+        if not get_write_behind().set(collection, key, data):
+            self._db().collection(collection).document(key).set(data)
+    
+    def get_shared(self, collection, keys):
+        from firebase.write_behind import get_write_behind
+        
+        found = {}
+        for key in keys:
+            data = get_write_behind().peek(collection, key)
+            if data is None:
+                doc = self._db().collection(collection).document(key).get()
+                data = doc.to_dict() if doc.exists else None
+            if data is not None:
+                found[key] = data
+        return found
+    
+    def increment_stats(self, user_id, counters):
+        from firebase.write_behind import get_write_behind
+        
+        # A merged write of server-side increments, so concurrent saves
+        # never lose counts; queued with the result it counts, and queued
+        # increments of the same document are summed
+        Increment = increment_type()
+        data = {
+            group: {name: Increment(amount) for name, amount in values.items()}
+            for group, values in counters.items() if values
+        }
+        if data and not get_write_behind().set('user_stats', user_id, data, merge=True):
+            self._db().collection('user_stats').document(user_id).set(data, merge=True)
+    
+    def get_stats(self, user_id):
+        doc = self._db().collection('user_stats').document(user_id).get()
+        return doc.to_dict() if doc.exists else {}
+    
+    def create_user(self, user_data):
+        try:
+            self._db().collection('users').document(email_key(user_data['email'])).create(user_data)
+        except already_exists_error():
+            return False
+        return True
+    
+    def get_user_by_email(self, email):
+        # Single point read on the email-derived key
+        doc = self._db().collection('users').document(email_key(email)).get()
+        if doc.exists:
+            return doc.to_dict()
+        return self._find_legacy_user(email)
+    
+    def _find_legacy_user(self, email):
+        # Users registered before email keys were introduced only have a
+        # random document id and their email as they typed it
+        emails = list(dict.fromkeys([email.strip(), email.strip().lower()]))
+        users = self._db().collection('users').where('email', 'in', emails).limit(1).stream()
+        for doc in users:
+            return doc.to_dict()
+        return None
+    
+    def get_user(self, user_id):
+        doc = self._db().collection('users').document(user_id).get()
+        return doc.to_dict() if doc.exists else None
+    
+    def update_user(self, user_id, fields):
+        from firebase.write_behind import get_write_behind
+        
+        if not get_write_behind().update('users', user_id, fields):
+            self._db().collection('users').document(user_id).update(fields)
+
+def _merge_queued(results, documents, deleted, user_id, limit, start_after, fields):
+    '''
+    Apply queued writes to a page of results read from Firestore
+    
+    Queued deletes are removed, and queued saves of the user's results
+    replace their committed version or are added where they sort.
+    
+    Returns:
+        Up to limit results ordered by (timestamp, id), newest first
+    '''
+    page = {data.get('id'): data for data in results if data.get('id') not in deleted}
+    for result_id, data in documents.items():
+        if data.get('user_id') != user_id:
+            continue
+        if start_after and _history_order(data) >= _history_order(start_after):
+            continue
+        page[result_id] = {name: data[name] for name in fields if name in data} if fields else data
+    return sorted(page.values(), key=_history_order, reverse=True)[:limit]
+
+def _history_order(data):
+    '''(timestamp, id) sort key; naive timestamps are UTC, as Firestore stores them'''
+    timestamp = data.get('timestamp')
+    if isinstance(timestamp, datetime) and timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return (timestamp, data.get('id') or '')
+
+def _firestore_backend():
+    from firebase.firebase_admin_setup import get_firestore_client
+    return FirestoreBackend(get_firestore_client)
+
+def _sqlite_backend():
+    from firebase.sqlite_backend import SQLiteBackend
+    return SQLiteBackend(Config.SQLITE_DB_PATH, pool_size=Config.SQLITE_POOL_SIZE)
+
+BACKENDS = {
+    'firestore': _firestore_backend,
+    'sqlite': _sqlite_backend,
+}
+
+def resolve_backend_name():
+    '''
+    Backend named by STORAGE_BACKEND; 'auto' picks Firestore when its
+    credentials (or the in-memory stand-in) are available, else SQLite
+    '''
+    name = Config.STORAGE_BACKEND
+    if name != 'auto':
+        return name
+    if Config.FIRESTORE_IN_MEMORY or os.path.exists(Config.FIREBASE_CREDENTIALS):
+        return 'firestore'
+    return 'sqlite'
+
+_storage = None
+_storage_lock = threading.Lock()
+
+def get_storage():
+    '''Get the process-wide storage backend'''
+    global _storage
+    if _storage is None:
+        with _storage_lock:
+            if _storage is None:
+                name = resolve_backend_name()
+                factory = BACKENDS.get(name)
+                if factory is None:
+                    raise ValueError(f"Unknown storage backend: {name}")
+                _storage = factory()
+                print(f"✓ Storage backend: {name}")
+    return _storage
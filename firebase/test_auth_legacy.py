@@ -0,0 +1,66 @@
+"""
+Login and registration of users stored before email keys (mixed-case emails)
+
+    python -m pytest firebase/test_auth_legacy.py
+    python firebase/test_auth_legacy.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from werkzeug.security import generate_password_hash
+
+import firebase.storage_backends as storage_backends
+import firebase.write_behind as write_behind
+from firebase.memory_client import InMemoryFirestore
+from firebase.storage_backends import FirestoreBackend
+from app.models import auth_service
+
+def _legacy_storage():
+    '''Firestore stand-in holding one user under a random id, with the email as typed'''
+    db = InMemoryFirestore()
+    db.collection('users').document('legacy-id-1').set({
+        'id': 'legacy-id-1',
+        'email': 'Alice.Smith@Example.com',
+        'password_hash': generate_password_hash('secret'),
+        'name': 'Alice',
+        'created_at': None,
+        'last_login': None
+    })
+    storage_backends._storage = FirestoreBackend(lambda: db)
+    write_behind._queue = write_behind.WriteBehindQueue(lambda: db)
+    return db
+
+def test_mixed_case_legacy_user_logs_in():
+    _legacy_storage()
+    user = auth_service.authenticate_user('Alice.Smith@Example.com', 'secret')
+    assert user is not None and user['id'] == 'legacy-id-1'
+
+def test_lowercase_login_of_lowercase_legacy_user():
+    db = _legacy_storage()
+    db.collection('users').document('legacy-id-2').set({
+        'id': 'legacy-id-2',
+        'email': 'bob@example.com',
+        'password_hash': generate_password_hash('pw'),
+    })
+    user = auth_service.authenticate_user('Bob@Example.com', 'pw')
+    assert user is not None and user['id'] == 'legacy-id-2'
+
+def test_mixed_case_legacy_user_cannot_register_again():
+    db = _legacy_storage()
+    assert auth_service.create_user('Alice.Smith@Example.com', 'other') is None
+    assert len(list(db.collection('users').stream())) == 1
+
+def test_new_user_is_keyed_by_lowercased_email():
+    _legacy_storage()
+    user = auth_service.create_user('Carol@Example.com', 'pw')
+    assert user is not None and user['email'] == 'carol@example.com'
+    assert auth_service.authenticate_user('CAROL@example.com', 'pw')['id'] == user['id']
+    assert auth_service.create_user('carol@example.com', 'pw') is None
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+            print(f"✓ {name}")
@@ -0,0 +1,168 @@
+"""
+Write-behind queue and the Firestore backend's view of queued writes
+
+    python -m pytest firebase/test_write_behind.py
+    python firebase/test_write_behind.py
+"""
+from datetime import datetime, timedelta
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import firebase.storage_backends as storage_backends
+import firebase.write_behind as write_behind
+from firebase.memory_client import InMemoryFirestore
+from firebase.storage_backends import FirestoreBackend, increment_type
+
+class FlakyFirestore(InMemoryFirestore):
+    '''In-memory stand-in whose next batch commits fail'''
+    
+    def __init__(self):
+        super().__init__()
+        self.failures = 0
+    
+    def batch(self):
+        batch = super().batch()
+        commit = batch.commit
+        def flaky_commit():
+            if self.failures:
+                self.failures -= 1
+                raise RuntimeError("commit failed")
+            commit()
+        batch.commit = flaky_commit
+        return batch
+
+def _setup(db=None, **options):
+    '''Backend and queue over a fresh stand-in; the queue only commits on flush()'''
+    db = db or InMemoryFirestore()
+    queue = write_behind.WriteBehindQueue(lambda: db, flush_interval=3600, retry_backoff=0, **options)
+    write_behind._queue = queue
+    backend = FirestoreBackend(lambda: db)
+    storage_backends._storage = backend
+    return db, queue, backend
+
+def _result(result_id, minutes=0, user_id='u1'):
+    return {'id': result_id, 'user_id': user_id, 'timestamp': datetime(2024, 1, 1) + timedelta(minutes=minutes)}
+
+def _doc(db, collection, doc_id):
+    snapshot = db.collection(collection).document(doc_id).get()
+    return snapshot.to_dict() if snapshot.exists else None
+
+def test_updates_of_a_queued_document_fold_into_one_write():
+    db, queue, _backend = _setup()
+    queue.set('users', 'a', {'name': 'A', 'last_login': 1})
+    queue.update('users', 'a', {'last_login': 2})
+    queue.update('users', 'a', {'last_login': 3})
+    assert queue.pending_count() == 1
+    assert queue.flush()
+    assert _doc(db, 'users', 'a') == {'name': 'A', 'last_login': 3}
+
+def test_queued_increments_are_summed():
+    db, queue, backend = _setup()
+    backend.increment_stats('u1', {'objects': {'cup': 2, 'dog': 1}})
+    backend.increment_stats('u1', {'objects': {'cup': 1}})
+    backend.increment_stats('u1', {'objects': {'dog': -1}})
+    queued = queue._pending[('user_stats', 'u1')]['data']['objects']['cup']
+    assert isinstance(queued, increment_type()) and queued.value == 3
+    assert queue.flush()
+    assert backend.get_stats('u1') == {'objects': {'cup': 3, 'dog': 0}}
+
+def test_failed_batch_is_retried_and_newer_writes_kept():
+    db = FlakyFirestore()
+    db.failures = 1
+    db, queue, _backend = _setup(db, max_retries=2)
+    queue.set('users', 'a', {'name': 'A', 'last_login': 1})
+    assert queue._commit_next() == 1
+    queue.update('users', 'a', {'last_login': 2})
+    assert queue.flush()
+    assert _doc(db, 'users', 'a') == {'name': 'A', 'last_login': 2}
+
+def test_write_is_dropped_after_max_retries():
+    db = FlakyFirestore()
+    db.failures = 10
+    db, queue, _backend = _setup(db, max_retries=1)
+    queue.set('users', 'a', {'name': 'A'})
+    assert queue._commit_next() == 1
+    assert queue._commit_next() == 2
+    assert queue.pending_count() == 0
+    assert _doc(db, 'users', 'a') is None
+
+def test_good_writes_are_committed_past_a_bad_one_in_their_batch():
+    db, queue, _backend = _setup(max_retries=1)
+    queue.set('analysis_history', 'r1', _result('r1'))
+    queue.update('users', 'ghost', {'last_login': 1})
+    queue.set('analysis_history', 'r2', _result('r2'))
+    assert queue._commit_next() == 1
+    assert _doc(db, 'analysis_history', 'r1') == _result('r1')
+    assert _doc(db, 'analysis_history', 'r2') == _result('r2')
+    # Only the update of the missing document is retried, then dropped
+    assert list(queue._pending) == [('users', 'ghost')]
+    assert queue._commit_next() == 2
+    assert queue.pending_count() == 0
+
+def test_flush_without_writer_thread_commits_inline():
+    db, queue, _backend = _setup()
+    queue.stop()
+    queue._stopping = False
+    queue._pending[('users', 'a')] = {'kind': 'set', 'data': {'name': 'A'}, 'merge': False, 'attempts': 0}
+    assert queue.flush(timeout=1)
+    assert _doc(db, 'users', 'a') == {'name': 'A'}
+
+def test_deleting_a_queued_result_discards_it():
+    db, queue, backend = _setup()
+    backend.save_result(_result('r1'))
+    assert backend.get_result('r1') is not None
+    backend.delete_result('r1')
+    assert backend.get_result('r1') is None
+    assert queue.flush()
+    assert _doc(db, 'analysis_history', 'r1') is None
+
+def test_delete_is_committed_after_an_in_flight_save():
+    db, queue, backend = _setup()
+    backend.save_result(_result('r1'))
+    # Take the save out of the queue as the writer thread does before committing
+    with queue._cond:
+        batch_items = [queue._pending.popitem(last=False)]
+        queue._in_flight += 1
+        queue._committing.update(batch_items)
+    assert backend.get_result('r1') is not None
+    backend.delete_result('r1')
+    assert backend.get_result('r1') is None
+    # The in-flight save lands first, then the queued delete
+    db.collection('analysis_history').document('r1').set(batch_items[0][1]['data'])
+    with queue._cond:
+        queue._in_flight -= 1
+        queue._committing.clear()
+    assert queue.flush()
+    assert _doc(db, 'analysis_history', 'r1') is None
+
+def test_list_results_includes_queued_saves_and_hides_queued_deletes():
+    db, queue, backend = _setup()
+    for number in range(3):
+        backend.save_result(_result(f"r{number}", minutes=number))
+    backend.save_result(_result('other', minutes=5, user_id='u2'))
+    assert queue.flush()
+    
+    backend.save_result(_result('r3', minutes=3))
+    backend.delete_result('r2')
+    page = backend.list_results('u1', 2)
+    assert [data['id'] for data in page] == ['r3', 'r1']
+    
+    next_page = backend.list_results('u1', 2, start_after=page[-1])
+    assert [data['id'] for data in next_page] == ['r0']
+    
+    assert queue.flush()
+    assert [data['id'] for data in backend.list_results('u1', 10)] == ['r3', 'r1', 'r0']
+
+def test_list_results_projects_queued_saves():
+    _db, _queue, backend = _setup()
+    backend.save_result(dict(_result('r1'), summary='cup'))
+    page = backend.list_results('u1', 5, fields=['id', 'timestamp'])
+    assert page == [{'id': 'r1', 'timestamp': datetime(2024, 1, 1)}]
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+            print(f"✓ {name}")
@@ -0,0 +1,345 @@
+"""
+Write-Behind Queue for Firestore (batched commits off the request path)
+"""
+import atexit
+from collections import OrderedDict
+import threading
+import time
+
+from config import Config
+
+# Firestore rejects batches with more than 500 writes
+MAX_BATCH_WRITES = 500
+
+class WriteBehindQueue:
+    '''
+    Buffer Firestore writes and commit them in batches from a background thread
+    
+    Writes are keyed by document, so repeated writes to the same document
+    while it is still queued are merged into one (a burst of last_login
+    updates costs a single write); queued Increment transforms of a field
+    are summed rather than replaced. A queued delete replaces whatever was
+    queued for the document, and is committed after a write of it that is
+    already being committed, so a deleted document never comes back.
+    Queued and in-flight writes stay visible through peek() and queued().
+    
+    The thread commits up to batch_size writes per batch whenever
+    flush_interval elapses or a full batch is waiting. A failed batch is
+    split in halves until the writes that fail on their own are found;
+    those are put back and retried with exponential backoff, and dropped
+    and logged once they have failed max_retries times.
+    
+    Memory is bounded: when max_pending documents are queued, enqueue
+    waits up to enqueue_timeout for room and then returns False so the
+    caller can write synchronously instead.
+    '''
+    
+    def __init__(self, client_factory, batch_size=None, flush_interval=None, max_pending=None,
+                 max_retries=None, enqueue_timeout=None, retry_backoff=0.5):
+        self.client_factory = client_factory
+        self.batch_size = min(batch_size or Config.WRITE_BEHIND_BATCH_SIZE, MAX_BATCH_WRITES)
+        self.flush_interval = flush_interval or Config.WRITE_BEHIND_INTERVAL
+        self.max_pending = max_pending or Config.WRITE_BEHIND_MAX_PENDING
+        self.max_retries = max_retries if max_retries is not None else Config.WRITE_BEHIND_MAX_RETRIES
+        self.enqueue_timeout = enqueue_timeout if enqueue_timeout is not None else Config.WRITE_BEHIND_ENQUEUE_TIMEOUT
+        self.retry_backoff = retry_backoff
+        self._pending = OrderedDict()
+        self._in_flight = 0
+        # Writes taken from _pending by the batch being committed
+        self._committing = {}
+        # Callers waiting in flush(); the writer does not idle while any wait
+        self._flushing = 0
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._thread = None
+    
+    def set(self, collection, doc_id, data, merge=False):
+        '''
+        Queue a document write
+        
+        Returns:
+            True if queued, False if the queue stayed full (write it directly)
+        '''
+        return self._enqueue(collection, doc_id, 'set', dict(data), merge)
+    
+    def update(self, collection, doc_id, fields):
+        '''
+        Queue a partial update of an existing document
+        
+        Returns:
+            True if queued, False if the queue stayed full
+        '''
+        return self._enqueue(collection, doc_id, 'update', dict(fields), False)
+    
+    def delete(self, collection, doc_id):
+        '''
+        Queue a document delete in place of any queued write of it
+        
+        Returns:
+            True if queued, False if the queue stayed full
+        '''
+        return self._enqueue(collection, doc_id, 'delete', {}, False)
+    
+    def _enqueue(self, collection, doc_id, kind, data, merge):
+        key = (collection, doc_id)
+        deadline = time.monotonic() + self.enqueue_timeout
+        with self._cond:
+            if self._stopping:
+                return False
+            while key not in self._pending and len(self._pending) >= self.max_pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    print(f"Write-behind queue full ({self.max_pending}); writing {collection}/{doc_id} directly")
+                    return False
+                self._cond.wait(remaining)
+            
+            queued = self._pending.get(key)
+            if queued is None or _replaces(kind, merge):
+                self._pending[key] = {'kind': kind, 'data': data, 'merge': merge, 'attempts': 0}
+            elif queued['kind'] == 'delete':
+                # After a delete, a merged set only leaves these fields
+                self._pending[key] = {'kind': kind, 'data': data, 'merge': False, 'attempts': 0}
+            else:
+                # Fold into the queued write; a queued set stays a set
+                _fold(queued['data'], data, nested=kind == 'set')
+            
+            if len(self._pending) >= self.batch_size:
+                self._cond.notify_all()
+        self.start()
+        return True
+    
+    def peek(self, collection, doc_id):
+        '''Return a copy of a queued full-document write, or None'''
+        with self._cond:
+            queued = self._latest((collection, doc_id))
+            if queued is None or queued['kind'] != 'set' or queued['merge']:
+                return None
+            return dict(queued['data'])
+    
+    def queued(self, collection):
+        '''
+        Writes of a collection's documents that are not committed yet
+        
+        Returns:
+            Tuple of ({doc_id: copy of a queued full-document write},
+            set of doc_ids with a queued delete)
+        '''
+        documents, deleted = {}, set()
+        with self._cond:
+            for key in set(self._pending) | set(self._committing):
+                if key[0] != collection:
+                    continue
+                queued = self._latest(key)
+                if queued['kind'] == 'delete':
+                    deleted.add(key[1])
+                elif queued['kind'] == 'set' and not queued['merge']:
+                    documents[key[1]] = dict(queued['data'])
+        return documents, deleted
+    
+    def _latest(self, key):
+        '''Queued write of a document, else the one being committed (lock held)'''
+        queued = self._pending.get(key)
+        return queued if queued is not None else self._committing.get(key)
+    
+    def flush(self, timeout=None):
+        '''
+        Wait until everything queued so far has been committed or dropped
+        
+        Returns:
+            True if the queue drained within the timeout
+        '''
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._flushing += 1
+            self._cond.notify_all()
+            try:
+                while self._pending or self._in_flight:
+                    if self._thread is None or not self._thread.is_alive():
+                        break
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._cond.wait(remaining if remaining is not None else self.flush_interval)
+            finally:
+                self._flushing -= 1
+        if self._pending:
+            # No writer thread (stopped or never started): commit inline
+            while self._commit_next() is not None:
+                pass
+        return not self._pending
+    
+    def pending_count(self):
+        with self._cond:
+            return len(self._pending) + self._in_flight
+    
+    def start(self):
+        '''Start the background commit thread if it is not running'''
+        with self._cond:
+            if self._stopping or (self._thread is not None and self._thread.is_alive()):
+                return
+            self._thread = threading.Thread(target=self._run, name='firestore-write-behind', daemon=True)
+            self._thread.start()
+    
+    def stop(self, timeout=10.0):
+        '''Commit what is queued and stop the background thread'''
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        while self._commit_next() is not None:
+            pass
+    
+    def _run(self):
+        while True:
+            with self._cond:
+                idle = not (self._flushing and self._pending)
+                if not self._stopping and idle and len(self._pending) < self.batch_size:
+                    self._cond.wait(self.flush_interval)
+                if self._stopping and not self._pending:
+                    return
+            failed = self._commit_next()
+            if failed:
+                time.sleep(min(30.0, self.retry_backoff * 2 ** (failed - 1)))
+            if self._stopping and failed:
+                return  # Left for stop() to try once more inline
+    
+    def _commit_next(self):
+        '''
+        Commit one batch
+        
+        Returns:
+            None if there was nothing to commit, 0 on success, or the
+            number of attempts made so far on failure
+        '''
+        with self._cond:
+            if not self._pending:
+                return None
+            batch_items = []
+            while self._pending and len(batch_items) < self.batch_size:
+                batch_items.append(self._pending.popitem(last=False))
+            self._in_flight += len(batch_items)
+            self._committing.update(batch_items)
+        
+        db = self.client_factory()
+        if db is None:
+            failed, error = batch_items, "Firestore client unavailable"
+        else:
+            failed, error = self._commit_split(db, batch_items)
+        
+        failed_keys = {key for key, _op in failed}
+        committed = [key for key, _op in batch_items if key not in failed_keys]
+        if committed:
+            with self._cond:
+                self._in_flight -= len(committed)
+                for key in committed:
+                    self._committing.pop(key, None)
+                self._cond.notify_all()
+        if failed:
+            attempts = self._requeue(failed)
+            print(f"Write-behind commit of {len(failed)} of {len(batch_items)} writes failed "
+                  f"(attempt {attempts}): {error}")
+            return attempts
+        return 0
+    
+    def _commit_split(self, db, batch_items):
+        '''
+        Commit writes in one batch, or each half the same way if it fails
+        
+        A batch is all or nothing, so a single write Firestore rejects (an
+        update of a deleted document) would otherwise fail, and eventually
+        drop, every write committed with it.
+        
+        Returns:
+            Tuple of (writes that failed on their own, last error or None)
+        '''
+        try:
+            batch = db.batch()
+            for (collection, doc_id), op in batch_items:
+                ref = db.collection(collection).document(doc_id)
+                if op['kind'] == 'set':
+                    batch.set(ref, op['data'], merge=op['merge'])
+                elif op['kind'] == 'delete':
+                    batch.delete(ref)
+                else:
+                    batch.update(ref, op['data'])
+            batch.commit()
+        except Exception as e:
+            if len(batch_items) == 1:
+                return batch_items, e
+            middle = len(batch_items) // 2
+            first, first_error = self._commit_split(db, batch_items[:middle])
+            second, second_error = self._commit_split(db, batch_items[middle:])
+            return first + second, second_error or first_error
+        return [], None
+    
+    def _requeue(self, batch_items):
+        '''Put failed writes back in front of newer ones for the same documents'''
+        attempts = 0
+        with self._cond:
+            self._in_flight -= len(batch_items)
+            for key, op in reversed(batch_items):
+                self._committing.pop(key, None)
+                op['attempts'] += 1
+                attempts = max(attempts, op['attempts'])
+                if op['attempts'] > self.max_retries:
+                    print(f"✗ Dropping write to {key[0]}/{key[1]} after {op['attempts']} attempts")
+                    continue
+                newer = self._pending.pop(key, None)
+                if newer is not None:
+                    if _replaces(newer['kind'], newer['merge']):
+                        op = newer
+                    elif op['kind'] == 'delete':
+                        op = dict(newer, merge=False)
+                    else:
+                        _fold(op['data'], newer['data'], nested=newer['kind'] == 'set')
+                self._pending[key] = op
+                self._pending.move_to_end(key, last=False)
+            self._cond.notify_all()
+        return attempts
+
+def _replaces(kind, merge):
+    '''True if a write of this kind discards a queued write of the same document'''
+    return kind == 'delete' or kind == 'set' and not merge
+
+def _fold(queued, data, nested):
+    '''
+    Fold a newer write of a document into its queued write
+    
+    Args:
+        queued: Data of the queued write, updated in place
+        data: Data of the newer write
+        nested: True for a merged set, whose nested maps are merged as
+            Firestore merges them; an update replaces top-level fields
+    
+    Returns:
+        queued
+    '''
+    from firebase.storage_backends import increment_type
+    
+    Increment = increment_type()
+    for key, value in data.items():
+        current = queued.get(key)
+        if isinstance(value, Increment):
+            if isinstance(current, Increment):
+                value = Increment(current.value + value.value)
+            elif isinstance(current, (int, float)) and not isinstance(current, bool):
+                value = current + value.value
+        elif nested and isinstance(value, dict) and isinstance(current, dict):
+            value = _fold(dict(current), value, nested)
+        queued[key] = value
+    return queued
+
+_queue = None
+_queue_lock = threading.Lock()
+
+def get_write_behind():
+    '''Get the process-wide write-behind queue; it is flushed at interpreter exit'''
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                from firebase.firebase_admin_setup import get_firestore_client
+                _queue = WriteBehindQueue(get_firestore_client)
+                atexit.register(_queue.stop)
+    return _queue
@@ -0,0 +1,55 @@
+"""
+Gunicorn Configuration (production entry point)
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Each worker loads and warms every model before it accepts connections;
+/readyz reports 200 only after that, /healthz as soon as the worker runs.
+"""
+import multiprocessing
+import os
+import threading
+
+os.environ.setdefault('PRELOAD_MODELS', '1')
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+
+# Few processes (each holds its own copy of the models), several threads
+# each for requests that wait on the network (translation, speech, storage)
+workers = int(os.environ.get('WEB_CONCURRENCY', max(1, min(4, multiprocessing.cpu_count() // 2))))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+# Split the cores between workers for torch/TensorFlow/OpenCV/BLAS pools
+os.environ.setdefault('INFERENCE_THREADS', str(max(1, multiprocessing.cpu_count() // workers)))
+
+# Models are loaded in each worker after fork: torch and TensorFlow thread
+# pools do not survive fork, so the app is not preloaded in the master
+preload_app = False
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+graceful_timeout = 30
+keepalive = 5
+accesslog = '-'
+
+def post_worker_init(worker):
+    '''Warm up models before the worker starts accepting connections'''
+    from app.models.model_warmup import warm_up_models
+    
+    # Warm-up can outlast the worker timeout; keep the heartbeat going so
+    # the master does not restart the worker meanwhile
+    done = threading.Event()
+    
+    def heartbeat():
+        while not done.wait(1.0):
+            worker.notify()
+    
+    threading.Thread(target=heartbeat, name='warmup-heartbeat', daemon=True).start()
+    try:
+        worker.log.info("Warming up models")
+        if warm_up_models():
+            worker.log.info("Models ready")
+        else:
+            worker.log.warning("Required warm-up stage failed; /readyz will report 503")
+    finally:
+        done.set()
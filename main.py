@@ -1,5 +1,7 @@
 """
 Real-Time Vision Explainer: Main Application Entry Point
+
+Development server; in production run gunicorn -c gunicorn.conf.py wsgi:app
 """
 from flask import Flask
 from flask_cors import CORS
@@ -29,6 +29,26 @@ function loadResults() {
     }
 }
 
+function uploadRelativePath(path) {
+    // Uploads are sharded into sub-directories: keep everything after "uploads/"
+    const normalized = path.replace(/\\/g, '/');
+    return normalized.startsWith('uploads/') ? normalized.slice('uploads/'.length) : normalized.split('/').pop();
+}
+
+function annotatedImageSrc(results) {
+    if (results.annotated_image_url) {
+        // Rendered on demand at about the displayed size; rounded so
+        // similar screens share the server's cached render
+        const pixels = window.innerWidth * (window.devicePixelRatio || 1);
+        const size = Math.min(2048, Math.ceil(pixels / 256) * 256);
+        return `${results.annotated_image_url}&size=${size}`;
+    }
+    if (results.annotated_image) {
+        return `/uploads/${uploadRelativePath(results.annotated_image)}`;
+    }
+    return null;
+}
+
 function displayResults() {
     console.log('Displaying results...');
     
@@ -36,13 +56,7 @@ function displayResults() {
         // Display original image
         const originalImage = document.getElementById('originalImage');
         if (originalImage) {
-            let filename = imagePath;
-            
-            if (filename.includes('/')) {
-                filename = filename.split('/').pop();
-            } else if (filename.includes('\\')) {
-                filename = filename.split('\\').pop();
-            }
+            const filename = uploadRelativePath(imagePath);
             
             console.log('Setting original image:', filename);
             originalImage.src = `/uploads/${filename}`;
@@ -60,23 +74,15 @@ function displayResults() {
         }
         
         // Display annotated image if available
-        if (analysisResults.annotated_image) {
-            console.log('Annotated image path:', analysisResults.annotated_image);
+        const annotatedSrc = annotatedImageSrc(analysisResults);
+        if (annotatedSrc) {
+            console.log('Annotated image:', annotatedSrc);
             
             const annotatedImageCard = document.getElementById('annotatedImageCard');
             const annotatedImage = document.getElementById('annotatedImage');
             
             if (annotatedImageCard && annotatedImage) {
-                let annotatedFilename = analysisResults.annotated_image;
-                
-                if (annotatedFilename.includes('/')) {
-                    annotatedFilename = annotatedFilename.split('/').pop();
-                } else if (annotatedFilename.includes('\\')) {
-                    annotatedFilename = annotatedFilename.split('\\').pop();
-                }
-                
-                console.log('Setting annotated image:', annotatedFilename);
-                annotatedImage.src = `/uploads/${annotatedFilename}`;
+                annotatedImage.src = annotatedSrc;
                 
                 annotatedImage.onload = function() {
                     console.log('Annotated image loaded successfully');
@@ -84,7 +90,7 @@ function displayResults() {
                 };
                 
                 annotatedImage.onerror = function() {
-                    console.error('Failed to load annotated image:', `/uploads/${annotatedFilename}`);
+                    console.error('Failed to load annotated image:', annotatedSrc);
                     annotatedImageCard.style.display = 'none';
                 };
             }
@@ -409,6 +415,16 @@ function generateShoppingLinks() {
             linkSection.innerHTML = `
                 <h3>${objectName} ${data.count > 1 ? `(${data.count})` : ''}</h3>
                 <p style="color: var(--text-secondary); margin-bottom: 1rem;">${data.description}</p>
+                ${(data.products || []).length > 0 ? `
+                <ul class="product-suggestions" style="margin: 0 0 1rem 1.25rem;">
+                    ${data.products.map(product => `
+                        <li>
+                            <a href="${product.url}" target="_blank">${product.title}</a>
+                            ${product.retailer ? `<span style="color: var(--text-secondary);"> · ${product.retailer}</span>` : ''}
+                            ${product.price != null ? `<span> · ${product.price.toFixed(2)}</span>` : ''}
+                        </li>
+                    `).join('')}
+                </ul>` : ''}
                 <div class="shopping-links-grid">
                     ${data.shopping_links.map(link => `
                         <a href="${link.url}" target="_blank" class="shopping-link">
@@ -442,48 +458,166 @@ if (translateBtn) {
         }
         
         const description = document.getElementById('description').textContent;
+        const details = analysisResults.detailed_description;
+        const segments = details && details.segments ? details.segments : null;
+        
+        const lines = details && Array.isArray(details.description_lines) ? details.description_lines : null;
         
         try {
-            const response = await fetch('/api/translate', {
-                method: 'POST',
-                headers: {'Content-Type': 'application/json'},
-                body: JSON.stringify({
-                    text: description,
-                    languages: selectedLanguages
-                })
-            });
-            
-            const data = await response.json();
-            displayTranslations(data.translations);
-            generateAudio(data.translations);
+            // Translation and speech for every language run concurrently on the server
+            await narrateDescription(description, segments, lines, selectedLanguages);
         } catch (error) {
-            console.error('Translation error:', error);
-            alert('Error translating text. Please try again.');
+            console.error('Narration error, falling back to translate + speak:', error);
+            try {
+                const translations = await requestTranslations(description, segments, lines, selectedLanguages);
+                displayTranslations(translations);
+                generateAudio(translations);
+            } catch (fallbackError) {
+                console.error('Translation error:', fallbackError);
+                alert('Error translating text. Please try again.');
+            }
         }
     });
 }
 
+async function requestTranslations(description, segments, lines, languages) {
+    if (!segments && lines && lines.length > 1) {
+        // All lines go out in one batched request per language
+        const response = await fetch('/api/translate/batch', {
+            method: 'POST',
+            headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify({
+                texts: lines,
+                languages: languages
+            })
+        });
+        
+        const data = await response.json();
+        const translations = {};
+        for (const [lang, translatedLines] of Object.entries(data.translations)) {
+            translations[lang] = translatedLines.join(' ');
+        }
+        return translations;
+    }
+    
+    const response = await fetch('/api/translate', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({
+            text: description,
+            segments: segments,
+            languages: languages
+        })
+    });
+    
+    const data = await response.json();
+    return data.translations;
+}
+
+async function narrateDescription(description, segments, lines, languages) {
+    // Each language arrives as one NDJSON line as soon as its audio is ready
+    const response = await fetch('/api/narrate', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({
+            text: description,
+            segments: segments,
+            lines: lines,
+            languages: languages,
+            stream: true
+        })
+    });
+    
+    if (!response.ok || !response.body) {
+        throw new Error(`HTTP error: ${response.status}`);
+    }
+    
+    document.getElementById('translationsContainer').innerHTML = '';
+    const audioControls = document.getElementById('audioControls');
+    if (audioControls) {
+        audioControls.innerHTML = '<p style="color: var(--text-secondary);">🔄 Generating audio...</p>';
+    }
+    
+    let loadingCleared = false;
+    const showNarration = (item) => {
+        if (item.text) {
+            appendTranslation(item.language, item.text);
+        }
+        if (!audioControls) {
+            return;
+        }
+        if (!loadingCleared) {
+            audioControls.innerHTML = '';
+            loadingCleared = true;
+        }
+        const player = createAudioPlayer(item.language, LANGUAGE_NAMES);
+        audioControls.appendChild(player.container);
+        if (item.audio_file) {
+            player.audio.src = `/api/audio/${item.audio_file}`;
+            player.audio.load();
+        } else {
+            console.error(`[${item.language}] Narration error:`, item.error);
+            showAudioError(player.container, item.language, LANGUAGE_NAMES);
+        }
+    };
+    
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let received = 0;
+    
+    while (true) {
+        const { done, value } = await reader.read();
+        if (value) {
+            buffer += decoder.decode(value, { stream: true });
+        }
+        
+        let newline;
+        while ((newline = buffer.indexOf('\n')) >= 0) {
+            const line = buffer.slice(0, newline).trim();
+            buffer = buffer.slice(newline + 1);
+            if (line) {
+                showNarration(JSON.parse(line));
+                received++;
+            }
+        }
+        
+        if (done) {
+            break;
+        }
+    }
+    
+    if (received === 0) {
+        throw new Error('Empty narration response');
+    }
+}
+
+const LANGUAGE_NAMES = {
+    'te': 'Telugu', 
+    'hi': 'Hindi', 
+    'en': 'English',
+    'es': 'Spanish', 
+    'de': 'German', 
+    'fr': 'French'
+};
+
+function appendTranslation(lang, text) {
+    const container = document.getElementById('translationsContainer');
+    const item = document.createElement('div');
+    item.className = 'translation-item';
+    item.innerHTML = `
+        <strong>${LANGUAGE_NAMES[lang] || lang}</strong>
+        <p>${text}</p>
+    `;
+    container.appendChild(item);
+}
+
 function displayTranslations(translations) {
     const container = document.getElementById('translationsContainer');
     container.innerHTML = '';
     
-    const languageNames = {
-        'te': 'Telugu', 
-        'hi': 'Hindi', 
-        'en': 'English',
-        'es': 'Spanish', 
-        'de': 'German', 
-        'fr': 'French'
-    };
-    
     for (const [lang, text] of Object.entries(translations)) {
-        const item = document.createElement('div');
-        item.className = 'translation-item';
-        item.innerHTML = `
-            <strong>${languageNames[lang] || lang}</strong>
-            <p>${text}</p>
-        `;
-        container.appendChild(item);
+        appendTranslation(lang, text);
     }
 }
 
@@ -505,89 +639,68 @@ async function generateAudio(translations) {
         'fr': 'French'
     };
     
-    // Clear loading message after a short delay
-    setTimeout(() => {
-        audioControls.innerHTML = '';
-    }, 500);
+    // Clear loading message once the first player is added
+    let loadingCleared = false;
+    const addPlayer = (audioDiv) => {
+        if (!loadingCleared) {
+            audioControls.innerHTML = '';
+            loadingCleared = true;
+        }
+        audioControls.appendChild(audioDiv);
+    };
     
     for (const [lang, text] of Object.entries(translations)) {
         try {
-            console.log(`[${lang}] Requesting audio generation...`);
-            
-            const response = await fetch('/api/speak', {
-                method: 'POST',
-                headers: {'Content-Type': 'application/json'},
-                body: JSON.stringify({text, language: lang})
-            });
+            if (canStreamSpeech()) {
+                // Streamed narration: playback starts after the first sentence
+                const player = createAudioPlayer(lang, languageNames);
+                addPlayer(player.container);
+                
+                streamSpeech(text, lang, player.audio).catch(async (error) => {
+                    console.error(`[${lang}] Streaming failed, falling back to file:`, error);
+                    const audioFile = await requestSpeechFile(text, lang);
+                    if (audioFile) {
+                        player.audio.src = `/api/audio/${audioFile}`;
+                        player.audio.load();
+                    } else {
+                        showAudioError(player.container, lang, languageNames);
+                    }
+                });
+                continue;
+            }
             
-            if (!response.ok) {
-                console.error(`[${lang}] HTTP error: ${response.status}`);
+            const audioFile = await requestSpeechFile(text, lang);
+            if (!audioFile) {
                 continue;
             }
             
-            const data = await response.json();
-            console.log(`[${lang}] Response:`, data);
+            const player = createAudioPlayer(lang, languageNames);
+            const audioElement = player.audio;
             
-            if (data.success && data.audio_file) {
-                // Create container
-                const audioDiv = document.createElement('div');
-                audioDiv.className = 'audio-player';
-                audioDiv.style.marginBottom = '1rem';
-                
-                // Create label
-                const label = document.createElement('label');
-                label.textContent = languageNames[lang] || lang;
-                label.style.display = 'block';
-                label.style.marginBottom = '0.5rem';
-                label.style.fontWeight = '500';
-                label.style.color = 'var(--primary-color)';
-                
-                // Create audio element
-                const audioElement = document.createElement('audio');
-                audioElement.controls = true;
-                audioElement.preload = 'auto';
-                audioElement.style.width = '100%';
-                audioElement.style.maxWidth = '500px';
-                
-                // Add error handling
-                audioElement.addEventListener('error', (e) => {
-                    console.error(`[${lang}] Audio playback error:`, e);
-                    if (!audioElement.dataset.fallbackTried) {
-                        audioElement.dataset.fallbackTried = 'true';
-                        audioElement.src = `/api/audio/${data.audio_file}`;
-                        audioElement.load();
-                        return;
-                    }
-                    const errorMsg = document.createElement('p');
-                    errorMsg.style.color = 'red';
-                    errorMsg.style.fontSize = '0.9rem';
-                    errorMsg.textContent = `Failed to load ${languageNames[lang]} audio`;
-                    audioDiv.appendChild(errorMsg);
-                });
-                
-                audioElement.addEventListener('loadeddata', () => {
-                    console.log(`[${lang}] Audio loaded successfully`);
-                });
-                
-                // Set source directly from static folder
-                audioElement.src = `/static/audio/${data.audio_file}`;
-                audioElement.type = 'audio/mpeg';
-                
-                console.log(`[${lang}] Audio URL: /static/audio/${data.audio_file}`);
-                
-                // Build the player
-                audioDiv.appendChild(label);
-                audioDiv.appendChild(audioElement);
-                audioControls.appendChild(audioDiv);
-                
-                // Load the audio
-                audioElement.load();
-                
-                console.log(`[${lang}] ✓ Audio player created`);
-                
-            } else {
-                console.error(`[${lang}] Invalid response:`, data);
-            }
+            // Add error handling
+            audioElement.addEventListener('error', (e) => {
+                console.error(`[${lang}] Audio playback error:`, e);
+                if (!audioElement.dataset.fallbackTried) {
+                    audioElement.dataset.fallbackTried = 'true';
+                    audioElement.src = `/static/audio/${audioFile}`;
+                    audioElement.load();
+                    return;
+                }
+                showAudioError(player.container, lang, languageNames);
+            });
+            
+            // Served with range and cache support; static folder is the fallback
+            audioElement.src = `/api/audio/${audioFile}`;
+            audioElement.type = 'audio/mpeg';
+            
+            console.log(`[${lang}] Audio URL: /api/audio/${audioFile}`);
+            
+            addPlayer(player.container);
+            
+            // Load the audio
+            audioElement.load();
+            
+            console.log(`[${lang}] ✓ Audio player created`);
             
         } catch (error) {
             console.error(`[${lang}] Exception:`, error);
@@ -595,11 +708,117 @@ async function generateAudio(translations) {
     }
     
     // Show message if no audio was generated
-    if (audioControls.children.length === 0) {
+    if (!loadingCleared) {
         audioControls.innerHTML = '<p style="color: var(--text-secondary);">❌ Failed to generate audio</p>';
     }
 }
 
+function createAudioPlayer(lang, languageNames) {
+    // Create container
+    const audioDiv = document.createElement('div');
+    audioDiv.className = 'audio-player';
+    audioDiv.style.marginBottom = '1rem';
+    
+    // Create label
+    const label = document.createElement('label');
+    label.textContent = languageNames[lang] || lang;
+    label.style.display = 'block';
+    label.style.marginBottom = '0.5rem';
+    label.style.fontWeight = '500';
+    label.style.color = 'var(--primary-color)';
+    
+    // Create audio element
+    const audioElement = document.createElement('audio');
+    audioElement.controls = true;
+    audioElement.preload = 'auto';
+    audioElement.style.width = '100%';
+    audioElement.style.maxWidth = '500px';
+    
+    audioElement.addEventListener('loadeddata', () => {
+        console.log(`[${lang}] Audio loaded successfully`);
+    });
+    
+    audioDiv.appendChild(label);
+    audioDiv.appendChild(audioElement);
+    
+    return { container: audioDiv, audio: audioElement };
+}
+
+function showAudioError(audioDiv, lang, languageNames) {
+    const errorMsg = document.createElement('p');
+    errorMsg.style.color = 'red';
+    errorMsg.style.fontSize = '0.9rem';
+    errorMsg.textContent = `Failed to load ${languageNames[lang] || lang} audio`;
+    audioDiv.appendChild(errorMsg);
+}
+
+async function requestSpeechFile(text, lang) {
+    console.log(`[${lang}] Requesting audio generation...`);
+    
+    const response = await fetch('/api/speak', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({text, language: lang})
+    });
+    
+    if (!response.ok) {
+        console.error(`[${lang}] HTTP error: ${response.status}`);
+        return null;
+    }
+    
+    const data = await response.json();
+    console.log(`[${lang}] Response:`, data);
+    
+    if (data.success && data.audio_file) {
+        return data.audio_file;
+    }
+    
+    console.error(`[${lang}] Invalid response:`, data);
+    return null;
+}
+
+function canStreamSpeech() {
+    return Boolean(window.MediaSource && MediaSource.isTypeSupported('audio/mpeg')
+        && window.ReadableStream);
+}
+
+async function streamSpeech(text, lang, audioElement) {
+    // MP3 chunks arrive sentence by sentence and are fed to a MediaSource
+    const response = await fetch('/api/speak/stream', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({text, language: lang})
+    });
+    
+    if (!response.ok || !response.body) {
+        throw new Error(`HTTP error: ${response.status}`);
+    }
+    
+    const mediaSource = new MediaSource();
+    audioElement.src = URL.createObjectURL(mediaSource);
+    await new Promise(resolve => mediaSource.addEventListener('sourceopen', resolve, { once: true }));
+    
+    const sourceBuffer = mediaSource.addSourceBuffer('audio/mpeg');
+    const updateEnd = () => new Promise(resolve => sourceBuffer.addEventListener('updateend', resolve, { once: true }));
+    const reader = response.body.getReader();
+    
+    let received = 0;
+    while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        sourceBuffer.appendBuffer(value);
+        await updateEnd();
+        received += value.length;
+    }
+    
+    if (received === 0) {
+        throw new Error('Empty audio stream');
+    }
+    
+    mediaSource.endOfStream();
+    console.log(`[${lang}] ✓ Streamed ${received} bytes of audio`);
+}
+
 // Save button
 const saveBtn = document.getElementById('saveBtn');
 if (saveBtn) {
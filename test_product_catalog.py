@@ -0,0 +1,45 @@
+"""
+Product catalog search: suggestions stay within the detected class
+
+    python -m pytest test_product_catalog.py
+    python test_product_catalog.py
+"""
+import json
+import os
+import tempfile
+
+from app.models.product_catalog import ProductCatalog
+
+FEED = {
+    'classes': {'dog': 'A domesticated canine.', 'hot dog': 'A sausage in a bun.'},
+    'products': [
+        {'id': 'hot-dog-1', 'class': 'hot dog', 'title': 'Hot dog roller', 'tags': 'dog sausage grill'},
+        {'id': 'dog-1', 'class': 'dog', 'title': 'Orthopedic pet bed'},
+        {'id': 'dog-2', 'class': 'dog', 'title': 'Adjustable dog harness', 'tags': 'dog walking'},
+        {'id': 'book-1', 'class': 'book', 'title': 'Book light for reading', 'tags': 'light'},
+        {'id': 'light-1', 'class': 'traffic light', 'title': 'Toy traffic light'},
+    ]
+}
+
+def _catalog():
+    directory = tempfile.mkdtemp()
+    feed_path = os.path.join(directory, 'products.json')
+    with open(feed_path, 'w') as f:
+        json.dump(FEED, f)
+    return ProductCatalog(feed_path=feed_path, db_path=os.path.join(directory, 'catalog.sqlite3'))
+
+def test_class_named_in_another_products_title_does_not_leak():
+    results = _catalog().search('dog', limit=5)
+    assert [product['id'] for product in results] == ['dog-2', 'dog-1']
+
+def test_multiword_class_matches_only_itself():
+    catalog = _catalog()
+    assert [product['id'] for product in catalog.search('hot dog', limit=5)] == ['hot-dog-1']
+    assert [product['id'] for product in catalog.search('traffic light', limit=5)] == ['light-1']
+    assert catalog.search('light', limit=5) == ()
+
+if __name__ == '__main__':
+    for name, test in list(globals().items()):
+        if name.startswith('test_'):
+            test()
+            print(f"✓ {name}")
@@ -0,0 +1,14 @@
+"""
+WSGI Entry Point for Production Servers (see gunicorn.conf.py)
+"""
+from flask_cors import CORS
+
+from app.models.model_warmup import configure_threads
+
+# Before torch/TensorFlow are imported anywhere in this process
+configure_threads()
+
+from app import create_app
+
+app = create_app()
+CORS(app)